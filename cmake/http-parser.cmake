@@ -38,6 +38,8 @@ ExternalProject_Add(http-parser
     -DOS=${TARGET_OS}
     ${HTTPPARSER_NUTTX_ARG}
     -DENABLE_MEMORY_CONSTRAINTS=ON
+  CMAKE_CACHE_ARGS
+    ${DEPS_LAUNCHER_ARGS}
 )
 add_library(libhttp-parser STATIC IMPORTED)
 add_dependencies(libhttp-parser http-parser)
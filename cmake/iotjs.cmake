@@ -22,6 +22,19 @@ include(${CMAKE_CURRENT_LIST_DIR}/JSONParser.cmake)
 
 set(IOTJS_SOURCE_DIR ${CMAKE_SOURCE_DIR}/src)
 
+# Generated sources live in the build directory, so several configurations
+# can be built from one source tree at the same time. Files left in src/ by
+# earlier builds are removed, they would be found before these.
+set(IOTJS_GENERATED_DIR ${CMAKE_BINARY_DIR}/generated)
+file(MAKE_DIRECTORY ${IOTJS_GENERATED_DIR})
+foreach(generated_file iotjs_js.c iotjs_js.h iotjs_string_ext.inl.h
+                       iotjs_module_inl.h iotjs_magic_strings.in)
+  if(EXISTS ${IOTJS_SOURCE_DIR}/${generated_file})
+    message(STATUS "Removing stale ${IOTJS_SOURCE_DIR}/${generated_file}")
+    file(REMOVE ${IOTJS_SOURCE_DIR}/${generated_file})
+  endif()
+endforeach()
+
 # Platform configuration
 # Look for files under src/platform/<system>/
 string(TOLOWER ${CMAKE_SYSTEM_NAME} IOTJS_SYSTEM_OS)
@@ -290,12 +303,20 @@ endforeach(MODULE)
 
 list(APPEND IOTJS_JS_MODULES "iotjs=${IOTJS_SOURCE_DIR}/js/iotjs.js")
 
-# Generate src/iotjs_module_inl.h
+# Generate iotjs_module_inl.h
+# The entries are sorted by name, iotjs_module_get() uses binary search
+set(IOTJS_NATIVE_MODULE_NAMES)
+foreach(MODULE ${IOTJS_NATIVE_MODULES})
+  string(TOLOWER ${MODULE} module)
+  list(APPEND IOTJS_NATIVE_MODULE_NAMES ${module})
+endforeach()
+list(SORT IOTJS_NATIVE_MODULE_NAMES)
+
 # Build up init function prototypes
 set(IOTJS_MODULE_INITIALIZERS "")
-foreach(MODULE ${IOTJS_NATIVE_MODULES})
+foreach(module ${IOTJS_NATIVE_MODULE_NAMES})
+  string(TOUPPER ${module} MODULE)
   set(IOTJS_MODULES_JSON ${IOTJS_MODULE_${MODULE}_JSON})
-  string(TOLOWER ${MODULE} module)
 
   set(IOTJS_MODULE_INITIALIZERS "${IOTJS_MODULE_INITIALIZERS}
 extern jerry_value_t ${${IOTJS_MODULES_JSON}.modules.${module}.init}(void);")
@@ -304,9 +325,9 @@ endforeach()
 # Build up module entries
 set(IOTJS_MODULE_ENTRIES "")
 set(IOTJS_MODULE_OBJECTS "")
-foreach(MODULE ${IOTJS_NATIVE_MODULES})
+foreach(module ${IOTJS_NATIVE_MODULE_NAMES})
+  string(TOUPPER ${module} MODULE)
   set(IOTJS_MODULES_JSON ${IOTJS_MODULE_${MODULE}_JSON})
-  string(TOLOWER ${MODULE} module)
   set(INIT_FUNC ${${IOTJS_MODULES_JSON}.modules.${module}.init})
 
   set(IOTJS_MODULE_ENTRIES  "${IOTJS_MODULE_ENTRIES}
@@ -315,7 +336,7 @@ foreach(MODULE ${IOTJS_NATIVE_MODULES})
     { 0 },")
 endforeach()
 
-# Build up the contents of src/iotjs_module_inl.h
+# Build up the contents of iotjs_module_inl.h
 list(LENGTH IOTJS_NATIVE_MODULES IOTJS_MODULE_COUNT)
 set(IOTJS_MODULE_INL_H "/* File generated via iotjs.cmake */
 ${IOTJS_MODULE_INITIALIZERS}
@@ -332,7 +353,7 @@ ${IOTJS_MODULE_OBJECTS}
 };
 ")
 
-file(WRITE ${IOTJS_SOURCE_DIR}/iotjs_module_inl.h "${IOTJS_MODULE_INL_H}")
+file(WRITE ${IOTJS_GENERATED_DIR}/iotjs_module_inl.h "${IOTJS_MODULE_INL_H}")
 
 # Cleanup
 unset(IOTJS_MODULE_INL_H)
@@ -356,7 +377,8 @@ if(NOT USING_MSVC)
 endif()
 
 if(ENABLE_SNAPSHOT)
-  set(JS2C_SNAPSHOT_ARG --snapshot-tool=${JERRY_HOST_SNAPSHOT})
+  set(JS2C_SNAPSHOT_ARG --snapshot-tool=${JERRY_HOST_SNAPSHOT}
+                        --cache-dir=${CMAKE_BINARY_DIR}/js2c-cache)
   iotjs_add_compile_flags(-DENABLE_SNAPSHOT)
 endif()
 
@@ -370,27 +392,284 @@ if("${CMAKE_BUILD_TYPE}" STREQUAL "Debug")
   set(JS2C_RUN_MODE "debug")
 endif()
 
+# Drop the JS modules which are not reached from the application entry
+# script. The trace runs at configure time, so the rest of the build only
+# sees the kept modules, and it is repeated when a traced file changes.
+if(DEFINED JS2C_APP_ENTRY AND NOT "${JS2C_APP_ENTRY}" STREQUAL "")
+  get_filename_component(JS2C_APP_ENTRY_PATH ${JS2C_APP_ENTRY} ABSOLUTE)
+  set(JS2C_MODULES_JSON_ARGS)
+  foreach(module_dir ${MODULES_INCLUDE_DIR})
+    list(APPEND JS2C_MODULES_JSON_ARGS
+         --modules-json=${module_dir}/modules.json)
+  endforeach()
+  set(JS2C_KEEP_ARGS)
+  if(DEFINED JS2C_KEEP_MODULES AND NOT "${JS2C_KEEP_MODULES}" STREQUAL "")
+    string(REPLACE ";" "," JS2C_KEEP_MODULES_STR "${JS2C_KEEP_MODULES}")
+    set(JS2C_KEEP_ARGS --keep-modules=${JS2C_KEEP_MODULES_STR})
+  endif()
+
+  string(REPLACE ";" "," JS2C_TRACE_MODULES_STR "${IOTJS_JS_MODULES}")
+  set(JS2C_TRACE_OUTPUT ${CMAKE_BINARY_DIR}/js2c-modules.txt)
+  set(JS2C_TRACE_DEPENDS ${CMAKE_BINARY_DIR}/js2c-app-files.txt)
+  execute_process(
+    COMMAND ${PYTHON} ${ROOT_DIR}/tools/js2c.py
+            --buildtype=${JS2C_RUN_MODE}
+            --modules "${JS2C_TRACE_MODULES_STR}"
+            --app-entry=${JS2C_APP_ENTRY_PATH}
+            ${JS2C_MODULES_JSON_ARGS}
+            ${JS2C_KEEP_ARGS}
+            --trace-output=${JS2C_TRACE_OUTPUT}
+            --trace-depends=${JS2C_TRACE_DEPENDS}
+    RESULT_VARIABLE JS2C_TRACE_RESULT)
+  if(NOT JS2C_TRACE_RESULT EQUAL 0)
+    message(FATAL_ERROR "Failed to trace ${JS2C_APP_ENTRY_PATH}")
+  endif()
+
+  file(STRINGS ${JS2C_TRACE_OUTPUT} IOTJS_JS_MODULES)
+  file(STRINGS ${JS2C_TRACE_DEPENDS} JS2C_APP_FILES)
+  set_property(DIRECTORY APPEND PROPERTY CMAKE_CONFIGURE_DEPENDS
+               ${JS2C_APP_FILES})
+endif()
+
 if(USING_MSVC)
   set(JS2C_PREPROCESS_ARGS /EP /d1PP)
 else()
   set(JS2C_PREPROCESS_ARGS -E -dD)
 endif()
 
+# Bundle the files of the application into the builtin modules, the main
+# script runs when iotjs is started without a script argument. The module
+# names are derived from the paths the same way as in js2c (stage_app).
+set(JS2C_APP_ARGS)
+set(JS2C_APP_MODULES)
+set(JS2C_APP_SOURCES)
+if(DEFINED JS2C_APP_DIR AND NOT "${JS2C_APP_DIR}" STREQUAL "")
+  get_filename_component(JS2C_APP_DIR_PATH ${JS2C_APP_DIR} ABSOLUTE)
+  if(NOT DEFINED JS2C_APP_MAIN OR "${JS2C_APP_MAIN}" STREQUAL "")
+    set(JS2C_APP_MAIN index.js)
+  endif()
+  set(JS2C_APP_ARGS --app-dir=${JS2C_APP_DIR_PATH} --app-main=${JS2C_APP_MAIN})
+
+  file(GLOB_RECURSE JS2C_APP_DIR_FILES RELATIVE ${JS2C_APP_DIR_PATH}
+       ${JS2C_APP_DIR_PATH}/*.js ${JS2C_APP_DIR_PATH}/*.json)
+  list(SORT JS2C_APP_DIR_FILES)
+  foreach(app_file ${JS2C_APP_DIR_FILES})
+    if(NOT app_file MATCHES "(^|/)\\.[^/]*/")
+      string(REGEX REPLACE "[^A-Za-z0-9]" "_" app_module "app_${app_file}")
+      # Paths which give the same name are told apart by '_' suffixes
+      list(FIND JS2C_APP_MODULES ${app_module} app_module_idx)
+      while(NOT app_module_idx EQUAL -1)
+        set(app_module "${app_module}_")
+        list(FIND JS2C_APP_MODULES ${app_module} app_module_idx)
+      endwhile()
+      list(APPEND JS2C_APP_MODULES ${app_module})
+      list(APPEND JS2C_APP_SOURCES ${JS2C_APP_DIR_PATH}/${app_file})
+    endif()
+  endforeach()
+  # js2c fails if it derives other names, the outputs are named by them
+  string(REPLACE ";" "," JS2C_APP_MODULE_NAMES "${JS2C_APP_MODULES}")
+  list(APPEND JS2C_APP_ARGS --app-module-names=${JS2C_APP_MODULE_NAMES})
+  message(STATUS "Bundling ${JS2C_APP_DIR_PATH} (main: ${JS2C_APP_MAIN})")
+endif()
+
+# Names of the embedded blobs: one per module, or the merged snapshot
+set(JS2C_BLOB_NAMES)
+if(ENABLE_SNAPSHOT)
+  list(APPEND JS2C_BLOB_NAMES iotjs_js_modules)
+else()
+  foreach(module ${IOTJS_JS_MODULES})
+    string(REGEX REPLACE "=.*$" "" module_name "${module}")
+    list(APPEND JS2C_BLOB_NAMES ${module_name})
+  endforeach()
+  list(APPEND JS2C_BLOB_NAMES ${JS2C_APP_MODULES})
+endif()
+
+# Optionally emit every JS module into its own translation unit, so only the
+# units of the changed modules are recompiled. js2c does not touch unchanged
+# files, a stamp file tracks the js2c run itself.
+set(JS2C_OUTPUTS ${IOTJS_GENERATED_DIR}/iotjs_js.c
+                 ${IOTJS_GENERATED_DIR}/iotjs_js.h)
+set(JS2C_BLOB_DIR ${IOTJS_GENERATED_DIR})
+set(JS2C_UNITS)
+set(JS2C_SPLIT_ARGS)
+set(JS2C_STAMP_COMMAND)
+set(JS2C_BYPRODUCTS)
+if(JS2C_SPLIT_OUTPUT)
+  if(CMAKE_VERSION VERSION_LESS 3.2)
+    message(FATAL_ERROR "JS2C_SPLIT_OUTPUT requires CMake 3.2 or newer")
+  endif()
+
+  set(JS2C_UNIT_DIR ${CMAKE_BINARY_DIR}/iotjs_js)
+  set(JS2C_BLOB_DIR ${JS2C_UNIT_DIR})
+  foreach(blob_name ${JS2C_BLOB_NAMES})
+    list(APPEND JS2C_UNITS ${JS2C_UNIT_DIR}/${blob_name}.c)
+  endforeach()
+
+  set(JS2C_STAMP ${CMAKE_BINARY_DIR}/iotjs_js.stamp)
+  set(JS2C_SPLIT_ARGS --split-output=${JS2C_UNIT_DIR})
+  set(JS2C_STAMP_COMMAND COMMAND ${CMAKE_COMMAND} -E touch ${JS2C_STAMP})
+  set(JS2C_BYPRODUCTS BYPRODUCTS ${JS2C_OUTPUTS} ${JS2C_UNITS})
+  set(JS2C_OUTPUTS ${JS2C_STAMP})
+  list(APPEND JS2C_UNITS ${JS2C_STAMP})
+endif()
+
+# Select how the module bytes are embedded
+# (array|string|incbin|objcopy|external)
+set(JS2C_EMBED_ARGS --embed=${JS2C_EMBED})
+if("${JS2C_EMBED}" STREQUAL "external")
+  # The merged snapshot is kept in iotjs_js_modules.bin and mapped at
+  # startup from JS2C_BLOB_PATH (or the IOTJS_JS_BLOB environment variable),
+  # or used in place at the JS2C_BLOB_ADDRESS memory address.
+  if(NOT ENABLE_SNAPSHOT)
+    message(FATAL_ERROR "JS2C_EMBED=external requires ENABLE_SNAPSHOT=ON")
+  endif()
+  set(JS2C_BLOB_FILE ${JS2C_BLOB_DIR}/iotjs_js_modules.bin)
+  list(APPEND JS2C_OUTPUTS ${JS2C_BLOB_FILE})
+  if(NOT DEFINED JS2C_BLOB_PATH OR "${JS2C_BLOB_PATH}" STREQUAL "")
+    set(JS2C_BLOB_PATH ${JS2C_BLOB_FILE})
+  endif()
+  set(JS2C_BLOB_DEFINES "IOTJS_JS_BLOB_PATH=\"${JS2C_BLOB_PATH}\"")
+  if(DEFINED JS2C_BLOB_ADDRESS AND NOT "${JS2C_BLOB_ADDRESS}" STREQUAL "")
+    list(APPEND JS2C_BLOB_DEFINES "IOTJS_JS_BLOB_ADDRESS=${JS2C_BLOB_ADDRESS}")
+  endif()
+  set_source_files_properties(${IOTJS_SOURCE_DIR}/iotjs_js_blob.c PROPERTIES
+    COMPILE_DEFINITIONS "${JS2C_BLOB_DEFINES}")
+  message(STATUS "JS modules blob: ${JS2C_BLOB_FILE}")
+elseif("${JS2C_EMBED}" STREQUAL "objcopy")
+  list(APPEND JS2C_EMBED_ARGS
+       --linker=${CMAKE_LINKER} --objcopy=${CMAKE_OBJCOPY})
+  foreach(blob_name ${JS2C_BLOB_NAMES})
+    set(JS2C_BLOB_OBJECT ${JS2C_BLOB_DIR}/${blob_name}.o)
+    set_source_files_properties(${JS2C_BLOB_OBJECT} PROPERTIES
+      EXTERNAL_OBJECT TRUE GENERATED TRUE)
+    list(APPEND JS2C_OUTPUTS ${JS2C_BLOB_OBJECT})
+    list(APPEND JS2C_UNITS ${JS2C_BLOB_OBJECT})
+  endforeach()
+endif()
+
+# Minification level of the JS sources, js2c picks it from the build type
+# when not set
+set(JS2C_MINIFY_ARGS)
+if(DEFINED JS2C_MINIFY_LEVEL AND NOT "${JS2C_MINIFY_LEVEL}" STREQUAL "")
+  set(JS2C_MINIFY_ARGS --minify-level=${JS2C_MINIFY_LEVEL})
+endif()
+
+# Compression of the modules loaded by process.compileModule
+# (none|lz4|lz4-dict), lz4-dict shares a dictionary of
+# JS2C_COMPRESS_DICT_SIZE bytes between the modules
+set(JS2C_COMPRESS_ARGS)
+if(NOT "${JS2C_COMPRESS}" STREQUAL "none")
+  if(ENABLE_SNAPSHOT)
+    message(FATAL_ERROR "JS2C_COMPRESS requires ENABLE_SNAPSHOT=OFF")
+  endif()
+  set(JS2C_COMPRESS_ARGS --compress=${JS2C_COMPRESS})
+  if(DEFINED JS2C_COMPRESS_DICT_SIZE
+     AND NOT "${JS2C_COMPRESS_DICT_SIZE}" STREQUAL "")
+    list(APPEND JS2C_COMPRESS_ARGS
+         --compress-dict-size=${JS2C_COMPRESS_DICT_SIZE})
+  endif()
+endif()
+
+# ROM byte budget of the external magic strings, the chosen strings are
+# listed in magic_strings.txt of the build directory
+set(JS2C_MAGIC_STRING_ARGS)
+if(DEFINED JS2C_MAGIC_STRING_BUDGET
+   AND NOT "${JS2C_MAGIC_STRING_BUDGET}" STREQUAL "")
+  set(JS2C_MAGIC_STRING_ARGS
+      --magic-string-budget=${JS2C_MAGIC_STRING_BUDGET}
+      --magic-string-report=${CMAKE_BINARY_DIR}/magic_strings.txt)
+endif()
+
+# Fail the build if a module can not be turned into a static snapshot,
+# instead of falling back to a normal snapshot in the RAM
+set(JS2C_STATIC_ARGS)
+if(JS2C_REQUIRE_STATIC)
+  set(JS2C_STATIC_ARGS --require-static)
+endif()
+
+# Per-module size report (json|table) in js2c-report.json|txt of the build
+# directory, two JSON reports are compared by tools/js2c.py --compare
+set(JS2C_REPORT_ARGS)
+if(DEFINED JS2C_REPORT AND NOT "${JS2C_REPORT}" STREQUAL "")
+  if("${JS2C_REPORT}" STREQUAL "json")
+    set(JS2C_REPORT_FILE ${CMAKE_BINARY_DIR}/js2c-report.json)
+  else()
+    set(JS2C_REPORT_FILE ${CMAKE_BINARY_DIR}/js2c-report.txt)
+  endif()
+  set(JS2C_REPORT_ARGS
+      --report=${JS2C_REPORT} --report-file=${JS2C_REPORT_FILE})
+endif()
+
+# Fold the process.platform checks of the JS modules for the target (the
+# value of TARGET_OS in iotjs_def.h), unless JS2C_FOLD_PLATFORM is OFF
+set(JS2C_PLATFORM_ARGS)
+if(NOT DEFINED JS2C_FOLD_PLATFORM OR JS2C_FOLD_PLATFORM)
+  if(TARGET_OS MATCHES "^(LINUX|OPENWRT)$")
+    set(JS2C_PLATFORM linux)
+  elseif(TARGET_OS MATCHES "^(TIZEN|NUTTX|TIZENRT|DARWIN|WINDOWS)$")
+    string(TOLOWER "${TARGET_OS}" JS2C_PLATFORM)
+  endif()
+  if(DEFINED JS2C_PLATFORM)
+    set(JS2C_PLATFORM_ARGS --platform=${JS2C_PLATFORM})
+  endif()
+endif()
+
 string (REPLACE ";" "," IOTJS_JS_MODULES_STR "${IOTJS_JS_MODULES}")
+set(JS2C_ARGS
+    --buildtype=${JS2C_RUN_MODE}
+    --modules "${IOTJS_JS_MODULES_STR}"
+    --output-dir=${IOTJS_GENERATED_DIR}
+    --work-dir=${CMAKE_BINARY_DIR}
+    ${JS2C_SNAPSHOT_ARG}
+    ${JS2C_SPLIT_ARGS}
+    ${JS2C_EMBED_ARGS}
+    ${JS2C_MINIFY_ARGS}
+    ${JS2C_PLATFORM_ARGS}
+    ${JS2C_COMPRESS_ARGS}
+    ${JS2C_MAGIC_STRING_ARGS}
+    ${JS2C_STATIC_ARGS}
+    ${JS2C_APP_ARGS}
+    ${JS2C_REPORT_ARGS})
 add_custom_command(
-  OUTPUT ${IOTJS_SOURCE_DIR}/iotjs_js.c ${IOTJS_SOURCE_DIR}/iotjs_js.h
+  OUTPUT ${JS2C_OUTPUTS}
+  ${JS2C_BYPRODUCTS}
   COMMAND ${CMAKE_C_COMPILER} ${JS2C_PREPROCESS_ARGS} ${IOTJS_MODULE_DEFINES}
             ${IOTJS_SOURCE_DIR}/iotjs_magic_strings.h
-          > ${IOTJS_SOURCE_DIR}/iotjs_magic_strings.in
-  COMMAND ${PYTHON} ${ROOT_DIR}/tools/js2c.py
-  ARGS --buildtype=${JS2C_RUN_MODE}
-       --modules "${IOTJS_JS_MODULES_STR}"
-       ${JS2C_SNAPSHOT_ARG}
+          > ${IOTJS_GENERATED_DIR}/iotjs_magic_strings.in
+  COMMAND ${IOTJS_BUILD_LAUNCHER} ${PYTHON} ${ROOT_DIR}/tools/js2c.py
+  ARGS ${JS2C_ARGS}
+       --magic-strings=${IOTJS_GENERATED_DIR}/iotjs_magic_strings.in
   COMMAND ${CMAKE_COMMAND} -E remove
-            -f ${IOTJS_SOURCE_DIR}/iotjs_magic_strings.in
+            -f ${IOTJS_GENERATED_DIR}/iotjs_magic_strings.in
+  ${JS2C_STAMP_COMMAND}
   DEPENDS ${ROOT_DIR}/tools/js2c.py
+          ${ROOT_DIR}/tools/js2c_lib/minifier.py
+          ${ROOT_DIR}/tools/js2c_lib/deps.py
+          ${ROOT_DIR}/tools/js2c_lib/lz4.py
+          ${ROOT_DIR}/tools/js2c_lib/magic_strings.py
+          ${ROOT_DIR}/tools/js2c_lib/perfect_hash.py
+          ${ROOT_DIR}/tools/js2c_lib/platform_fold.py
+          ${ROOT_DIR}/tools/js2c_lib/report.py
           jerry-snapshot
           ${IOTJS_JS_MODULE_SRC}
+          ${JS2C_APP_SOURCES}
+)
+
+# 'make js2c-watch' keeps js2c running and regenerating the outputs on every
+# change of the JS modules, so a following 'make' only recompiles them
+set(JS2C_WATCH_TERMINAL)
+if(NOT CMAKE_VERSION VERSION_LESS 3.2)
+  set(JS2C_WATCH_TERMINAL USES_TERMINAL)
+endif()
+add_custom_target(js2c-watch
+  COMMAND ${CMAKE_C_COMPILER} ${JS2C_PREPROCESS_ARGS} ${IOTJS_MODULE_DEFINES}
+            ${IOTJS_SOURCE_DIR}/iotjs_magic_strings.h
+          > ${IOTJS_GENERATED_DIR}/iotjs_magic_strings.watch.in
+  COMMAND ${PYTHON} ${ROOT_DIR}/tools/js2c.py ${JS2C_ARGS}
+          --magic-strings=${IOTJS_GENERATED_DIR}/iotjs_magic_strings.watch.in
+          --watch
+  DEPENDS jerry-snapshot
+  ${JS2C_WATCH_TERMINAL}
 )
 
 # Load all external module cmake files
@@ -423,8 +702,9 @@ endforeach()
 # Collect all sources into LIB_IOTJS_SRC
 file(GLOB LIB_IOTJS_SRC ${IOTJS_SOURCE_DIR}/*.c)
 list(APPEND LIB_IOTJS_SRC
-  ${IOTJS_SOURCE_DIR}/iotjs_js.c
-  ${IOTJS_SOURCE_DIR}/iotjs_js.h
+  ${IOTJS_GENERATED_DIR}/iotjs_js.c
+  ${IOTJS_GENERATED_DIR}/iotjs_js.h
+  ${JS2C_UNITS}
   ${IOTJS_NATIVE_MODULE_SRC}
   ${IOTJS_PLATFORM_SRC}
 )
@@ -436,6 +716,7 @@ set(IOTJS_INCLUDE_DIRS
   ${EXTERNAL_INCLUDE_DIR}
   ${ROOT_DIR}/include
   ${IOTJS_SOURCE_DIR}
+  ${IOTJS_GENERATED_DIR}
   ${MODULES_INCLUDE_DIR}
   ${PLATFORM_OS_DIR}
   ${JERRY_PORT_DIR}/include
@@ -475,6 +756,14 @@ message(STATUS "JERRY_DEBUGGER           ${JERRY_DEBUGGER}")
 message(STATUS "JERRY_GLOBAL_HEAP_SIZE   ${JERRY_GLOBAL_HEAP_SIZE}")
 message(STATUS "JERRY_MEM_STATS          ${JERRY_MEM_STATS}")
 message(STATUS "JERRY_PROFILE            ${JERRY_PROFILE}")
+message(STATUS "JS2C_EMBED               ${JS2C_EMBED}")
+message(STATUS "JS2C_SPLIT_OUTPUT        ${JS2C_SPLIT_OUTPUT}")
+message(STATUS "JS2C_MINIFY_LEVEL        ${JS2C_MINIFY_LEVEL}")
+message(STATUS "JS2C_PLATFORM            ${JS2C_PLATFORM}")
+message(STATUS "JS2C_REQUIRE_STATIC      ${JS2C_REQUIRE_STATIC}")
+message(STATUS "JS2C_COMPRESS            ${JS2C_COMPRESS}")
+message(STATUS "JS2C_MAGIC_STRING_BUDGET ${JS2C_MAGIC_STRING_BUDGET}")
+message(STATUS "JS2C_APP_ENTRY           ${JS2C_APP_ENTRY}")
 message(STATUS "TARGET_ARCH              ${TARGET_ARCH}")
 message(STATUS "TARGET_BOARD             ${TARGET_BOARD}")
 message(STATUS "TARGET_OS                ${TARGET_OS}")
@@ -14,44 +14,57 @@
 
 cmake_minimum_required(VERSION 2.8)
 
-# Host jerry for snapshot generation
-set(DEPS_HOST_JERRY deps/jerry-host)
-ExternalProject_Add(hostjerry
-  PREFIX ${DEPS_HOST_JERRY}
-  SOURCE_DIR ${ROOT_DIR}/deps/jerry/
-  BUILD_IN_SOURCE 0
-  BINARY_DIR ${DEPS_HOST_JERRY}
-  CMAKE_ARGS
-    -DCMAKE_BUILD_TYPE=${CMAKE_BUILD_TYPE}
-    -DCMAKE_INSTALL_PREFIX=${CMAKE_BINARY_DIR}/${DEPS_HOST_JERRY}
-    -DENABLE_ALL_IN_ONE=ON
-    -DENABLE_LTO=${ENABLE_LTO}
-    -DJERRY_CMDLINE=OFF
-    -DJERRY_CMDLINE_SNAPSHOT=ON
-    -DJERRY_EXT=ON
-    -DJERRY_LOGGING=ON
-    -DJERRY_ERROR_MESSAGES=ON
-    -DJERRY_SNAPSHOT_SAVE=${ENABLE_SNAPSHOT}
-    -DJERRY_PROFILE=${JERRY_PROFILE}
-    ${EXTRA_JERRY_CMAKE_PARAMS}
-
-    # The snapshot tool does not require the system allocator
-    # turn it off by default.
-    #
-    # Additionally this is required if one compiles on a
-    # 64bit system to a 32bit system with system allocator
-    # enabled. This is beacuse on 64bit the system allocator
-    # should not be used as it returns 64bit pointers which
-    # can not be represented correctly in the JerryScript engine
-    # currently.
-    -DJERRY_SYSTEM_ALLOCATOR=OFF
-)
-set(JERRY_HOST_SNAPSHOT
-    ${CMAKE_BINARY_DIR}/${DEPS_HOST_JERRY}/bin/jerry-snapshot)
-add_executable(jerry-snapshot IMPORTED)
-add_dependencies(jerry-snapshot hostjerry)
-set_property(TARGET jerry-snapshot PROPERTY
-  IMPORTED_LOCATION ${JERRY_HOST_SNAPSHOT})
+# Host jerry for snapshot generation, a prebuilt snapshot tool of the same
+# JerryScript configuration and build type can be given instead
+# (tools/build.py gives the one of its host tools cache, which is shared by
+# the build directories of all targets)
+if(DEFINED JERRY_HOST_SNAPSHOT_TOOL
+   AND NOT "${JERRY_HOST_SNAPSHOT_TOOL}" STREQUAL "")
+  set(JERRY_HOST_SNAPSHOT ${JERRY_HOST_SNAPSHOT_TOOL})
+  add_executable(jerry-snapshot IMPORTED)
+  set_property(TARGET jerry-snapshot PROPERTY
+    IMPORTED_LOCATION ${JERRY_HOST_SNAPSHOT})
+else()
+  set(DEPS_HOST_JERRY deps/jerry-host)
+  ExternalProject_Add(hostjerry
+    PREFIX ${DEPS_HOST_JERRY}
+    SOURCE_DIR ${ROOT_DIR}/deps/jerry/
+    BUILD_IN_SOURCE 0
+    BINARY_DIR ${DEPS_HOST_JERRY}
+    CMAKE_ARGS
+      -DCMAKE_BUILD_TYPE=${CMAKE_BUILD_TYPE}
+      -DCMAKE_INSTALL_PREFIX=${CMAKE_BINARY_DIR}/${DEPS_HOST_JERRY}
+      -DENABLE_ALL_IN_ONE=ON
+      -DENABLE_LTO=${ENABLE_LTO}
+      -DJERRY_CMDLINE=OFF
+      -DJERRY_CMDLINE_SNAPSHOT=ON
+      -DJERRY_EXT=ON
+      -DJERRY_LOGGING=ON
+      -DJERRY_ERROR_MESSAGES=ON
+      -DJERRY_SNAPSHOT_SAVE=${ENABLE_SNAPSHOT}
+      -DJERRY_PROFILE=${JERRY_PROFILE}
+      ${EXTRA_JERRY_CMAKE_PARAMS}
+
+      # The snapshot tool does not require the system allocator
+      # turn it off by default.
+      #
+      # Additionally this is required if one compiles on a
+      # 64bit system to a 32bit system with system allocator
+      # enabled. This is beacuse on 64bit the system allocator
+      # should not be used as it returns 64bit pointers which
+      # can not be represented correctly in the JerryScript engine
+      # currently.
+      -DJERRY_SYSTEM_ALLOCATOR=OFF
+    CMAKE_CACHE_ARGS
+      ${DEPS_LAUNCHER_ARGS}
+  )
+  set(JERRY_HOST_SNAPSHOT
+      ${CMAKE_BINARY_DIR}/${DEPS_HOST_JERRY}/bin/jerry-snapshot)
+  add_executable(jerry-snapshot IMPORTED)
+  add_dependencies(jerry-snapshot hostjerry)
+  set_property(TARGET jerry-snapshot PROPERTY
+    IMPORTED_LOCATION ${JERRY_HOST_SNAPSHOT})
+endif()
 
 # Utility method to add -D<KEY>=<KEY_Value>
 macro(add_cmake_arg TARGET_ARG KEY)
@@ -146,6 +159,8 @@ ExternalProject_Add(libjerry
     -DENABLE_LTO=${ENABLE_LTO}
     ${DEPS_LIB_JERRY_ARGS}
     ${EXTRA_JERRY_CMAKE_PARAMS}
+  CMAKE_CACHE_ARGS
+    ${DEPS_LAUNCHER_ARGS}
 )
 
 set_property(DIRECTORY APPEND PROPERTY
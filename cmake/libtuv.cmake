@@ -46,6 +46,8 @@ ExternalProject_Add(libtuv
     -DBUILDAPIEMULTESTER=NO
     -DTARGET_SYSTEMROOT=${TARGET_SYSTEMROOT}
     -DTARGET_BOARD=${TARGET_BOARD}
+  CMAKE_CACHE_ARGS
+    ${DEPS_LAUNCHER_ARGS}
 )
 add_library(tuv STATIC IMPORTED)
 add_dependencies(tuv libtuv)
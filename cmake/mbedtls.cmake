@@ -68,6 +68,8 @@ else()
       -DCMAKE_C_FLAGS=${CMAKE_C_FLAGS}
       -DENABLE_PROGRAMS=OFF
       -DENABLE_TESTING=OFF
+    CMAKE_CACHE_ARGS
+      ${DEPS_LAUNCHER_ARGS}
   )
 
   # define external mbedtls target
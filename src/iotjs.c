@@ -17,6 +17,7 @@
 
 #include "iotjs.h"
 #include "iotjs_js.h"
+#include "iotjs_js_blob.h"
 #include "iotjs_string_ext.h"
 #include "jerryscript-ext/debugger.h"
 #if ENABLE_MODULE_NAPI
@@ -280,6 +281,8 @@ void iotjs_terminate(iotjs_environment_t* env) {
 #endif
   // Release JerryScript engine.
   jerry_cleanup();
+  // The engine may refer to the snapshot of the builtin modules until here.
+  iotjs_js_blob_release();
 }
 
 
@@ -301,6 +304,12 @@ int iotjs_entry(int argc, char** argv) {
     goto exit;
   }
 
+  // Map the builtin JS modules if they are not linked into the binary
+  if (!iotjs_js_blob_load()) {
+    ret_code = 1;
+    goto exit;
+  }
+
   // Initialize IoT.js
   if (!iotjs_initialize(env)) {
     DLOG("iotjs_initialize failed");
@@ -16,6 +16,7 @@
 
 #include "iotjs_def.h"
 #include "iotjs_env.h"
+#include "iotjs_js.h"
 
 #include <stdlib.h>
 #include <string.h>
@@ -287,9 +288,18 @@ bool iotjs_environment_parse_command_line_arguments(iotjs_environment_t* env,
 #endif
 
   // There must be at least one argument after processing the IoT.js args,
+  // unless an application is bundled into the binary.
   if (argc - i < 1) {
+#ifdef IOTJS_JS_APP_MAIN
+    env->argc = 2;
+    env->argv = (char**)iotjs_buffer_allocate(2 * sizeof(char*));
+    env->argv[0] = argv[0];
+    env->argv[1] = (char*)IOTJS_JS_APP_MAIN;
+    return true;
+#else
     fprintf(stderr, CLI_DEFAULT_HELP_STRING);
     return false;
+#endif
   }
 
   // Remaining arguments are for application.
@@ -0,0 +1,175 @@
+/* Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#include "iotjs_def.h"
+#include "iotjs_js.h"
+#include "iotjs_js_blob.h"
+
+#ifdef IOTJS_JS_BLOB
+
+#include <stdlib.h>
+#include <string.h>
+
+/*
+ * The blob is located, in this order:
+ *  - at the IOTJS_JS_BLOB_ADDRESS memory address (execute in place, e.g.
+ *    from memory mapped flash)
+ *  - in the file named by the IOTJS_JS_BLOB environment variable
+ *  - in the IOTJS_JS_BLOB_PATH file set at build time
+ *
+ * Files are mapped read-only and shared where mmap() is available, so the
+ * processes running iotjs share the pages of the snapshot. Elsewhere the
+ * file is read into memory.
+ */
+#if !defined(IOTJS_JS_BLOB_ADDRESS) && \
+    (defined(__linux__) || defined(__APPLE__))
+#define IOTJS_JS_BLOB_MMAP
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+#ifndef IOTJS_JS_BLOB_PATH
+#define IOTJS_JS_BLOB_PATH IOTJS_JS_BLOB
+#endif
+
+#define IOTJS_JS_BLOB_MAGIC "IJSB"
+#define IOTJS_JS_BLOB_VERSION 1
+
+// Written by js2c (BLOB_HEADER), the snapshot follows it.
+typedef struct {
+  char magic[4];
+  uint32_t version;
+  uint32_t fingerprint;
+  uint32_t size;
+} iotjs_js_blob_header_t;
+
+static const uint8_t* blob_data = NULL;
+static size_t blob_size = 0;
+#if !defined(IOTJS_JS_BLOB_ADDRESS) && !defined(IOTJS_JS_BLOB_MMAP)
+static iotjs_string_t blob_contents;
+#endif
+
+
+static bool map_blob(const char* path) {
+#if defined(IOTJS_JS_BLOB_ADDRESS)
+  IOTJS_UNUSED(path);
+  const iotjs_js_blob_header_t* header =
+      (const iotjs_js_blob_header_t*)(uintptr_t)(IOTJS_JS_BLOB_ADDRESS);
+  blob_data = (const uint8_t*)header;
+  blob_size = sizeof(iotjs_js_blob_header_t) + header->size;
+  return true;
+#elif defined(IOTJS_JS_BLOB_MMAP)
+  int fd = open(path, O_RDONLY);
+  if (fd < 0) {
+    return false;
+  }
+
+  struct stat st;
+  void* data = MAP_FAILED;
+  if (fstat(fd, &st) == 0 && st.st_size > 0) {
+    data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_SHARED, fd, 0);
+  }
+  close(fd);
+
+  if (data == MAP_FAILED) {
+    return false;
+  }
+
+  blob_data = (const uint8_t*)data;
+  blob_size = (size_t)st.st_size;
+  return true;
+#else
+  blob_contents = iotjs_file_read(path);
+  if (iotjs_string_is_empty(&blob_contents)) {
+    iotjs_string_destroy(&blob_contents);
+    return false;
+  }
+
+  blob_data = (const uint8_t*)iotjs_string_data(&blob_contents);
+  blob_size = iotjs_string_size(&blob_contents);
+  return true;
+#endif
+}
+
+
+bool iotjs_js_blob_load(void) {
+  const char* path = getenv("IOTJS_JS_BLOB");
+  if (path == NULL) {
+    path = IOTJS_JS_BLOB_PATH;
+  }
+
+  if (!map_blob(path)) {
+    fprintf(stderr, "Unable to load the builtin JS modules from %s\n", path);
+    return false;
+  }
+
+  const iotjs_js_blob_header_t* header =
+      (const iotjs_js_blob_header_t*)blob_data;
+
+  if (blob_size < sizeof(iotjs_js_blob_header_t) ||
+      memcmp(header->magic, IOTJS_JS_BLOB_MAGIC, sizeof(header->magic)) ||
+      header->version != IOTJS_JS_BLOB_VERSION ||
+      header->size > blob_size - sizeof(iotjs_js_blob_header_t)) {
+    fprintf(stderr, "%s is not a builtin JS modules blob\n", path);
+    iotjs_js_blob_release();
+    return false;
+  }
+
+  // The module indices and the literals of the static snapshots refer to
+  // the tables compiled into the binary.
+  if (header->fingerprint != IOTJS_JS_BLOB_FINGERPRINT) {
+    fprintf(stderr, "%s does not match the modules of this iotjs binary\n",
+            path);
+    iotjs_js_blob_release();
+    return false;
+  }
+
+  iotjs_js_modules_s = blob_data + sizeof(iotjs_js_blob_header_t);
+  iotjs_js_modules_l = header->size;
+  return true;
+}
+
+
+void iotjs_js_blob_release(void) {
+  if (blob_data == NULL) {
+    return;
+  }
+
+#if defined(IOTJS_JS_BLOB_MMAP)
+  munmap((void*)blob_data, blob_size);
+#elif !defined(IOTJS_JS_BLOB_ADDRESS)
+  iotjs_string_destroy(&blob_contents);
+#endif
+
+  blob_data = NULL;
+  blob_size = 0;
+  iotjs_js_modules_s = NULL;
+  iotjs_js_modules_l = 0;
+}
+
+#else /* !IOTJS_JS_BLOB */
+
+bool iotjs_js_blob_load(void) {
+  return true;
+}
+
+
+void iotjs_js_blob_release(void) {
+}
+
+#endif /* IOTJS_JS_BLOB */
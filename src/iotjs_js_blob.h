@@ -0,0 +1,29 @@
+/* Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#ifndef IOTJS_JS_BLOB_H
+#define IOTJS_JS_BLOB_H
+
+
+// Map the external snapshot of the builtin JS modules (js2c --embed=external)
+// and point iotjs_js_modules_s / iotjs_js_modules_l into it. Does nothing if
+// the snapshot is linked into the binary.
+bool iotjs_js_blob_load(void);
+
+// Unmap the snapshot, it must be kept until jerry_cleanup().
+void iotjs_js_blob_release(void);
+
+
+#endif /* IOTJS_JS_BLOB_H */
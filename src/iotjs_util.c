@@ -114,6 +114,95 @@ void iotjs_buffer_release(char* buffer) {
   }
 }
 
+
+static bool lz4_read_length(const uint8_t** src_p, const uint8_t* src_end,
+                            size_t* length_p) {
+  uint8_t byte;
+  do {
+    if (*src_p >= src_end) {
+      return false;
+    }
+    byte = *(*src_p)++;
+    *length_p += byte;
+  } while (byte == 255);
+
+  return true;
+}
+
+
+bool iotjs_lz4_decompress(const uint8_t* src, size_t src_size, uint8_t* dst,
+                          size_t dst_size) {
+  return iotjs_lz4_decompress_dict(src, src_size, NULL, 0, dst, dst_size);
+}
+
+
+bool iotjs_lz4_decompress_dict(const uint8_t* src, size_t src_size,
+                               const uint8_t* dict, size_t dict_size,
+                               uint8_t* dst, size_t dst_size) {
+  const uint8_t* src_end = src + src_size;
+  uint8_t* out = dst;
+  uint8_t* out_end = dst + dst_size;
+
+  while (src < src_end) {
+    uint8_t token = *src++;
+
+    // Copy the literals
+    size_t length = token >> 4;
+    if (length == 15 && !lz4_read_length(&src, src_end, &length)) {
+      return false;
+    }
+    if (length > (size_t)(src_end - src) || length > (size_t)(out_end - out)) {
+      return false;
+    }
+    memcpy(out, src, length);
+    out += length;
+    src += length;
+
+    // The last sequence has no match part
+    if (src == src_end) {
+      break;
+    }
+
+    // Copy the match, it may overlap with the output
+    if (src_end - src < 2) {
+      return false;
+    }
+    size_t offset = (size_t)src[0] | ((size_t)src[1] << 8);
+    src += 2;
+    if (offset == 0 || offset > (size_t)(out - dst) + dict_size) {
+      return false;
+    }
+
+    length = token & 0xf;
+    if (length == 15 && !lz4_read_length(&src, src_end, &length)) {
+      return false;
+    }
+    length += 4;
+    if (length > (size_t)(out_end - out)) {
+      return false;
+    }
+
+    // The dictionary is the history before dst, a match may start in it
+    // and continue at the beginning of dst.
+    if (offset > (size_t)(out - dst)) {
+      size_t dict_pos = dict_size - (offset - (size_t)(out - dst));
+      while (length > 0 && dict_pos < dict_size) {
+        *out++ = dict[dict_pos++];
+        length--;
+      }
+      offset = (size_t)(out - dst);
+    }
+
+    const uint8_t* match = out - offset;
+    while (length--) {
+      *out++ = *match++;
+    }
+  }
+
+  return out == out_end;
+}
+
+
 void print_stacktrace(void) {
 #if !defined(NDEBUG) && defined(__linux__) && defined(DEBUG) && \
     !defined(__OPENWRT__)
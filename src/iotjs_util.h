@@ -29,6 +29,16 @@ char* iotjs_buffer_allocate_from_number_array(size_t size,
 char* iotjs_buffer_reallocate(char* buffer, size_t size);
 void iotjs_buffer_release(char* buff);
 
+// Decompress an LZ4 block (as created by tools/js2c_lib/lz4.py) into dst.
+// Returns false if the block is corrupted or does not fill dst exactly.
+bool iotjs_lz4_decompress(const uint8_t* src, size_t src_size, uint8_t* dst,
+                          size_t dst_size);
+// Decompress an LZ4 block whose matches may refer to the dict bytes
+// before dst (as created by tools/js2c_lib/lz4.py with a dictionary).
+bool iotjs_lz4_decompress_dict(const uint8_t* src, size_t src_size,
+                               const uint8_t* dict, size_t dict_size,
+                               uint8_t* dst, size_t dst_size);
+
 void print_stacktrace(void);
 
 #define IOTJS_ALLOC(type) /* Allocate (type)-sized, (type*)-typed memory */ \
@@ -116,8 +116,23 @@ Module.cache = {};
 // Cache to store not yet compiled remote modules
 Module.remoteCache = {};
 
+// Files of the application bundled by js2c (tools/js2c.py --app-dir) are
+// builtin modules whose names are their paths under the virtual root.
+var BUNDLE_ROOT = '/$app/';
+var bundle = {};
+for (var name in Builtin.builtin_modules) {
+  if (name.indexOf(BUNDLE_ROOT) === 0) {
+    bundle[name] = true;
+    delete Builtin.builtin_modules[name];
+  }
+}
+
 var moduledirs = [''];
 
+if (Object.keys(bundle).length) {
+  moduledirs.push(BUNDLE_ROOT + 'iotjs_modules/');
+}
+
 var cwd;
 try {
   cwd = process.env.IOTJS_WORKING_DIR_PATH || path.cwd();
@@ -162,11 +177,61 @@ Module.resolveDirectories = function(id, parent) {
 };
 
 
+function tryBundled(modulePath, ext) {
+  if (bundle[modulePath]) {
+    return modulePath;
+  }
+  return bundle[modulePath + ext] ? modulePath + ext : false;
+}
+
+
+function bundledPath(modulePath) {
+  return '/' + normalizePathString(modulePath).join('/');
+}
+
+
+function resolveBundled(modulePath) {
+  modulePath = bundledPath(modulePath);
+
+  var filepath,
+      ext = '.js';
+
+  if ((filepath = tryBundled(modulePath, ext))) {
+    return filepath;
+  }
+
+  var jsonpath = modulePath + '/package.json';
+
+  if (bundle[jsonpath]) {
+    var pkg = new Module(jsonpath, null);
+    pkg.filename = jsonpath;
+    pkg.compileBundled();
+    var pkgMainFile = pkg.exports.main;
+
+    if (pkgMainFile &&
+        (filepath = tryBundled(bundledPath(modulePath + '/' + pkgMainFile),
+                               ext))) {
+      return filepath;
+    }
+  }
+
+  return tryBundled(modulePath + '/index', ext);
+}
+
+
 Module.resolveFilepath = function(id, directories) {
   for (var i = 0; i < directories.length; i++) {
     var dir = directories[i];
     var modulePath = dir + id;
 
+    if (modulePath.indexOf(BUNDLE_ROOT) === 0) {
+      var bundled = resolveBundled(modulePath);
+      if (bundled) {
+        return bundled;
+      }
+      continue;
+    }
+
     if (!path.isDeviceRoot(modulePath)) {
       modulePath = path.cwd() + '/' + modulePath;
     }
@@ -224,7 +289,7 @@ Module.resolveModPath = function(id, parent) {
   var filepath = Module.resolveFilepath(id, directories);
 
   if (filepath) {
-    return path.normalizePath(filepath);
+    return bundle[filepath] ? filepath : path.normalizePath(filepath);
   }
 
   return false;
@@ -272,7 +337,9 @@ Module.load = function(id, parent) {
   var ext = modPath.substr(modPath.lastIndexOf('.') + 1);
   var source;
 
-  if (ext === 'js') {
+  if (bundle[modPath]) {
+    module.compileBundled();
+  } else if (ext === 'js') {
     source = Builtin.readSource(modPath);
     module.compile(modPath, source);
   } else if (ext === 'json') {
@@ -313,6 +380,12 @@ Module.prototype.compile = function(filename, source) {
 };
 
 
+Module.prototype.compileBundled = function() {
+  this.id = this.filename;
+  Builtin.compileModule(this, this.require.bind(this));
+};
+
+
 Module.runMain = function() {
   if (Builtin.debuggerWaitSource) {
     var sources = Builtin.debuggerGetSource();
@@ -111,6 +111,45 @@ JS_FUNCTION(debugger_get_source) {
 #endif
 
 
+#ifndef ENABLE_SNAPSHOT
+static jerry_value_t eval_js_module(const char* name, size_t name_len,
+                                    const iotjs_js_module_t* module) {
+  if (module->compressed_length == 0) {
+    return wrap_eval(name, name_len, (const char*)module->code,
+                     module->length);
+  }
+
+  // Compressed modules are unpacked into a scratch buffer, which is only
+  // needed until the source is parsed.
+  char* source = iotjs_buffer_allocate(module->length);
+  jerry_value_t jres;
+
+#ifdef IOTJS_JS_MODULES_DICT_SIZE
+  bool decompressed =
+      iotjs_lz4_decompress_dict((const uint8_t*)module->code,
+                                module->compressed_length,
+                                iotjs_js_modules_dict,
+                                IOTJS_JS_MODULES_DICT_SIZE,
+                                (uint8_t*)source, module->length);
+#else
+  bool decompressed =
+      iotjs_lz4_decompress((const uint8_t*)module->code,
+                           module->compressed_length, (uint8_t*)source,
+                           module->length);
+#endif
+
+  if (decompressed) {
+    jres = wrap_eval(name, name_len, source, module->length);
+  } else {
+    jres = JS_CREATE_ERROR(COMMON, "Corrupted builtin module");
+  }
+
+  iotjs_buffer_release(source);
+  return jres;
+}
+#endif
+
+
 JS_FUNCTION(proc_compile_module) {
   DJS_CHECK_ARGS(2, object, function);
 
@@ -125,14 +164,7 @@ JS_FUNCTION(proc_compile_module) {
   jerry_release_value(jid);
   const char* name = iotjs_string_data(&id);
 
-  int i = 0;
-  while (js_modules[i].name != NULL) {
-    if (!strcmp(js_modules[i].name, name)) {
-      break;
-    }
-
-    i++;
-  }
+  const iotjs_js_module_t* js_module = iotjs_js_modules_find(name);
 
   jerry_value_t native_module_jval = iotjs_module_get(name);
 
@@ -143,14 +175,13 @@ JS_FUNCTION(proc_compile_module) {
 
   jerry_value_t jres = jerry_create_undefined();
 
-  if (js_modules[i].name != NULL) {
+  if (js_module != NULL) {
 #ifdef ENABLE_SNAPSHOT
     jres = jerry_exec_snapshot((const uint32_t*)iotjs_js_modules_s,
-                               iotjs_js_modules_l, js_modules[i].idx,
+                               iotjs_js_modules_l, js_module->idx,
                                JERRY_SNAPSHOT_EXEC_ALLOW_STATIC);
 #else
-    jres = wrap_eval(name, iotjs_string_size(&id),
-                     (const char*)js_modules[i].code, js_modules[i].length);
+    jres = eval_js_module(name, iotjs_string_size(&id), js_module);
 #endif
     if (!jerry_value_is_error(jres)) {
       jerry_value_t jexports = iotjs_jval_get_property(jmodule, "exports");
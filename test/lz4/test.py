@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'tools'))
+from common_py import path
+from common_py.system.filesystem import FileSystem as fs
+from js2c_lib import lz4
+
+# The decoder of src/iotjs_util.c is compiled on its own, the rest of the
+# file needs the headers of the dependencies.
+DECODER_START = 'static bool lz4_read_length('
+DECODER_END = 'void print_stacktrace('
+
+DECODER_MAIN = '''
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+bool iotjs_lz4_decompress_dict(const uint8_t* src, size_t src_size,
+                               const uint8_t* dict, size_t dict_size,
+                               uint8_t* dst, size_t dst_size);
+
+%s
+
+static uint8_t* read_file(const char* name, size_t* size) {
+  FILE* file = fopen(name, "rb");
+  fseek(file, 0, SEEK_END);
+  *size = (size_t)ftell(file);
+  fseek(file, 0, SEEK_SET);
+  uint8_t* data = malloc(*size + 1);
+  if (fread(data, 1, *size, file) != *size) {
+    exit(2);
+  }
+  fclose(file);
+  return data;
+}
+
+// decoder BLOCK DICT SIZE: write the decompressed block to stdout
+int main(int argc, char** argv) {
+  size_t src_size, dict_size;
+  uint8_t* src = read_file(argv[1], &src_size);
+  uint8_t* dict = read_file(argv[2], &dict_size);
+  size_t dst_size = (size_t)atol(argv[3]);
+  uint8_t* dst = malloc(dst_size + 1);
+  if (!iotjs_lz4_decompress_dict(src, src_size, dict, dict_size, dst,
+                                 dst_size)) {
+    return 1;
+  }
+  fwrite(dst, 1, dst_size, stdout);
+  return 0;
+}
+'''
+
+
+def print_green(msg):
+    print ('\033[1;32m{}\033[00m'.format(msg))
+
+def print_blue(msg):
+    print ('\033[1;34m{}\033[00m'.format(msg))
+
+def print_red(msg):
+    print ('\033[1;31m{}\033[00m'.format(msg))
+
+def decompress(block, dictionary=b''):
+    """ Reference decoder of the LZ4 block format. """
+    block = bytearray(block)
+    out = bytearray(dictionary)
+    start = len(out)
+    pos = 0
+
+    def read_length(pos, length):
+        while True:
+            byte = block[pos]
+            pos += 1
+            length += byte
+            if byte != 255:
+                return pos, length
+
+    while pos < len(block):
+        token = block[pos]
+        pos += 1
+        length = token >> 4
+        if length == 15:
+            pos, length = read_length(pos, length)
+        out.extend(block[pos:pos + length])
+        pos += length
+        if pos == len(block):
+            break
+
+        offset = block[pos] | (block[pos + 1] << 8)
+        pos += 2
+        length = token & 0xf
+        if length == 15:
+            pos, length = read_length(pos, length)
+        length += lz4.MIN_MATCH
+        assert 0 < offset <= len(out)
+        for _ in range(length):
+            out.append(out[-offset])
+
+    return bytes(out[start:])
+
+def build_decoder(work_dir):
+    with open(fs.join(path.SRC_ROOT, 'iotjs_util.c'), 'r') as fsource:
+        source = fsource.read()
+    start = source.find(DECODER_START)
+    end = source.find(DECODER_END)
+    if start < 0 or end < 0:
+        print_red('The LZ4 decoder is not found in src/iotjs_util.c')
+        sys.exit(1)
+
+    main_path = fs.join(work_dir, 'decoder.c')
+    with open(main_path, 'w') as fmain:
+        fmain.write(DECODER_MAIN % source[start:end])
+    decoder = fs.join(work_dir, 'decoder')
+    try:
+        subprocess.check_call(['cc', '-std=gnu99', '-Wall', '-Werror',
+                               '-o', decoder, main_path])
+    except OSError:
+        print_blue('No C compiler, only the reference decoder is used.')
+        return None
+    return decoder
+
+def run_decoder(decoder, work_dir, block, dictionary, size):
+    block_path = fs.join(work_dir, 'block')
+    dict_path = fs.join(work_dir, 'dict')
+    with open(block_path, 'wb') as fblock:
+        fblock.write(block)
+    with open(dict_path, 'wb') as fdict:
+        fdict.write(dictionary)
+    process = subprocess.Popen([decoder, block_path, dict_path, str(size)],
+                               stdout=subprocess.PIPE)
+    output = process.communicate()[0]
+    if process.returncode != 0:
+        return None
+    return output
+
+def cases():
+    rand = random.Random(0)
+
+    def noise(size):
+        return bytes(bytearray([rand.randint(0, 255) for _ in range(size)]))
+
+    yield 'empty', b'', b''
+    for size in (1, 3, lz4.MIN_MATCH, lz4.MATCH_LIMIT - 1, lz4.MATCH_LIMIT):
+        yield 'short (%d bytes)' % size, b'a' * size, b''
+    # Literal runs around the 15 of the token and the 255 steps of the
+    # length extension
+    for size in (14, 15, 16, 15 + 254, 15 + 255, 15 + 256, 1000):
+        yield 'literal run (%d bytes)' % size, noise(size), b''
+    for size in (lz4.MIN_MATCH + 14, lz4.MIN_MATCH + 15, 300, 5000):
+        yield 'long match (%d bytes)' % size, noise(8) + b'x' * size + \
+            noise(lz4.LAST_LITERALS), b''
+
+    phrase = b'module.exports = function(callback) { return callback; };'
+    yield 'match in the dictionary', phrase + noise(20), noise(100) + phrase
+    # The match starts in the dictionary and continues in the block
+    yield 'match across the dictionary end', b'ABCDEFGH' * 4 + noise(20), \
+        noise(30) + b'ABCDEFGH'
+    yield 'dictionary longer than the window', phrase + noise(20), \
+        phrase + noise(lz4.MAX_OFFSET + 100)
+
+    modules = []
+    for js_path in sorted(glob.glob(fs.join(path.SRC_ROOT, 'js', '*.js'))):
+        with open(js_path, 'rb') as fmodule:
+            modules.append((os.path.basename(js_path), fmodule.read()))
+    dictionary = lz4.train_dictionary([code for _, code in modules], 4096)
+    for name, code in modules:
+        yield name, code, b''
+        yield '%s (trained dictionary)' % name, code, dictionary
+
+def main():
+    work_dir = tempfile.mkdtemp()
+    try:
+        decoder = build_decoder(work_dir)
+        failed = 0
+        for name, data, dictionary in cases():
+            block = lz4.compress(data, dictionary)
+            results = [('reference', decompress(block, dictionary))]
+            if decoder:
+                results.append(('iotjs_lz4_decompress_dict',
+                                run_decoder(decoder, work_dir, block,
+                                            dictionary, len(data))))
+            for decoder_name, result in results:
+                if result != data:
+                    print_red('LZ4 round trip failed: %s (%s)' %
+                              (name, decoder_name))
+                    failed += 1
+    finally:
+        shutil.rmtree(work_dir)
+
+    if failed:
+        sys.exit(1)
+    print_green('LZ4 tests succeeded.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'tools'))
+from js2c_lib import minifier
+
+# (source, expected output of minify level 2)
+CASES = [
+    # An object literal after the ':' of a conditional keeps its keys
+    ('function f(){ var abc; abc = x ? y : {abc:1}; return abc; }',
+     'function f(){var a;a=x?y:{abc:1};return a;}\n'),
+    # Nested conditionals inside and around object literals
+    ('function f(abc){ return abc ? {abc: abc ? {abc: 1} : {abc: 2}} :'
+     ' abc < 0 ? {abc: 3} : {abc: abc}; }',
+     'function f(a){return a?{abc:a?{abc:1}:{abc:2}}:a<0?{abc:3}:'
+     '{abc:a};}\n'),
+    # A block after a case clause or a label is still a block
+    ('function f(abc){ switch (abc) { case abc ? 1 : 2: { var def = abc;'
+     ' return def; } } out: { var ghi = abc; } return ghi; }',
+     'function f(a){switch(a){case a?1:2:{var b=a;return b;}}'
+     'out:{var c=a;}return c;}\n'),
+]
+
+
+def print_green(msg):
+    print ('\033[1;32m{}\033[00m'.format(msg))
+
+def print_red(msg):
+    print ('\033[1;31m{}\033[00m'.format(msg))
+
+def main():
+    failed = 0
+    for source, expected in CASES:
+        result = minifier.minify(source, 2)
+        if result != expected:
+            print_red('Minifier test failed:\n  source:   %s\n'
+                      '  expected: %s  got:      %s' %
+                      (source, expected, result))
+            failed += 1
+
+    if failed:
+        sys.exit(1)
+    print_green('Minifier tests succeeded.')
+
+if __name__ == '__main__':
+    main()
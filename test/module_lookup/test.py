@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'tools'))
+from common_py import path
+from common_py.system.filesystem import FileSystem as fs
+from js2c_lib import perfect_hash
+import js2c
+
+# Two names with the same FNV-1a hash for seed 0: they always share a
+# bucket and only a seed of their own puts them into different slots.
+COLLIDING_NAMES = ['m24b8', 'm34f12']
+
+ABSENT_NAMES = ['', 'x', 'nonexistent', 'fs_', '_fs', 'FS', 'm24b9']
+
+LOOKUP_MAIN = '''
+#include <stdint.h>
+#include <stdio.h>
+#include <string.h>
+
+typedef struct {
+  const char* name;
+} iotjs_js_module_t;
+
+const iotjs_js_module_t js_modules[] = {
+%s
+  { NULL }
+};
+
+%s
+
+// lookup NAME...: print the index of every name in js_modules[] or -1
+int main(int argc, char** argv) {
+  for (int i = 1; i < argc; i++) {
+    const iotjs_js_module_t* module = iotjs_js_modules_find(argv[i]);
+    printf("%%d\\n", module ? (int)(module - js_modules) : -1);
+  }
+  return 0;
+}
+'''
+
+
+def print_green(msg):
+    print ('\033[1;32m{}\033[00m'.format(msg))
+
+def print_blue(msg):
+    print ('\033[1;34m{}\033[00m'.format(msg))
+
+def print_red(msg):
+    print ('\033[1;31m{}\033[00m'.format(msg))
+
+def lookup(names, seeds, index, name):
+    """ The lookup of the generated iotjs_js_modules_find(). """
+    bucket = perfect_hash.fnv1a(name, 0) % len(seeds)
+    slot = perfect_hash.fnv1a(name, seeds[bucket]) % len(names)
+    return index[slot] if names[index[slot]] == name else -1
+
+def c_lookup(work_dir, names, queries):
+    """ Return the results of the C lookup which js2c emits for names or
+        None if there is no C compiler.
+    """
+    main_path = fs.join(work_dir, 'lookup.c')
+    with open(main_path, 'w') as fmain:
+        fmain.write(LOOKUP_MAIN % (
+            '\n'.join(['  { "%s" },' % name for name in names]),
+            js2c.module_lookup(names)))
+    lookup_path = fs.join(work_dir, 'lookup')
+    try:
+        subprocess.check_call(['cc', '-std=gnu99', '-Wall', '-Werror',
+                               '-o', lookup_path, main_path])
+    except OSError:
+        return None
+    output = subprocess.check_output([lookup_path] + queries)
+    return [int(line) for line in output.decode('utf-8').split()]
+
+def builtin_names():
+    return sorted([os.path.splitext(os.path.basename(js_path))[0] for js_path
+                   in glob.glob(fs.join(path.SRC_ROOT, 'js', '*.js'))])
+
+def check(name, names, work_dir):
+    """ Every name has to be found at its own index, the absent names
+        must not be found. Returns the number of failures.
+    """
+    seeds, index = perfect_hash.build(names)
+    queries = list(names) + [absent for absent in ABSENT_NAMES
+                             if absent not in names]
+    expected = list(range(len(names))) + [-1] * (len(queries) - len(names))
+
+    results = [('python', [lookup(names, seeds, index, query)
+                           for query in queries])]
+    c_results = c_lookup(work_dir, names, queries)
+    if c_results is None:
+        print_blue('No C compiler, only the python lookup is checked.')
+    else:
+        results.append(('iotjs_js_modules_find', c_results))
+
+    failed = 0
+    for lookup_name, found in results:
+        for query, want, got in zip(queries, expected, found):
+            if want != got:
+                print_red('%s: %s(%r) is %d instead of %d' %
+                          (name, lookup_name, query, got, want))
+                failed += 1
+    return failed
+
+def main():
+    assert (perfect_hash.fnv1a(COLLIDING_NAMES[0], 0) ==
+            perfect_hash.fnv1a(COLLIDING_NAMES[1], 0))
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        failed = 0
+        failed += check('builtin modules', builtin_names(), work_dir)
+        failed += check('colliding names',
+                        builtin_names() + COLLIDING_NAMES, work_dir)
+        # More than 256 names need the 16 bit index table
+        failed += check('many names',
+                        ['m%x' % idx for idx in range(600)] +
+                        COLLIDING_NAMES, work_dir)
+    finally:
+        shutil.rmtree(work_dir)
+
+    # No seed separates the colliding names if only seed 0 is tried, the
+    # seed search fails for every bucket count.
+    max_seed = perfect_hash.MAX_SEED
+    perfect_hash.MAX_SEED = 0
+    try:
+        perfect_hash.build(COLLIDING_NAMES)
+        print_red('The seed search did not fail for the colliding names')
+        failed += 1
+    except perfect_hash.PerfectHashError:
+        pass
+    finally:
+        perfect_hash.MAX_SEED = max_seed
+
+    for keys in ([], ['fs', 'fs']):
+        try:
+            perfect_hash.build(keys)
+            print_red('No error for the keys %r' % keys)
+            failed += 1
+        except perfect_hash.PerfectHashError:
+            pass
+
+    if failed:
+        sys.exit(1)
+    print_green('Module lookup tests succeeded.')
+
+if __name__ == '__main__':
+    main()
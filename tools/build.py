@@ -22,11 +22,22 @@ except:
     basestring = str
 
 import argparse
+import atexit
+import copy
 import json
 import sys
 import re
 import os
-
+import time
+
+from build_lib import compiler_cache
+from build_lib import fingerprint
+from build_lib import host_tools
+from build_lib import matrix
+from build_lib import parallel
+from build_lib import pgo
+from build_lib import steps
+from build_lib import trace
 from common_py import path
 from common_py.system.filesystem import FileSystem as fs
 from common_py.system.executor import Executor as ex
@@ -35,20 +46,11 @@ from common_py.system.sys_platform import Platform
 
 platform = Platform()
 
-# Initialize build options.
-def init_options():
-    # Check config options.
-    arg_config = list(filter(lambda x: x.startswith('--config='), sys.argv))
-    config_path = path.BUILD_CONFIG_PATH
+# Timeline of the build (--build-trace)
+tracer = trace.Tracer()
 
-    if arg_config:
-        config_path = arg_config[-1].split('=', 1)[1]
-
-    build_config = {}
-    with open(config_path, 'rb') as f:
-        build_config = json.loads(f.read().decode('ascii'))
-
-    # Read config file and apply it to argv.
+# Convert build config options to command line arguments.
+def config_to_argv(build_config):
     argv = []
 
     list_with_commas = ['external-modules']
@@ -68,8 +70,30 @@ def init_options():
             for val in opt_val:
                 argv.append('--%s=%s' % (opt_key, val))
 
+    return argv
+
+
+# Initialize build options.
+def init_options(args=None):
+    if args is None:
+        args = sys.argv[1:]
+
+    # Check config options.
+    arg_config = list(filter(lambda x: x.startswith('--config='), args))
+    config_path = path.BUILD_CONFIG_PATH
+
+    if arg_config:
+        config_path = arg_config[-1].split('=', 1)[1]
+
+    build_config = {}
+    with open(config_path, 'rb') as f:
+        build_config = json.loads(f.read().decode('ascii'))
+
+    # Read config file and apply it to argv.
+    argv = config_to_argv(build_config)
+
     # Apply command line argument to argv.
-    argv = argv + sys.argv[1:]
+    argv = argv + args
 
     # Prepare argument parser.
     parser = argparse.ArgumentParser(description='Building tool for IoT.js '
@@ -77,11 +101,29 @@ def init_options():
 
     iotjs_group = parser.add_argument_group('Arguments of IoT.js',
         'The following arguments are related to the IoT.js framework.')
+    iotjs_group.add_argument('--app-dir', default=None,
+        help='Specify the directory of the application, its JS and JSON '
+             'files are bundled into the binary')
+    iotjs_group.add_argument('--app-main', default=None,
+        help='Specify the main script of the bundled application relative '
+             'to --app-dir (default: index.js)')
+    iotjs_group.add_argument('--app-entry', default=None,
+        help='Specify the entry script of the application, the builtin JS '
+             'modules which are not required by it are dropped')
     iotjs_group.add_argument('--buildtype',
         choices=['debug', 'release'], default='debug', type=str.lower,
         help='Specify the build type (default: %(default)s).')
     iotjs_group.add_argument('--builddir', default=path.BUILD_ROOT,
         help='Specify the build directory (default: %(default)s)')
+    iotjs_group.add_argument('--build-report',
+        action='store_true', default=False,
+        help='Record the compile and link steps and report the achieved '
+             'parallelism and the critical path of the build')
+    iotjs_group.add_argument('--build-trace',
+        action='store_true', default=False,
+        help='Write the timeline of the build phases and steps to '
+             'build_trace.json of the build directory (Chrome trace format) '
+             'and summarize the slowest phases')
     iotjs_group.add_argument('--buildlib', action='store_true', default=False,
         help='Build IoT.js static library only (default: %(default)s)')
     iotjs_group.add_argument('--create-shared-lib',
@@ -91,6 +133,10 @@ def init_options():
         action='append', default=[],
         help='Specify additional cmake parameters '
              '(can be used multiple times)')
+    iotjs_group.add_argument('--compiler-cache',
+        choices=compiler_cache.COMPILER_CACHES, default=None,
+        help='Launch the compile commands of IoT.js and of its dependencies '
+             'through the given compiler cache and report its hit rate')
     iotjs_group.add_argument('--compile-flag',
         action='append', default=[],
         help='Specify additional compile flags (can be used multiple times)')
@@ -114,12 +160,26 @@ def init_options():
         action='store', default=set(), type=lambda x: set(x.split(',')),
         help='Specify the path of modules.json files which should be processed '
              '(format: path1,path2,...)')
+    iotjs_group.add_argument('-j', '--jobs', type=int, default=None,
+        help='Specify the number of parallel build jobs (default: limited '
+             'by the CPUs and the available memory)')
+    iotjs_group.add_argument('--job-memory', metavar='MIB', type=int,
+        default=None,
+        help='Specify the expected memory of a build job in MiB, which '
+             'limits the number of jobs (default: %d, %d with --jerry-lto)'
+             % (parallel.JOB_MEMORY, parallel.LTO_JOB_MEMORY))
+    iotjs_group.add_argument('--matrix', metavar='FILE', default=None,
+        help='Build the configurations of the given JSON matrix file in '
+             'parallel, each into a build directory of its own')
     iotjs_group.add_argument('--link-flag',
         action='append', default=[],
         help='Specify additional linker flags (can be used multiple times)')
     iotjs_group.add_argument('--n-api',
         action='store_true', default=False,
         help='Enable to build N-API feature')
+    iotjs_group.add_argument('--ninja',
+        action='store_true', default=False,
+        help='Generate Ninja build files instead of Makefiles')
     iotjs_group.add_argument('--no-check-valgrind',
         action='store_true', default=False,
         help='Disable test execution with valgrind after build')
@@ -134,8 +194,22 @@ def init_options():
         help='Disable snapshot generation for IoT.js')
     iotjs_group.add_argument('--nuttx-home', default=None, dest='sysroot',
         help='Specify the NuttX base directory (required for NuttX build)')
+    iotjs_group.add_argument('--pgo',
+        action='store_true', default=False,
+        help='Build with profile-guided optimization: build an instrumented '
+             'IoT.js, run the workload and rebuild with the profiles')
+    iotjs_group.add_argument('--pgo-workload', metavar='PATH',
+        action='append', default=[],
+        help='Specify the workload of --pgo: "%s" (the test suite), a '
+             'directory of JS benchmarks or a JS script (can be used '
+             'multiple times, default: %s)' % (pgo.TESTRUNNER_WORKLOAD,
+                                                pgo.TESTRUNNER_WORKLOAD))
     iotjs_group.add_argument('--profile',
         help='Specify the module profile file for IoT.js')
+    iotjs_group.add_argument('--reconfigure',
+        action='store_true', default=False,
+        help='Run cmake even if the configuration did not change since '
+             'the last build')
     iotjs_group.add_argument('--run-test',
         nargs='?', default=False, const="quiet", choices=["full", "quiet"],
         help='Execute tests after build, optional argument specifies '
@@ -159,6 +233,9 @@ def init_options():
     iotjs_group.add_argument('--expose-gc',
         action='store_true', default=False,
         help='Expose the JerryScript\'s GC call to JavaScript')
+    # Snapshot tool of the host tools cache of a matrix
+    iotjs_group.add_argument('--host-snapshot-tool', default=None,
+        help=argparse.SUPPRESS)
 
 
 
@@ -225,6 +302,19 @@ def adjust_options(options):
     if options.target_os == 'darwin':
         options.no_check_valgrind = True
 
+    if options.ninja and options.target_os == 'windows':
+        ex.fail('--ninja is not supported for the windows target')
+
+    options.compiler_cache_path = None
+    if options.compiler_cache:
+        if options.target_os == 'windows':
+            ex.fail('--compiler-cache is not supported for the windows '
+                    'target')
+        options.compiler_cache_path = compiler_cache.find(
+            options.compiler_cache)
+        if not options.compiler_cache_path:
+            ex.fail('%s was not found' % options.compiler_cache)
+
     if options.target_board in ['rpi2', 'rpi3', 'artik10', 'artik05x']:
         options.no_check_valgrind = True
 
@@ -243,6 +333,19 @@ def adjust_options(options):
     cmake_path = fs.join(path.PROJECT_ROOT, 'cmake', 'config', '%s.cmake')
     options.cmake_toolchain_file = cmake_path % options.target_tuple
 
+    # Number of the parallel build jobs.
+    if options.no_parallel_build:
+        options.jobs = 1
+        options.jobs_limit = 'set by --no-parallel-build'
+    elif options.jobs:
+        options.jobs_limit = 'set by --jobs'
+    else:
+        job_memory = options.job_memory
+        if not job_memory:
+            job_memory = (parallel.LTO_JOB_MEMORY if options.jerry_lto
+                          else parallel.JOB_MEMORY)
+        options.jobs, options.jobs_limit = parallel.job_count(job_memory)
+
     # Set the default value of '--js-backtrace' if it is not defined.
     if not options.js_backtrace:
         if options.buildtype == 'debug':
@@ -256,8 +359,9 @@ def print_progress(msg):
 
 
 def init_submodule():
-    ex.check_run_cmd('git', ['submodule', 'init'])
-    ex.check_run_cmd('git', ['submodule', 'update'])
+    with tracer.phase('submodule init'):
+        ex.check_run_cmd('git', ['submodule', 'init'])
+        ex.check_run_cmd('git', ['submodule', 'update'])
 
 
 def build_cmake_args(options):
@@ -265,6 +369,8 @@ def build_cmake_args(options):
     # compile flags
     compile_flags = options.compile_flag
     compile_flags += options.jerry_compile_flag
+    if options.compiler_cache:
+        compile_flags += compiler_cache.compile_flags(path.PROJECT_ROOT)
 
     cmake_args.append("-DEXTERNAL_COMPILE_FLAGS='%s'" %
         (' '.join(compile_flags)))
@@ -300,12 +406,101 @@ def build_cmake_args(options):
 
 
 def run_make(options, build_home, *args):
-    make_opt = ['-C', build_home]
+    make_opt = ['-C', build_home, '-j%d' % options.jobs]
     make_opt.extend(args)
-    if not options.no_parallel_build:
-        make_opt.append('-j')
 
-    ex.check_run_cmd('make', make_opt)
+    if options.ninja:
+        # The external projects are built by a ninja of their own, which
+        # does not share the job limit of the top level one.
+        os.environ['CMAKE_BUILD_PARALLEL_LEVEL'] = str(options.jobs)
+        ex.check_run_cmd('ninja', make_opt)
+    else:
+        ex.check_run_cmd('make', make_opt)
+
+
+def cmake_cache_value(build_root, name):
+    """ Return the value of the entry of the CMakeCache.txt of the build
+        directory or None.
+    """
+    cache_path = fs.join(build_root, 'CMakeCache.txt')
+    if not fs.exists(cache_path):
+        return None
+
+    with open(cache_path, 'r') as cache_file:
+        for line in cache_file:
+            if line.startswith(name + ':') and '=' in line:
+                return line.strip().split('=', 1)[1]
+    return None
+
+
+def check_generator(options):
+    # cmake can not switch the generator of an existing build directory.
+    current = cmake_cache_value(options.build_root, 'CMAKE_GENERATOR')
+    if current is None:
+        return
+
+    generator = 'Ninja' if options.ninja else 'Unix Makefiles'
+    if current != generator and 'Visual Studio' not in current:
+        ex.fail('%s was generated for "%s", use --clean to build it with '
+                '"%s"' % (options.build_root, current, generator))
+
+
+def run_build(options):
+    """ Build the configured build directory, with --compiler-cache the
+        hit rate of the cache is reported.
+    """
+    print_progress('Parallel build: %d jobs (%s)' % (
+                   options.jobs, options.jobs_limit))
+    if options.compiler_cache:
+        stats = compiler_cache.read_stats(options.compiler_cache,
+                                          options.compiler_cache_path)
+        try:
+            run_build_steps(options)
+        finally:
+            print()
+            print(compiler_cache.format_stats(
+                  options.compiler_cache, stats,
+                  compiler_cache.read_stats(options.compiler_cache,
+                                            options.compiler_cache_path)))
+            print()
+    else:
+        run_build_steps(options)
+
+
+def run_build_steps(options):
+    """ Run the build, with --build-report or --build-trace the compile and
+        link steps are recorded.
+    """
+    if not options.build_report and not options.build_trace:
+        with tracer.phase('build'):
+            run_make(options, options.build_root)
+        return
+
+    log_path = fs.join(options.build_root, 'build_steps.log')
+    if fs.exists(log_path):
+        fs.remove(log_path)
+    os.environ[steps.STEP_LOG_ENV] = log_path
+
+    start = time.time()
+    try:
+        with tracer.phase('build'):
+            run_make(options, options.build_root)
+    finally:
+        # The steps of a failed build are traced as well
+        del os.environ[steps.STEP_LOG_ENV]
+        build_steps = steps.read_log(log_path)
+        tracer.add_steps(build_steps, options.build_root)
+    wall_time = time.time() - start
+
+    if not options.build_report:
+        return
+    summary = steps.summarize(build_steps, wall_time)
+    if summary:
+        print()
+        print(steps.format_report(summary, options.jobs, options.build_root))
+        print()
+    else:
+        print('\nBuild steps: nothing was compiled or linked\n')
 
 
 def get_on_off(boolean_value):
@@ -316,8 +511,83 @@ def get_on_off(boolean_value):
 
 
 def build_iotjs(options):
+    if not options.host_snapshot_tool:
+        options.host_snapshot_tool = host_snapshot_tool(
+            options, fs.join(path.PROJECT_ROOT, options.builddir,
+                             host_tools.HOST_TOOLS_DIR))
+
     print_progress('Build IoT.js')
 
+    configure_iotjs(options)
+
+    if options.target_os == 'windows':
+        print("\nPlease open the iot.js solution file in Visual Studio!")
+    else:
+        run_build(options)
+
+
+def jerry_host_params(options):
+    # The EXTRA_JERRY_CMAKE_PARAMS of the host JerryScript
+    if options.jerry_cmake_param:
+        return ' '.join(options.jerry_cmake_param).split()
+    if options.jerry_heaplimit and options.jerry_heaplimit > 512:
+        return ['-DJERRY_CPOINTER_32_BIT=ON']
+    return []
+
+
+def host_snapshot_tool(options, cache_root):
+    """ Return the host jerry-snapshot of the host tools cache, it is built
+        if it is not in the cache yet. Returns None if the build does not
+        use the cache.
+    """
+    if (options.no_snapshot or options.target_os == 'windows' or
+            platform.os() == 'windows'):
+        return None
+    compiler = host_tools.compiler_identity()
+    if compiler is None:
+        return None
+
+    cmake_args = host_tools.jerry_host_cmake_args(options.buildtype,
+                                                  options.jerry_lto,
+                                                  options.jerry_profile,
+                                                  jerry_host_params(options))
+    input_files = []
+    if fs.isabs(options.jerry_profile) and fs.exists(options.jerry_profile):
+        input_files.append(options.jerry_profile)
+    key = host_tools.cache_key(cmake_args, path.JERRY_ROOT, compiler,
+                               input_files)
+    tool = host_tools.snapshot_tool(cache_root, key)
+    if fs.exists(tool):
+        print_progress('Host snapshot tool: %s' % tool)
+        return tool
+
+    print_progress('Build the host snapshot tool %s' % key)
+    tool_dir = host_tools.tool_dir(cache_root, key)
+    work_dir = '%s.tmp-%d' % (tool_dir, os.getpid())
+    build_dir = fs.join(work_dir, 'build')
+    fs.rmtree(work_dir)
+    if options.ninja:
+        cmake_args = ['-GNinja'] + cmake_args
+    if options.compiler_cache_path:
+        cmake_args.append('-DCMAKE_C_COMPILER_LAUNCHER=%s' %
+                          options.compiler_cache_path)
+    with tracer.phase('host jerry'):
+        ex.check_run_cmd('cmake', ['-B%s' % build_dir,
+                                   '-H%s' % path.JERRY_ROOT,
+                                   '-DCMAKE_INSTALL_PREFIX=%s' % work_dir] +
+                         cmake_args)
+        run_make(options, build_dir, 'install')
+    fs.rmtree(build_dir)
+
+    # A parallel build may have added the same tool in the meantime.
+    try:
+        os.rename(work_dir, tool_dir)
+    except OSError:
+        fs.rmtree(work_dir)
+    return tool
+
+
+def configure_iotjs(options):
     # Set IoT.js cmake options.
     cmake_opt = [
         '-B%s' % options.build_root,
@@ -341,6 +611,25 @@ def build_iotjs(options):
         "-DJERRY_PROFILE='%s'" % options.jerry_profile,
     ]
 
+    # --ninja
+    if options.ninja:
+        cmake_opt.append('-GNinja')
+
+    # --build-report, --build-trace
+    build_launcher = ''
+    if ((options.build_report or options.build_trace) and
+            options.target_os != 'windows'):
+        build_launcher = fs.join(path.TOOLS_ROOT, 'build_lib', 'steps.py')
+    cmake_opt.append('-DIOTJS_BUILD_LAUNCHER=%s' % build_launcher)
+
+    # --compiler-cache
+    cmake_opt.append('-DIOTJS_COMPILER_LAUNCHER=%s' %
+                     (options.compiler_cache_path or ''))
+
+    # --host-snapshot-tool
+    cmake_opt.append('-DJERRY_HOST_SNAPSHOT_TOOL=%s' %
+                     (options.host_snapshot_tool or ''))
+
     if options.target_os in ['nuttx', 'tizenrt']:
         cmake_opt.append("-DEXTERNAL_LIBC_INTERFACE='%s'" %
                          fs.join(options.sysroot, 'include'))
@@ -388,16 +677,68 @@ def build_iotjs(options):
     if options.profile:
         cmake_opt.append("-DIOTJS_PROFILE='%s'" % options.profile)
 
+    # --app-dir, --app-main
+    if options.app_dir:
+        cmake_opt.append("-DJS2C_APP_DIR='%s'" % fs.abspath(options.app_dir))
+    if options.app_main:
+        cmake_opt.append("-DJS2C_APP_MAIN='%s'" % options.app_main)
+
+    # --app-entry
+    if options.app_entry:
+        cmake_opt.append("-DJS2C_APP_ENTRY='%s'" %
+                         fs.abspath(options.app_entry))
+
     # Add common cmake options.
     cmake_opt.extend(build_cmake_args(options))
 
-    # Run cmake.
-    ex.check_run_cmd('cmake', cmake_opt)
-
-    if options.target_os == 'windows':
-        print("\nPlease open the iot.js solution file in Visual Studio!")
+    # Run cmake, unless the configuration did not change.
+    check_generator(options)
+    fingerprint_path = fs.join(options.build_root, 'build_fingerprint.json')
+    previous = fingerprint.load(fingerprint_path)
+    current = fingerprint.create(cmake_opt, configure_inputs(options))
+    if not fs.exists(fs.join(options.build_root, 'CMakeCache.txt')):
+        reasons = ['the build directory is not configured']
+    elif options.reconfigure:
+        reasons = ['set by --reconfigure']
     else:
-        run_make(options, options.build_root)
+        reasons = fingerprint.changes(previous, current)
+    if not reasons:
+        print_progress('Skip cmake, the configuration did not change')
+        return
+
+    print_progress('Configure: %s' % '\n    '.join(reasons))
+    # The options which are no longer given get their default value back
+    unset_opt = ['-U%s' % name for name in
+                 fingerprint.removed_definitions(previous, current)]
+    fs.maybe_make_directory(options.build_root)
+    fingerprint.write(fingerprint_path, current)
+    with tracer.phase('cmake configure'):
+        ex.check_run_cmd('cmake', unset_opt + cmake_opt)
+    current['configured'] = True
+    fingerprint.write(fingerprint_path, current)
+
+
+def configure_inputs(options):
+    """ Return the files which are read to configure the build, besides
+        the CMakeLists.txt files.
+    """
+    def project_path(file_path):
+        return fs.normpath(fs.join(path.PROJECT_ROOT, file_path))
+
+    inputs = [fs.abspath(options.config_path),
+              options.cmake_toolchain_file,
+              project_path(options.profile or
+                           fs.join('profiles', 'default.profile')),
+              fs.join(path.SRC_ROOT, 'modules.json')]
+    inputs.extend([fs.join(project_path(module_dir), 'modules.json')
+                   for module_dir in sorted(options.external_modules)])
+
+    if fs.isabs(options.jerry_profile):
+        inputs.append(options.jerry_profile)
+    else:
+        inputs.append(fs.join(path.JERRY_PROFILE_ROOT,
+                              '%s.profile' % options.jerry_profile))
+    return inputs
 
 
 def run_checktest(options):
@@ -411,21 +752,215 @@ def run_checktest(options):
         args.append('--quiet')
 
     fs.chdir(path.PROJECT_ROOT)
-    code = ex.run_cmd(cmd, args)
+    with tracer.phase('tests'):
+        code = ex.run_cmd(cmd, args)
     if code != 0:
         ex.fail('Failed to pass unit tests')
 
     if not options.no_check_valgrind:
-        code = ex.run_cmd(cmd, ['--valgrind'] + args)
+        with tracer.phase('tests (valgrind)'):
+            code = ex.run_cmd(cmd, ['--valgrind'] + args)
         if code != 0:
             ex.fail('Failed to pass unit tests in valgrind environment')
 
 
+def runs_on_host(options):
+    # Whether the built IoT.js can be run on the host
+    return (options.host_tuple == options.target_tuple or
+            (options.host_tuple == 'x86_64-linux' and
+             options.target_tuple == 'i686-linux') or
+            (options.host_tuple == 'x86_64-linux' and
+             options.target_tuple == 'x86_64-mock'))
+
+
+def pgo_build_options(options, flags):
+    """ Return the options of a build of --pgo, with the given compile and
+        link flags added.
+    """
+    step_options = copy.copy(options)
+    step_options.compile_flag = list(options.compile_flag) + flags
+    step_options.link_flag = list(options.link_flag) + flags
+    step_options.jerry_compile_flag = list(options.jerry_compile_flag)
+    return step_options
+
+
+def run_pgo(options):
+    if options.buildtype != 'release':
+        ex.fail('--pgo needs --buildtype=release')
+    if options.buildlib or not runs_on_host(options):
+        ex.fail('--pgo runs the workload on the host, the %s %s can not be '
+                'run there' % (options.target_tuple,
+                               'library' if options.buildlib else 'build'))
+    iotjs = fs.join(options.build_root, 'bin', 'iotjs')
+    profile_dir = fs.join(options.build_root, 'pgo')
+    items = pgo.workload_items(options.pgo_workload or
+                               [pgo.TESTRUNNER_WORKLOAD], iotjs,
+                               fs.join(path.TOOLS_ROOT, 'testrunner.py'),
+                               options.target_os, path.PROJECT_ROOT)
+    if not items:
+        ex.fail('The workload of --pgo has no scripts')
+
+    print_progress('PGO 1/3: Baseline')
+    build_iotjs(pgo_build_options(options, []))
+    # The flags depend on the compiler which cmake picked for the build.
+    compiler = cmake_cache_value(options.build_root, 'CMAKE_C_COMPILER')
+    kind = pgo.compiler_kind(host_tools.compiler_identity(compiler))
+    if kind is None:
+        ex.fail('--pgo needs GCC or clang, the build uses %s' % compiler)
+    with tracer.phase('pgo baseline'):
+        before = pgo.benchmark(items)
+
+    print_progress('PGO 2/3: Instrumented build and workload')
+    fs.rmtree(profile_dir)
+    fs.maybe_make_directory(profile_dir)
+    build_iotjs(pgo_build_options(options,
+                                  pgo.generate_flags(profile_dir)))
+    with tracer.phase('pgo workload'):
+        for item in items:
+            print('    %s' % item.name)
+            retcode, _ = pgo.run_item(item)
+            if retcode != 0:
+                Terminal.pprint('    the workload failed (%d), its profile '
+                                'is used anyway' % retcode, Terminal.yellow)
+    if not pgo.profile_files(kind, profile_dir):
+        ex.fail('The workload of --pgo did not write any profiles')
+    merge_cmd = pgo.merge_command(kind, profile_dir)
+    if merge_cmd:
+        ex.check_run_cmd(merge_cmd[0], merge_cmd[1:])
+
+    print_progress('PGO 3/3: Build with the profiles')
+    build_iotjs(pgo_build_options(options, pgo.use_flags(kind, profile_dir)))
+    with tracer.phase('pgo benchmark'):
+        after = pgo.benchmark(items)
+
+    print()
+    print(pgo.format_comparison(items, before, after))
+    print()
+
+
+def write_build_trace(options):
+    """ Write the trace of the build, also when the build failed. """
+    if not fs.exists(options.build_root):
+        return
+    trace_path = fs.join(options.build_root, 'build_trace.json')
+    tracer.write(trace_path)
+    phase_rows, step_rows = tracer.summary()
+    print()
+    print(trace.format_summary(phase_rows, step_rows, trace_path))
+    print()
+
+
+def matrix_base_args(args):
+    """ Return the command line arguments without the ones which are
+        handled by the matrix build itself.
+    """
+    base_args = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == '--matrix':
+            skip = True
+        elif not arg.startswith('--matrix=') and arg != '--clean':
+            base_args.append(arg)
+    return base_args
+
+
+def run_matrix(options):
+    try:
+        configs = matrix.load(options.matrix)
+    except matrix.MatrixError as e:
+        ex.fail(str(e))
+
+    base_args = matrix_base_args(sys.argv[1:])
+    entries = []
+    build_roots = set()
+    for config in configs:
+        clean = config.pop('clean', False)
+        config_args = base_args + config_to_argv(config)
+        name = matrix.slug(config)
+        if name:
+            config_args.append('--builddir=%s' %
+                               fs.join(options.builddir, name))
+        config_options = init_options(config_args)
+        adjust_options(config_options)
+        if config_options.build_root in build_roots:
+            ex.fail('The matrix has the same configuration twice: %s' %
+                    matrix.describe(config, config_options.target_tuple,
+                                    config_options.buildtype))
+        build_roots.add(config_options.build_root)
+        if options.clean or clean or config_options.clean:
+            fs.rmtree(config_options.build_root)
+        entries.append((config, config_args, config_options))
+
+    # The host snapshot tools are built before the parallel builds, into
+    # the host tools cache of the matrix.
+    cache_root = fs.join(path.PROJECT_ROOT, options.builddir,
+                         host_tools.HOST_TOOLS_DIR)
+    snapshot_tools = [host_snapshot_tool(config_options, cache_root)
+                      for _, _, config_options in entries]
+
+    parallel_builds = min(len(entries), options.jobs)
+    jobs = max(options.jobs // parallel_builds, 1)
+    log_dir = fs.join(path.PROJECT_ROOT, options.builddir, 'matrix-logs')
+    builds = []
+    for (config, config_args, config_options), snapshot_tool in zip(
+            entries, snapshot_tools):
+        name = matrix.describe(config, config_options.target_tuple,
+                               config_options.buildtype)
+        cmd = [sys.executable, fs.join(path.TOOLS_ROOT, 'build.py')]
+        cmd.extend(config_args)
+        cmd.extend(['--no-init-submodule', '--jobs=%d' % jobs])
+        if snapshot_tool:
+            cmd.append('--host-snapshot-tool=%s' % snapshot_tool)
+        log_path = fs.join(log_dir, '%s.log' % name.replace(' ', '_'))
+        builds.append(matrix.Build(name, cmd, log_path))
+
+    print_progress('Build %d configurations, %d at a time with %d jobs '
+                   'each' % (len(builds), parallel_builds, jobs))
+    start = time.time()
+    matrix.run(builds, parallel_builds)
+    total_time = time.time() - start
+
+    failed = [build for build in builds if build.returncode != 0]
+    print()
+    for build in builds:
+        print('  %-8s %-50s %7.1f s' % ('FAILED' if build in failed else 'ok',
+                                         build.name, build.time))
+    print('\nMatrix: %d of %d configurations built in %.1f s, the logs are '
+          'in %s\n' % (len(builds) - len(failed), len(builds), total_time,
+                       log_dir))
+
+    for build in failed:
+        Terminal.pprint('==> %s (%s)' % (build.name, build.log_path),
+                        Terminal.red)
+        print(''.join(matrix.log_tail(build.log_path)))
+
+    if failed:
+        ex.fail('%d configuration(s) of the matrix failed' % len(failed))
+    Terminal.pprint("\nIoT.js Matrix Build Succeeded!!\n", Terminal.green)
+
+
 if __name__ == '__main__':
     # Initialize build option object.
     options = init_options()
     adjust_options(options)
 
+    if options.compiler_cache:
+        os.environ.update(compiler_cache.environment(options.compiler_cache,
+                                                     path.PROJECT_ROOT))
+
+    if options.matrix:
+        if not options.no_init_submodule:
+            print_progress('Initialize submodule')
+            init_submodule()
+        run_matrix(options)
+        exit(0)
+
+    if options.build_trace:
+        ex.trace = tracer.command
+        atexit.register(write_build_trace, options)
+
     if options.clean:
         print_progress('Clear build directories')
         test_build_root = fs.join(path.TEST_ROOT,
@@ -439,7 +974,10 @@ if __name__ == '__main__':
         print_progress('Initialize submodule')
         init_submodule()
 
-    build_iotjs(options)
+    if options.pgo:
+        run_pgo(options)
+    else:
+        build_iotjs(options)
 
     Terminal.pprint("\nIoT.js Build Succeeded!!\n", Terminal.green)
 
@@ -448,11 +986,7 @@ if __name__ == '__main__':
         print_progress('Run tests')
         if options.buildlib:
             print("Skip unit tests - build target is library\n")
-        elif (options.host_tuple == options.target_tuple or
-              (options.host_tuple == 'x86_64-linux' and
-               options.target_tuple == 'i686-linux') or
-              (options.host_tuple == 'x86_64-linux' and
-               options.target_tuple == 'x86_64-mock')):
+        elif runs_on_host(options):
              run_checktest(options)
         else:
             print("Skip unit tests - target-host pair is not allowed\n")
@@ -0,0 +1 @@
+# Required for Python to search this directory for module files
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Compiler cache support of build.py --compiler-cache.
+
+    The compile commands of IoT.js and of the external projects are
+    launched through ccache or sccache. To let the builds of different
+    checkouts share the cache entries, ccache rewrites the paths under the
+    project root to relative ones (CCACHE_BASEDIR) and does not hash the
+    working directory (CCACHE_NOHASHDIR), while the compile flags map the
+    project root out of the debug information.
+
+    The statistics of the cache are global, the report of a build is the
+    difference of the statistics before and after it, so the builds
+    running at the same time are counted as well.
+"""
+
+import json
+import os
+import subprocess
+
+COMPILER_CACHES = ['ccache', 'sccache']
+
+
+def find(name):
+    """ Return the path of the given executable or None. """
+    for directory in os.environ.get('PATH', '').split(os.pathsep):
+        candidate = os.path.join(directory, name)
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+    return None
+
+
+def environment(name, project_root):
+    """ Return the environment variables which make the cache entries
+        independent of the location of the project. The variables set by
+        the user are kept.
+    """
+    env = {}
+    if name == 'ccache':
+        env['CCACHE_BASEDIR'] = project_root
+        env['CCACHE_NOHASHDIR'] = '1'
+    return dict([(key, value) for key, value in env.items()
+                 if key not in os.environ])
+
+
+def compile_flags(project_root):
+    return ['-fdebug-prefix-map=%s=.' % project_root]
+
+
+def _output(cmd):
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+        output = process.communicate()[0].decode('utf-8', 'replace')
+    except OSError:
+        return None
+    if process.returncode != 0:
+        return None
+    return output
+
+
+def _sccache_count(value):
+    # Newer versions count the hits and misses per language
+    if isinstance(value, dict):
+        return sum(value.get('counts', {}).values())
+    return value
+
+
+def read_stats(name, tool):
+    """ Return the dict of the 'hits' and 'misses' of the cache or None if
+        the statistics are not available.
+    """
+    if name == 'ccache':
+        # Machine readable statistics of ccache 3.7 and newer
+        output = _output([tool, '--print-stats'])
+        if output is None:
+            return None
+        counters = {}
+        for line in output.splitlines():
+            fields = line.split('\t')
+            if len(fields) == 2 and fields[1].isdigit():
+                counters[fields[0]] = int(fields[1])
+        return {
+            'hits': (counters.get('direct_cache_hit', 0) +
+                     counters.get('preprocessed_cache_hit', 0)),
+            'misses': counters.get('cache_miss', 0),
+        }
+
+    output = _output([tool, '--show-stats', '--stats-format=json'])
+    if output is None:
+        return None
+    try:
+        stats = json.loads(output)['stats']
+        return {
+            'hits': _sccache_count(stats['cache_hits']),
+            'misses': _sccache_count(stats['cache_misses']),
+        }
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def format_stats(name, before, after):
+    if before is None or after is None:
+        return 'Compiler cache (%s): the statistics are not available' % name
+    hits = after['hits'] - before['hits']
+    misses = after['misses'] - before['misses']
+    if hits + misses == 0:
+        return 'Compiler cache (%s): nothing was compiled' % name
+    return 'Compiler cache (%s): %d hits, %d misses, %.1f%% hit rate' % (
+           name, hits, misses, 100.0 * hits / (hits + misses))
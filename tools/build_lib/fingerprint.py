@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Configuration fingerprint of build.py.
+
+    The fingerprint of a build directory records the cmake arguments of
+    its last configure, whether it succeeded, and the digests of the files
+    which were read to make them (build.config, the profiles, the
+    modules.json files and the toolchain file). build.py skips cmake while
+    the fingerprint matches: changes of the CMakeLists.txt files are
+    picked up by the generated build system itself.
+"""
+
+import hashlib
+import json
+import os
+
+FINGERPRINT_VERSION = 1
+
+
+def file_digest(file_path):
+    """ Return the SHA-1 of the given file or None if it does not exist. """
+    if not os.path.isfile(file_path):
+        return None
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as finput:
+        digest.update(finput.read())
+    return digest.hexdigest()
+
+
+def create(cmake_args, input_files):
+    return {
+        'version': FINGERPRINT_VERSION,
+        'configured': False,
+        'cmake_args': list(cmake_args),
+        'files': dict([(file_path, file_digest(file_path))
+                       for file_path in input_files]),
+    }
+
+
+def load(fingerprint_path):
+    """ Return the stored fingerprint or None. """
+    if not os.path.exists(fingerprint_path):
+        return None
+    with open(fingerprint_path, 'r') as ffingerprint:
+        try:
+            return json.load(ffingerprint)
+        except ValueError:
+            return None
+
+
+def write(fingerprint_path, fingerprint):
+    with open(fingerprint_path, 'w') as ffingerprint:
+        json.dump(fingerprint, ffingerprint, indent=2, sort_keys=True)
+        ffingerprint.write('\n')
+
+
+def _definitions(cmake_args):
+    return set([arg[2:].split('=', 1)[0].split(':', 1)[0]
+                for arg in cmake_args if arg.startswith('-D')])
+
+
+def removed_definitions(old, new):
+    """ Return the names of the cache entries which were defined by the
+        old cmake arguments only. cmake keeps them in its cache, so they
+        have to be unset to get their default value back.
+    """
+    if old is None:
+        return []
+    return sorted(_definitions(old.get('cmake_args', [])) -
+                  _definitions(new['cmake_args']))
+
+
+def changes(old, new):
+    """ Return the list of the differences of two fingerprints, an empty
+        list if the configuration did not change.
+    """
+    if old is None:
+        return ['there is no fingerprint of a previous configure']
+    if old.get('version') != new['version']:
+        return ['the fingerprint format changed']
+    if not old.get('configured'):
+        return ['the last configure did not succeed']
+
+    reasons = []
+    old_args = old.get('cmake_args', [])
+    new_args = new['cmake_args']
+    for arg in old_args:
+        if arg not in new_args:
+            reasons.append('cmake argument removed: %s' % arg)
+    for arg in new_args:
+        if arg not in old_args:
+            reasons.append('cmake argument added: %s' % arg)
+    if not reasons and old_args != new_args:
+        reasons.append('the order of the cmake arguments changed')
+
+    old_files = old.get('files', {})
+    new_files = new['files']
+    for file_path in sorted(set(old_files) | set(new_files)):
+        if file_path not in new_files:
+            reasons.append('no longer an input: %s' % file_path)
+        elif file_path not in old_files:
+            reasons.append('new input: %s' % file_path)
+        elif old_files[file_path] != new_files[file_path]:
+            if new_files[file_path] is None:
+                reasons.append('removed: %s' % file_path)
+            elif old_files[file_path] is None:
+                reasons.append('created: %s' % file_path)
+            else:
+                reasons.append('changed: %s' % file_path)
+
+    return reasons
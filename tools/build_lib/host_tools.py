@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Host tools cache of build.py.
+
+    The host jerry-snapshot only depends on the host compiler, the
+    JerryScript sources, the JerryScript configuration and the build type,
+    not on the target of IoT.js. So build.py builds it once into
+
+      <builddir>/host-tools/jerry-snapshot-<key>/bin/jerry-snapshot
+
+    where the key is the digest of these inputs, and every build directory
+    uses it (JERRY_HOST_SNAPSHOT_TOOL of cmake/jerry.cmake). A tool is
+    built in a directory of its own and renamed into the cache when it is
+    complete, so parallel builds never see a partial tool. Old entries are
+    not removed, the cache can be deleted at any time.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+
+HOST_TOOLS_DIR = 'host-tools'
+
+# The parts of JerryScript which the snapshot tool is built from
+JERRY_SOURCES = ['CMakeLists.txt', 'cmake', 'jerry-core', 'jerry-ext',
+                 'jerry-libm', 'jerry-main', 'jerry-port']
+
+
+def jerry_host_cmake_args(buildtype, lto, jerry_profile, jerry_cmake_params):
+    """ Return the cmake arguments of the host JerryScript, the ones of the
+        hostjerry project of cmake/jerry.cmake. The tool has the build type
+        of the target, so a debug build gets the asserting tool.
+    """
+    return [
+        '-DCMAKE_BUILD_TYPE=%s' % buildtype.capitalize(),
+        '-DENABLE_ALL_IN_ONE=ON',
+        '-DENABLE_LTO=%s' % ('ON' if lto else 'OFF'),
+        '-DJERRY_CMDLINE=OFF',
+        '-DJERRY_CMDLINE_SNAPSHOT=ON',
+        '-DJERRY_EXT=ON',
+        '-DJERRY_LOGGING=ON',
+        '-DJERRY_ERROR_MESSAGES=ON',
+        '-DJERRY_SNAPSHOT_SAVE=ON',
+        '-DJERRY_PROFILE=%s' % jerry_profile,
+    ] + list(jerry_cmake_params) + [
+        '-DJERRY_SYSTEM_ALLOCATOR=OFF',
+    ]
+
+
+def source_digest(jerry_root):
+    """ Return the digest of the names and contents of the JerryScript
+        sources.
+    """
+    digest = hashlib.sha1()
+    for source in JERRY_SOURCES:
+        source_path = os.path.join(jerry_root, source)
+        if os.path.isfile(source_path):
+            file_paths = [source_path]
+        else:
+            file_paths = []
+            for dir_path, dir_names, file_names in os.walk(source_path):
+                dir_names.sort()
+                file_paths.extend([os.path.join(dir_path, name)
+                                   for name in sorted(file_names)])
+        for file_path in file_paths:
+            digest.update(os.path.relpath(file_path,
+                                          jerry_root).encode('utf-8'))
+            with open(file_path, 'rb') as fsource:
+                digest.update(hashlib.sha1(fsource.read()).digest())
+    return digest.hexdigest()
+
+
+def compiler_identity(compiler=None):
+    """ Return the path and the version of the C compiler or None. The
+        default is the host C compiler, which is the one cmake picks
+        without a toolchain file.
+    """
+    if not compiler:
+        compiler = os.environ.get('CC', 'cc')
+    try:
+        process = subprocess.Popen([compiler, '--version'],
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT)
+        version = process.communicate()[0].decode('utf-8', 'replace')
+    except OSError:
+        return None
+    if process.returncode != 0:
+        return None
+    return '%s\n%s' % (compiler, version)
+
+
+def cache_key(cmake_args, jerry_root, compiler, input_files=()):
+    """ Return the key of the tool, input_files are the files outside the
+        JerryScript sources the tool depends on (a custom profile).
+    """
+    inputs = [cmake_args, source_digest(jerry_root), compiler]
+    for file_path in input_files:
+        with open(file_path, 'rb') as finput:
+            inputs.append(hashlib.sha1(finput.read()).hexdigest())
+    return hashlib.sha1(json.dumps(inputs).encode('utf-8')).hexdigest()[:16]
+
+
+def tool_dir(cache_root, key):
+    return os.path.join(cache_root, 'jerry-snapshot-%s' % key)
+
+
+def snapshot_tool(cache_root, key):
+    """ Return the path of the cached tool, it exists if the tool was
+        built.
+    """
+    return os.path.join(tool_dir(cache_root, key), 'bin', 'jerry-snapshot')
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Build matrix of build.py --matrix.
+
+    The matrix file is a JSON object with the keys of build.config:
+
+      {
+        "common": { "jerry-lto": true },
+        "axes": {
+          "buildtype": ["debug", "release"],
+          "target-os": ["linux", "mock"],
+          "no-snapshot": [false, true]
+        },
+        "configs": [ { "profile": "profiles/minimal.profile" } ]
+      }
+
+    Every entry of 'configs' (or a single empty one) is combined with
+    every combination of the values of 'axes', over the 'common' options.
+    The configurations are built by build.py processes running in
+    parallel, each into a build directory of its own.
+"""
+
+from __future__ import print_function
+
+import itertools
+import json
+import os
+import re
+import subprocess
+import time
+
+# Options which are part of the build directory path already
+PATH_KEYS = ['buildtype', 'target-arch', 'target-os']
+
+
+class MatrixError(Exception):
+    pass
+
+
+def load(matrix_path):
+    """ Return the list of the configurations (dicts of build.config
+        options) of the given matrix file.
+    """
+    try:
+        with open(matrix_path, 'r') as fmatrix:
+            matrix = json.load(fmatrix)
+    except (IOError, ValueError) as e:
+        raise MatrixError('%s: %s' % (matrix_path, e))
+
+    if isinstance(matrix, list):
+        matrix = {'configs': matrix}
+    if not isinstance(matrix, dict):
+        raise MatrixError('%s: expected a JSON object' % matrix_path)
+    unknown = set(matrix) - set(['common', 'axes', 'configs'])
+    if unknown:
+        raise MatrixError('%s: unknown keys: %s' % (
+                          matrix_path, ', '.join(sorted(unknown))))
+
+    axes = matrix.get('axes', {})
+    for key, values in axes.items():
+        if not isinstance(values, list) or not values:
+            raise MatrixError('%s: the values of axis "%s" must be a '
+                              'non-empty list' % (matrix_path, key))
+
+    keys = sorted(axes)
+    configs = []
+    for base in matrix.get('configs') or [{}]:
+        for values in itertools.product(*[axes[key] for key in keys]):
+            config = dict(matrix.get('common', {}))
+            config.update(base)
+            config.update(zip(keys, values))
+            configs.append(config)
+
+    return configs
+
+
+def _slug_value(value):
+    if isinstance(value, list):
+        return '+'.join([_slug_value(item) for item in value])
+    value = str(value)
+    if '/' in value or os.sep in value:
+        value = os.path.splitext(os.path.basename(value))[0]
+    return re.sub(r'[^A-Za-z0-9.+-]+', '_', value)
+
+
+def slug(config):
+    """ Return the build directory name of the options of the config which
+        are not part of the build directory path (empty if there are none).
+    """
+    parts = []
+    for key in sorted(config):
+        value = config[key]
+        if key in PATH_KEYS or value in (False, None, '', []):
+            continue
+        if value is True:
+            parts.append(key)
+        else:
+            parts.append('%s-%s' % (key, _slug_value(value)))
+    return '_'.join(parts)
+
+
+def describe(config, target_tuple, buildtype):
+    """ Return a short description of the config for the summary. """
+    words = [target_tuple, buildtype]
+    name = slug(config)
+    if name:
+        words.append(name)
+    return ' '.join(words)
+
+
+class Build(object):
+    def __init__(self, name, cmd, log_path):
+        self.name = name
+        self.cmd = cmd
+        self.log_path = log_path
+        self.process = None
+        self.log_file = None
+        self.start = None
+        self.time = None
+        self.returncode = None
+
+
+def run(builds, parallel):
+    """ Run the given builds, at most 'parallel' of them at the same time.
+        The output of every build goes to its log file.
+    """
+    pending = list(builds)
+    running = []
+    while pending or running:
+        while pending and len(running) < parallel:
+            build = pending.pop(0)
+            log_dir = os.path.dirname(build.log_path)
+            if not os.path.isdir(log_dir):
+                os.makedirs(log_dir)
+            build.log_file = open(build.log_path, 'w')
+            build.start = time.time()
+            build.process = subprocess.Popen(build.cmd,
+                                             stdout=build.log_file,
+                                             stderr=subprocess.STDOUT)
+            running.append(build)
+            print('[started]  %s' % build.name)
+
+        time.sleep(0.2)
+        for build in list(running):
+            returncode = build.process.poll()
+            if returncode is None:
+                continue
+            build.returncode = returncode
+            build.time = time.time() - build.start
+            build.log_file.close()
+            running.remove(build)
+            print('[%s] %s (%.1f s)' % ('finished' if returncode == 0
+                                        else 'FAILED  ', build.name,
+                                        build.time))
+
+
+def log_tail(log_path, lines=20):
+    with open(log_path, 'r') as flog:
+        return flog.readlines()[-lines:]
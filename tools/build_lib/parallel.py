@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Number of the parallel build jobs of build.py.
+
+    A bare 'make -j' starts as many compilers as there are targets, which
+    runs out of memory on small build machines, especially when the
+    compile and link steps of LTO builds take a few GB each. The number
+    of jobs is limited by the CPUs and by the available memory divided by
+    the memory a single job is expected to take.
+"""
+
+import multiprocessing
+import os
+
+# Expected peak memory of a compile job in MiB, an LTO build compiles the
+# all-in-one JerryScript source and links the whole program at once.
+JOB_MEMORY = 512
+LTO_JOB_MEMORY = 2048
+
+
+def cpu_count():
+    """ Return the number of CPUs the build may run on. """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        pass
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def _read_number(file_path):
+    try:
+        with open(file_path, 'r') as fin:
+            value = fin.read().strip()
+    except (IOError, OSError):
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def _cgroup_memory():
+    """ Return the memory left to the cgroup of the build in bytes, or None
+        if it is not limited (cgroup v2 and v1).
+    """
+    for limit_path, usage_path in [
+            ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory.current'),
+            ('/sys/fs/cgroup/memory/memory.limit_in_bytes',
+             '/sys/fs/cgroup/memory/memory.usage_in_bytes')]:
+        limit = _read_number(limit_path)
+        usage = _read_number(usage_path)
+        # An unlimited cgroup v1 reports a huge page aligned number
+        if limit is not None and usage is not None and limit < 1 << 60:
+            return max(limit - usage, 0)
+    return None
+
+
+def available_memory():
+    """ Return the memory available for the build in MiB, or None if it is
+        unknown on this host.
+    """
+    memory = None
+    try:
+        with open('/proc/meminfo', 'r') as fin:
+            for line in fin:
+                if line.startswith('MemAvailable:'):
+                    memory = int(line.split()[1]) * 1024
+                    break
+    except (IOError, OSError):
+        pass
+
+    if memory is None:
+        try:
+            memory = (os.sysconf('SC_AVPHYS_PAGES') *
+                      os.sysconf('SC_PAGE_SIZE'))
+        except (AttributeError, ValueError, OSError):
+            pass
+
+    cgroup = _cgroup_memory()
+    if cgroup is not None:
+        memory = cgroup if memory is None else min(memory, cgroup)
+
+    return None if memory is None else memory // (1024 * 1024)
+
+
+def job_count(job_memory, cpus=None, memory=None):
+    """ Return the number of parallel jobs and a description of what limits
+        it. job_memory is the expected memory of a job in MiB.
+    """
+    cpus = cpus or cpu_count()
+    if memory is None:
+        memory = available_memory()
+
+    if memory is None:
+        return cpus, '%d CPUs, unknown memory' % cpus
+
+    by_memory = max(memory // job_memory, 1)
+    if by_memory < cpus:
+        return by_memory, ('limited by memory: %d MiB available, %d MiB '
+                           'per job' % (memory, job_memory))
+    return cpus, '%d CPUs, %d MiB available' % (cpus, memory)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Profile-guided optimization of build.py --pgo.
+
+    The release build is done three times in the same build directory:
+
+      1. without profiles, the baseline is timed on the workload
+      2. instrumented (-fprofile-generate), the workload writes the
+         profiles into <build_root>/pgo
+      3. with the profiles (-fprofile-use), timed on the workload again
+
+    The flags are added to the compile flags, which IoT.js passes to
+    JerryScript, libtuv and mbedtls as well. GCC finds the profile of an
+    object file by the path of the object, so the instrumented and the
+    optimized builds have to share the build directory. The profiles of
+    clang are merged by llvm-profdata.
+
+    A workload is 'testrunner' (the test suite of tools/testrunner.py), a
+    directory of JS scripts (benchmarks) or a JS script.
+"""
+
+import glob
+import os
+import subprocess
+import time
+
+TESTRUNNER_WORKLOAD = 'testrunner'
+
+# The time of a script is the best of this many runs
+BENCHMARK_RUNS = 3
+
+PROFDATA_FILE = 'iotjs.profdata'
+
+
+class WorkloadItem(object):
+    def __init__(self, name, args, cwd, runs):
+        self.name = name
+        self.args = args
+        self.cwd = cwd
+        self.runs = runs
+
+
+def compiler_kind(compiler_identity):
+    """ Return 'gcc' or 'clang' by the output of the --version of the
+        compiler or None.
+    """
+    if compiler_identity is None:
+        return None
+    version = compiler_identity.lower()
+    if 'clang' in version:
+        return 'clang'
+    if 'gcc' in version or 'free software foundation' in version:
+        return 'gcc'
+    return None
+
+
+def generate_flags(profile_dir):
+    return ['-fprofile-generate=%s' % profile_dir]
+
+
+def use_flags(kind, profile_dir):
+    if kind == 'clang':
+        return ['-fprofile-use=%s' % os.path.join(profile_dir, PROFDATA_FILE),
+                '-Wno-profile-instr-unprofiled',
+                '-Wno-profile-instr-out-of-date']
+    # The code which the workload did not run has no profile and the
+    # counters of the threads of libtuv may be inconsistent.
+    return ['-fprofile-use=%s' % profile_dir, '-fprofile-correction',
+            '-Wno-missing-profile']
+
+
+def profile_files(kind, profile_dir):
+    pattern = '*.profraw' if kind == 'clang' else '*.gcda'
+    found = []
+    for dir_path, _, file_names in os.walk(profile_dir):
+        found.extend(glob.glob(os.path.join(dir_path, pattern)))
+    return found
+
+
+def merge_command(kind, profile_dir):
+    """ Return the command which prepares the profiles for the optimized
+        build or None if they can be used as they are.
+    """
+    if kind != 'clang':
+        return None
+    return ['llvm-profdata', 'merge',
+            '-output=%s' % os.path.join(profile_dir, PROFDATA_FILE)] + \
+        sorted(profile_files(kind, profile_dir))
+
+
+def workload_items(workloads, iotjs, testrunner, target_os, project_root):
+    """ Return the list of WorkloadItem of the given workloads. """
+    items = []
+    for workload in workloads:
+        if workload == TESTRUNNER_WORKLOAD:
+            items.append(WorkloadItem(TESTRUNNER_WORKLOAD,
+                                      [testrunner, iotjs, '--quiet',
+                                       '--platform=%s' % target_os],
+                                      project_root, 1))
+            continue
+
+        if os.path.isdir(workload):
+            scripts = sorted(glob.glob(os.path.join(workload, '*.js')))
+        else:
+            scripts = [workload]
+        for script in scripts:
+            script = os.path.abspath(script)
+            items.append(WorkloadItem(os.path.relpath(script, project_root),
+                                      [iotjs, script],
+                                      os.path.dirname(script),
+                                      BENCHMARK_RUNS))
+    return items
+
+
+def run_item(item):
+    """ Run the item once and return its exit code and time. """
+    with open(os.devnull, 'w') as devnull:
+        start = time.time()
+        retcode = subprocess.call(item.args, cwd=item.cwd, stdout=devnull,
+                                  stderr=devnull)
+        return retcode, time.time() - start
+
+
+def benchmark(items):
+    """ Return a dict of item name -> the best time of the item, or None if
+        it failed.
+    """
+    times = {}
+    for item in items:
+        best = None
+        for _ in range(item.runs):
+            retcode, seconds = run_item(item)
+            if retcode != 0:
+                best = None
+                break
+            best = seconds if best is None else min(best, seconds)
+        times[item.name] = best
+    return times
+
+
+def format_comparison(items, before, after):
+    width = max([len(item.name) for item in items] + [len('workload')])
+    lines = ['PGO benchmark (best of %d runs of the scripts):' %
+             BENCHMARK_RUNS]
+    lines.append('  %-*s %12s %12s %9s' % (width, 'workload', 'before (s)',
+                                           'after (s)', 'change'))
+
+    def cell(seconds):
+        return 'failed' if seconds is None else '%.3f' % seconds
+
+    total_before = total_after = 0.0
+    for item in items:
+        old, new = before.get(item.name), after.get(item.name)
+        change = ''
+        if old is not None and new is not None:
+            total_before += old
+            total_after += new
+            if old > 0:
+                change = '%+.1f%%' % (100.0 * (new - old) / old)
+        lines.append('  %-*s %12s %12s %9s' % (width, item.name, cell(old),
+                                               cell(new), change))
+    if total_before > 0:
+        lines.append('  %-*s %12.3f %12.3f %+8.1f%%' % (
+                     width, 'total', total_before, total_after,
+                     100.0 * (total_after - total_before) / total_before))
+    return '\n'.join(lines)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Build step log of build.py --build-report.
+
+    This file is also the launcher of the compile and link commands
+    (IOTJS_BUILD_LAUNCHER in CMakeLists.txt):
+
+      steps.py <command> [<args>]
+
+    runs the command and, if the STEP_LOG_ENV environment variable names
+    a log file, appends the start and end time, the working directory and
+    the output of the command to it. The log gives the achieved
+    parallelism of the build and an estimate of its critical path, the
+    chain of steps which kept the build from finishing earlier.
+"""
+
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+import time
+
+STEP_LOG_ENV = 'IOTJS_BUILD_STEP_LOG'
+
+# Steps which end less than this many seconds after the next one starts
+# are still taken as its predecessor on the critical path.
+CHAIN_TOLERANCE = 0.05
+
+
+class Step(object):
+    def __init__(self, start, end, cwd, label):
+        self.start = start
+        self.end = end
+        self.cwd = cwd
+        self.label = label
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+def step_label(args):
+    """ Return the output of a compile or link command, the script run by
+        python (js2c.py) or the command itself.
+    """
+    if os.path.basename(args[0]).startswith('python') and len(args) > 1:
+        return os.path.basename(args[1])
+    for idx, arg in enumerate(args[:-1]):
+        if arg == '-o':
+            return args[idx + 1]
+    # e.g. 'ar qc libfoo.a ...'
+    files = [arg for arg in args[1:] if not arg.startswith('-') and
+             os.path.splitext(arg)[1]]
+    return ' '.join([os.path.basename(args[0])] + files[:1])
+
+
+def launch(args):
+    log_path = os.environ.get(STEP_LOG_ENV)
+    if not log_path:
+        os.execvp(args[0], args)
+
+    start = time.time()
+    ret = subprocess.call(args, close_fds=False)
+    end = time.time()
+
+    line = '%.3f\t%.3f\t%s\t%s\n' % (start, end, os.getcwd(),
+                                     step_label(args))
+    # A single write of the line in append mode, the steps run in parallel
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(fd, line.encode('utf-8'))
+    finally:
+        os.close(fd)
+    return ret
+
+
+def read_log(log_path):
+    steps = []
+    if not os.path.exists(log_path):
+        return steps
+    with open(log_path, 'r') as flog:
+        for line in flog:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) == 4:
+                steps.append(Step(float(fields[0]), float(fields[1]),
+                                  fields[2], fields[3]))
+    return steps
+
+
+def critical_path(steps):
+    """ Return the estimated critical path: starting from the step which
+        ended last, the predecessor of a step is the step which ended last
+        before it started, i.e. the one it most likely waited for.
+    """
+    if not steps:
+        return []
+    ordered = sorted(steps, key=lambda x: x.end)
+    path = [ordered[-1]]
+    idx = len(ordered) - 1
+    while True:
+        current = path[-1]
+        while idx >= 0 and (ordered[idx] is current or
+                            ordered[idx].end > current.start +
+                            CHAIN_TOLERANCE):
+            idx -= 1
+        if idx < 0:
+            break
+        path.append(ordered[idx])
+    path.reverse()
+    return path
+
+
+def summarize(steps, wall_time=None):
+    """ Return a dict of the statistics of the given steps. """
+    if not steps:
+        return None
+    first = min([step.start for step in steps])
+    last = max([step.end for step in steps])
+    busy = sum([step.duration for step in steps])
+    span = max(last - first, 0.001)
+
+    # Largest number of steps which ran at the same time
+    events = sorted([(step.start, 1) for step in steps] +
+                    [(step.end, -1) for step in steps])
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+
+    path = critical_path(steps)
+    return {
+        'steps': len(steps),
+        'span': span,
+        'wall': wall_time if wall_time is not None else span,
+        'busy': busy,
+        'parallelism': busy / span,
+        'peak': peak,
+        'path': path,
+        'path_time': sum([step.duration for step in path]),
+    }
+
+
+def format_report(summary, jobs, build_root, limit=10):
+    lines = ['Build steps: %d in %.1f s with %d jobs' % (
+             summary['steps'], summary['wall'], jobs)]
+    lines.append('  achieved parallelism: %.2f (%d at the peak)' % (
+                 summary['parallelism'], summary['peak']))
+    lines.append('  critical path (estimated): %.1f s in %d steps' % (
+                 summary['path_time'], len(summary['path'])))
+
+    longest = sorted(summary['path'], key=lambda x: -x.duration)[:limit]
+    for step in summary['path']:
+        if step in longest:
+            label = step.label
+            if not os.path.isabs(label):
+                label = os.path.join(step.cwd, label)
+            label = os.path.relpath(label, build_root)
+            lines.append('    %7.2f s  %s' % (step.duration, label))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('usage: %s <command> [<args>]' % sys.argv[0])
+        exit(1)
+    exit(launch(sys.argv[1:]))
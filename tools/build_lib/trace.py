@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Phase timeline of build.py --build-trace.
+
+    The timeline has three rows of events:
+
+      phases    the phases of build.py (submodule init, cmake configure,
+                build, tests)
+      commands  the commands launched through the Executor
+      steps     the compile and link steps of the build (see steps.py),
+                spread over as many lanes as ran in parallel
+
+    The steps are grouped into the phases of the build by their working
+    directory (the external projects are built in deps/<name>) and their
+    command (js2c, compile or link). The timeline is written in the Chrome
+    trace event format, which chrome://tracing and https://ui.perfetto.dev
+    open.
+"""
+
+import contextlib
+import json
+import os
+import time
+
+BUILD_PID = 1
+STEPS_PID = 2
+PHASE_TID = 1
+COMMAND_TID = 2
+
+# Phases of the external projects by their build directory in deps/
+DEPS_PHASES = {
+    'jerry-host': 'host jerry',
+    'jerry': 'jerry',
+    'libtuv': 'libtuv',
+    'mbedtls': 'mbedtls',
+    'http-parser': 'http-parser',
+}
+
+OBJECT_EXTENSIONS = ('.o', '.obj')
+
+
+class Event(object):
+    def __init__(self, name, category, start, end, args=None):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = end
+        self.args = args or {}
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+def step_phase(step, build_root):
+    """ Return the phase of a compile or link step. """
+    if step.label.startswith('js2c'):
+        return 'js2c'
+
+    rel_cwd = os.path.relpath(step.cwd, build_root).split(os.sep)
+    if len(rel_cwd) > 1 and rel_cwd[0] == 'deps':
+        return DEPS_PHASES.get(rel_cwd[1], rel_cwd[1])
+
+    if os.path.splitext(step.label)[1] in OBJECT_EXTENSIONS:
+        return 'iotjs compile'
+    return 'iotjs link'
+
+
+class Tracer(object):
+    def __init__(self):
+        self.phases = []
+        self.commands = []
+        self.steps = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.phases.append(Event(name, 'phase', start, time.time()))
+
+    def command(self, cmd, args, start, end, retcode):
+        """ Record a command, called by the Executor. """
+        self.commands.append(Event(os.path.basename(cmd), 'command', start,
+                                   end, {'cmd': ' '.join([cmd] + args),
+                                         'exit code': retcode}))
+
+    def add_steps(self, build_steps, build_root):
+        for step in build_steps:
+            label = step.label
+            if not os.path.isabs(label):
+                label = os.path.join(step.cwd, label)
+            self.steps.append(Event(os.path.relpath(label, build_root),
+                                    step_phase(step, build_root),
+                                    step.start, step.end))
+
+    def _lanes(self):
+        """ Return the lane of every step, a lane is reused as soon as its
+            last step ended.
+        """
+        lane_ends = []
+        lanes = {}
+        for step in sorted(self.steps, key=lambda x: x.start):
+            for lane, end in enumerate(lane_ends):
+                if end <= step.start:
+                    break
+            else:
+                lane = len(lane_ends)
+                lane_ends.append(0)
+            lane_ends[lane] = step.end
+            lanes[step] = lane
+        return lanes
+
+    def chrome_trace(self):
+        events = self.phases + self.commands + self.steps
+        if not events:
+            return {'traceEvents': []}
+        origin = min([event.start for event in events])
+
+        def complete(event, pid, tid):
+            return {
+                'name': event.name,
+                'cat': event.category,
+                'ph': 'X',
+                'ts': int((event.start - origin) * 1e6),
+                'dur': int(event.duration * 1e6),
+                'pid': pid,
+                'tid': tid,
+                'args': event.args,
+            }
+
+        def metadata(name, pid, tid, value):
+            return {'name': name, 'ph': 'M', 'pid': pid, 'tid': tid,
+                    'args': {'name': value}}
+
+        trace_events = [
+            metadata('process_name', BUILD_PID, 0, 'build.py'),
+            metadata('thread_name', BUILD_PID, PHASE_TID, 'phases'),
+            metadata('thread_name', BUILD_PID, COMMAND_TID, 'commands'),
+            metadata('process_name', STEPS_PID, 0, 'build steps'),
+        ]
+        trace_events.extend([complete(event, BUILD_PID, PHASE_TID)
+                             for event in self.phases])
+        trace_events.extend([complete(event, BUILD_PID, COMMAND_TID)
+                             for event in self.commands])
+
+        lanes = self._lanes()
+        for lane in sorted(set(lanes.values())):
+            trace_events.append(metadata('thread_name', STEPS_PID, lane + 1,
+                                         'lane %d' % (lane + 1)))
+        trace_events.extend([complete(step, STEPS_PID, lanes[step] + 1)
+                             for step in self.steps])
+
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write(self, trace_path):
+        with open(trace_path, 'w') as ftrace:
+            json.dump(self.chrome_trace(), ftrace)
+
+    def summary(self):
+        """ Return the rows (name, wall time, busy time, count) of the
+            phases of build.py and of the phases of the build steps, both
+            slowest first.
+
+            The wall time of the steps of a phase is the time from the
+            start of its first step to the end of its last one, the busy
+            time is the sum of the times of its steps.
+        """
+        phase_rows = [(event.name, event.duration, event.duration, 1)
+                      for event in self.phases]
+        phase_rows.sort(key=lambda x: -x[1])
+
+        grouped = {}
+        for step in self.steps:
+            grouped.setdefault(step.category, []).append(step)
+        step_rows = []
+        for name, group in grouped.items():
+            wall = (max([step.end for step in group]) -
+                    min([step.start for step in group]))
+            busy = sum([step.duration for step in group])
+            step_rows.append((name, wall, busy, len(group)))
+        step_rows.sort(key=lambda x: -x[2])
+
+        return phase_rows, step_rows
+
+
+def format_summary(phase_rows, step_rows, trace_path, limit=10):
+    lines = ['Build trace: %s' % trace_path]
+    lines.append('  %-24s %9s' % ('phase', 'wall (s)'))
+    for name, wall, _, _ in phase_rows[:limit]:
+        lines.append('  %-24s %9.2f' % (name, wall))
+    if step_rows:
+        lines.append('')
+        lines.append('  %-24s %9s %9s %7s' % ('build step phase', 'wall (s)',
+                                              'busy (s)', 'steps'))
+        for name, wall, busy, count in step_rows[:limit]:
+            lines.append('  %-24s %9.2f %9.2f %7d' % (name, wall, busy,
+                                                      count))
+    return '\n'.join(lines)
@@ -17,6 +17,7 @@ from __future__ import print_function
 import collections
 import os
 import subprocess
+import time
 
 _colors = {
     "empty": "\033[0m",
@@ -42,6 +43,9 @@ Terminal = _Terminal(**_colors)
 
 
 class Executor(object):
+    # Called with (cmd, args, start, end, retcode) after every command of
+    # run_cmd, e.g. to trace the build.
+    trace = None
 
     @staticmethod
     def cmd_line(cmd, args=[]):
@@ -64,7 +68,11 @@ class Executor(object):
         if not quiet:
             Executor.print_cmd_line(cmd, args)
         try:
-            return subprocess.call([cmd] + args, cwd=cwd)
+            start = time.time()
+            retcode = subprocess.call([cmd] + args, cwd=cwd)
+            if Executor.trace:
+                Executor.trace(cmd, args, start, time.time(), retcode)
+            return retcode
         except OSError as e:
             Executor.fail("[Failed - %s] %s" % (cmd, e.strerror))
 
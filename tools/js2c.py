@@ -18,13 +18,26 @@
 # And this file also generates magic string list in src/iotjs_string_ext.inl.h
 # file to reduce JerryScript heap usage.
 
+import hashlib
+import multiprocessing
 import os
 import re
 import subprocess
 import struct
+import tempfile
+import time
+
+from multiprocessing.pool import ThreadPool
 
 from common_py.system.filesystem import FileSystem as fs
 from common_py import path
+from js2c_lib import deps
+from js2c_lib import lz4
+from js2c_lib import magic_strings
+from js2c_lib import minifier
+from js2c_lib import perfect_hash
+from js2c_lib import platform_fold
+from js2c_lib import report
 
 
 def normalize_str(text):
@@ -34,25 +47,34 @@ def normalize_str(text):
     return text
 
 
-def regroup(l, n):
-    return [l[i:i+n] for i in range(0, len(l), n)]
+def encode_str(text):
+    if isinstance(text, bytes):
+        return text
 
+    return text.encode('utf-8')
 
-def remove_comments(code):
-    pattern = r'(\".*?\"|\'.*?\')|(/\*.*?\*/|//[^\r\n]*$)'
-    regex = re.compile(pattern, re.MULTILINE | re.DOTALL)
 
-    def _replacer(match):
-        if match.group(2) is not None:
-            return ""
-        else:
-            return match.group(1)
+def sort_magic_strings(strings):
+    """ Return the strings in the order of the magic string table of the
+        engine: by their length in bytes, then by their bytes. The static
+        snapshots refer to the strings by their index in this order.
+    """
+    return sorted(strings, key=lambda x: (len(encode_str(x)), encode_str(x)))
 
-    return regex.sub(_replacer, code)
 
+def run_parallel(func, items, jobs):
+    """ Apply func to every item using at most 'jobs' worker threads.
+        The results are returned in the order of the items.
+    """
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
 
-def remove_whitespaces(code):
-    return re.sub('\n+', '\n', re.sub('\n +', '\n', code))
+    pool = ThreadPool(min(jobs, len(items)))
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
 
 
 LICENSE = '''
@@ -85,11 +107,20 @@ FOOTER1 = '''
 
 HEADER2 = '''#include <stdio.h>
 #include <stdint.h>
+#include <string.h>
 #include "iotjs_js.h"
 '''
 
 EMPTY_LINE = '\n'
 
+# Static snapshot passes: the first one and the retries with the literals
+# of the failed modules added to the magic strings
+STATIC_SNAPSHOT_ATTEMPTS = 3
+
+# Error of the snapshot tool for a static snapshot with a literal which is
+# not in the literal list
+STATIC_LITERAL_ERROR = 'Unsupported static snapshot literal'
+
 MAGIC_STRINGS_HEADER = '#define JERRY_MAGIC_STRING_ITEMS \\\n'
 
 MODULE_SNAPSHOT_VARIABLES_H = '''
@@ -99,7 +130,7 @@ extern const uint32_t module_{NAME}_idx;
 
 MODULE_SNAPSHOT_VARIABLES_C = '''
 #define MODULE_{NAME}_IDX ({IDX})
-const char module_{NAME}[] = "{NAME}";
+const char module_{NAME}[] = "{ID}";
 const uint32_t module_{NAME}_idx = MODULE_{NAME}_IDX;
 '''
 
@@ -121,22 +152,123 @@ extern const size_t {NAME}_l;
 MODULE_VARIABLES_C = '''
 #define SIZE_{NAME_UPPER} {SIZE}
 const size_t {NAME}_l = SIZE_{NAME_UPPER};
-const char {NAME}_n[] = "{NAME}";
+const char {NAME}_n[] = "{ID}";
 const uint8_t {NAME}_s[] = {{
 {CODE}
 }};
 '''
 
+MODULE_STRING_VARIABLES_C = '''
+#define SIZE_{NAME_UPPER} {SIZE}
+const size_t {NAME}_l = SIZE_{NAME_UPPER};
+const char {NAME}_n[] = "{ID}";
+const uint8_t {NAME}_s[SIZE_{NAME_UPPER} + 1] =
+{CODE};
+'''
+
+MODULE_INCBIN_VARIABLES_C = '''
+#define SIZE_{NAME_UPPER} {SIZE}
+const size_t {NAME}_l = SIZE_{NAME_UPPER};
+const char {NAME}_n[] = "{ID}";
+/* {BLOB} (sha1: {HASH}) */
+__asm__(".section .rodata\\n"
+        ".global {NAME}_s\\n"
+        ".type {NAME}_s, %object\\n"
+        ".balign 4\\n"
+        "{NAME}_s:\\n"
+        ".incbin \\"{BLOB}\\"\\n"
+        ".size {NAME}_s, {SIZE}\\n"
+        ".previous\\n");
+'''
+
+MODULE_OBJCOPY_VARIABLES_C = '''
+#define SIZE_{NAME_UPPER} {SIZE}
+const size_t {NAME}_l = SIZE_{NAME_UPPER};
+const char {NAME}_n[] = "{ID}";
+/* {NAME}_s is defined by {OBJECT} (sha1: {HASH}) */
+'''
+
+MODULE_EXTERNAL_VARIABLES_H = '''
+extern const char {NAME}_n[];
+extern const uint8_t* {NAME}_s;
+extern size_t {NAME}_l;
+'''
+
+MODULE_EXTERNAL_VARIABLES_C = '''
+const char {NAME}_n[] = "{ID}";
+/* Set by iotjs_js_blob_load() from {BLOB}
+ * (sha1: {HASH}) */
+const uint8_t* {NAME}_s = NULL;
+size_t {NAME}_l = 0;
+'''
+
+EXTERNAL_BLOB_H = '''
+#define IOTJS_JS_BLOB "{BLOB}"
+#define IOTJS_JS_BLOB_FINGERPRINT {FINGERPRINT}u
+'''
+
+MODULE_SIZE_C = '''
+#define SIZE_{NAME_UPPER} {SIZE}
+'''
+
+MODULE_SOURCE_SIZE_C = '''
+#define SOURCE_SIZE_{NAME_UPPER} {SIZE}
+'''
+
+MODULES_DICT_H = '''
+/* Dictionary of the modules compressed with lz4-dict */
+#define IOTJS_JS_MODULES_DICT_SIZE {SIZE}
+extern const uint8_t iotjs_js_modules_dict[];
+'''
+
+MODULES_DICT_C = '''
+const uint8_t iotjs_js_modules_dict[IOTJS_JS_MODULES_DICT_SIZE] = {{
+{CODE}
+}};
+'''
+
 NATIVE_STRUCT_H = '''
 typedef struct {
   const char* name;
   const void* code;
   const size_t length;
+  const size_t compressed_length; /* 0 if the code is not compressed */
 } iotjs_js_module_t;
 
 extern const iotjs_js_module_t js_modules[];
 '''
 
+APP_MAIN_H = '''
+#define IOTJS_JS_APP_MAIN "{ID}"
+'''
+
+MODULE_LOOKUP_H = '''
+/* Returns the builtin JS module with the given name or NULL */
+const iotjs_js_module_t* iotjs_js_modules_find(const char* name);
+'''
+
+MODULE_LOOKUP_C = '''
+#define JS_MODULES_COUNT {COUNT}
+#define JS_MODULES_HASH_BUCKETS {BUCKETS}
+
+static const uint16_t js_modules_hash_seeds[JS_MODULES_HASH_BUCKETS] = {{
+{SEEDS}
+}};
+
+static const {INDEX_TYPE} js_modules_hash_index[JS_MODULES_COUNT] = {{
+{INDEX}
+}};
+{HASH_FUNCTION}
+const iotjs_js_module_t* iotjs_js_modules_find(const char* name) {{
+  uint32_t bucket = js_modules_hash(name, 0) % JS_MODULES_HASH_BUCKETS;
+  uint32_t seed = js_modules_hash_seeds[bucket];
+  uint32_t slot = js_modules_hash(name, seed) % JS_MODULES_COUNT;
+  const iotjs_js_module_t* module = &js_modules[js_modules_hash_index[slot]];
+
+  return strcmp(module->name, name) == 0 ? module : NULL;
+}}
+'''
+
 NATIVE_STRUCT_C = '''
 const iotjs_js_module_t js_modules[] = {{
 {MODULES}
@@ -144,30 +276,358 @@ const iotjs_js_module_t js_modules[] = {{
 '''
 
 
-def hex_format(ch):
-    if isinstance(ch, str):
-        ch = ord(ch)
-
-    return "0x{:02x}".format(ch)
+HEX_TABLE = ["0x{:02x}".format(ch) for ch in range(256)]
 
 
 def format_code(code, indent):
+    """ Format the bytes of code as the body of a C array initializer. """
     lines = []
-    # convert all characters to hex format
-    converted_code = map(hex_format, code)
+    prefix = '  ' * indent
+    code = bytearray(code)
     # 10 hex number per line
-    for line in regroup(", ".join(converted_code), 10 * 6):
-        lines.append(('  ' * indent) + line.strip())
+    for offset in range(0, len(code), 10):
+        line = ", ".join([HEX_TABLE[ch] for ch in code[offset:offset + 10]])
+        lines.append(prefix + line + ',')
+
+    if lines:
+        lines[-1] = lines[-1][:-1]
+
+    return "\n".join(lines)
+
+
+def format_numbers(numbers, indent):
+    """ Format the given numbers as the body of a C array initializer. """
+    lines = []
+    for idx in range(0, len(numbers), 10):
+        line = ', '.join([str(number) for number in numbers[idx:idx + 10]])
+        lines.append('  ' * indent + line)
+    return ',\n'.join(lines)
+
+
+def module_lookup(names):
+    """ Return the C definitions of the perfect hash lookup table of
+        js_modules[], where names are the module names in table order.
+    """
+    seeds, index = perfect_hash.build(names)
+    return MODULE_LOOKUP_C.format(COUNT=len(names), BUCKETS=len(seeds),
+        SEEDS=format_numbers(seeds, 1),
+        INDEX_TYPE='uint8_t' if len(names) <= 256 else 'uint16_t',
+        INDEX=format_numbers(index, 1),
+        HASH_FUNCTION=perfect_hash.c_hash_function('js_modules'))
+
+
+def c_escape_table():
+    table = []
+    for ch in range(256):
+        if ch == ord('\\') or ch == ord('"') or ch == ord('?'):
+            table.append('\\' + chr(ch))
+        elif 0x20 <= ch < 0x7f:
+            table.append(chr(ch))
+        else:
+            # Three digit octal escapes can not swallow a following digit.
+            table.append('\\%03o' % ch)
+
+    return table
+
+
+C_ESCAPE_TABLE = c_escape_table()
+
+
+def format_string_literal(code, indent):
+    """ Format the bytes of code as a sequence of C string literals. """
+    lines = []
+    prefix = '  ' * indent
+    code = bytearray(code)
+    for offset in range(0, len(code), 64):
+        chunk = code[offset:offset + 64]
+        lines.append(prefix + '"' +
+                     ''.join([C_ESCAPE_TABLE[ch] for ch in chunk]) + '"')
+
+    if not lines:
+        lines.append(prefix + '""')
 
     return "\n".join(lines)
 
 
-def merge_snapshots(snapshot_infos, snapshot_tool):
-    output_path = fs.join(path.SRC_ROOT, 'js','merged.modules')
+EMBED_BACKENDS = ['array', 'string', 'incbin', 'objcopy', 'external']
+
+# Header of the external snapshot blob: magic, format version, fingerprint
+# of the module index and the magic strings, size of the snapshot. The
+# 16 bytes keep the snapshot after it 32 bit aligned.
+BLOB_HEADER = struct.Struct('<4sIII')
+BLOB_MAGIC = b'IJSB'
+BLOB_VERSION = 1
+
+COMPRESS_CODECS = ['none', 'lz4', 'lz4-dict']
+
+
+def embed_module(name, code, backend, blob_dir, tools, module_id=None):
+    """ Return the C definitions of the {name}_n, {name}_s and {name}_l
+        symbols for the given bytes using the selected backend. The
+        {name}_n string is module_id, or the name if it is not given.
+
+        The 'incbin' and 'objcopy' backends store the bytes in
+        blob_dir/{name}.bin, which is included by the assembler or turned
+        into blob_dir/{name}.o by the linker. The 'external' backend only
+        stores the bytes there, they are mapped at runtime.
+    """
+    module_id = module_id or name
+
+    if backend == 'array':
+        return MODULE_VARIABLES_C.format(NAME=name, ID=module_id,
+                                         NAME_UPPER=name.upper(),
+                                         SIZE=len(code),
+                                         CODE=format_code(code, 1))
+    if backend == 'string':
+        return MODULE_STRING_VARIABLES_C.format(NAME=name, ID=module_id,
+            NAME_UPPER=name.upper(), SIZE=len(code),
+            CODE=format_string_literal(code, 1))
+
+    fs.maybe_make_directory(blob_dir)
+    blob_path = fs.join(blob_dir, '%s.bin' % name)
+    blob_changed = write_if_changed(blob_path, code)
+    code_hash = hashlib.sha1(code).hexdigest()
+
+    if backend == 'external':
+        return MODULE_EXTERNAL_VARIABLES_C.format(NAME=name, ID=module_id,
+            BLOB=fs.basename(blob_path), HASH=code_hash)
+
+    if backend == 'incbin':
+        return MODULE_INCBIN_VARIABLES_C.format(NAME=name, ID=module_id,
+            NAME_UPPER=name.upper(), SIZE=len(code),
+            BLOB=blob_path.replace('\\', '/'), HASH=code_hash)
+
+    object_path = fs.join(blob_dir, '%s.o' % name)
+    if blob_changed or not fs.exists(object_path):
+        create_blob_object(name, blob_dir, tools)
+
+    return MODULE_OBJCOPY_VARIABLES_C.format(NAME=name, ID=module_id,
+        NAME_UPPER=name.upper(), SIZE=len(code), OBJECT=object_path,
+        HASH=code_hash)
+
+
+def external_blob(code, module_names, magic_string_set):
+    """ Return the external blob of the merged snapshot and its
+        fingerprint. The runtime only accepts a blob with the fingerprint
+        of its module index and magic strings: module indices and static
+        snapshot literals refer to them.
+    """
+    fingerprint = perfect_hash.fnv1a('\n'.join(
+        sorted(module_names) + [''] +
+        sort_magic_strings(magic_string_set)), 0)
+    header = BLOB_HEADER.pack(BLOB_MAGIC, BLOB_VERSION, fingerprint,
+                              len(code))
+    return header + code, fingerprint
+
+
+def create_blob_object(name, blob_dir, tools):
+    """ Convert blob_dir/{name}.bin to an object file which defines
+        {name}_s in the read-only data section.
+    """
+    linker, objcopy = tools
+    blob_file = '%s.bin' % name
+    object_file = '%s.o' % name
+    symbol = '_binary_%s_bin' % re.sub(r'[^A-Za-z0-9_]', '_', name)
+
+    cmds = [
+        # Relative names keep the path of the blob out of the symbols.
+        [linker, '-r', '-b', 'binary', '-z', 'noexecstack',
+         '-o', object_file, blob_file],
+        [objcopy,
+         '--rename-section', '.data=.rodata,alloc,load,readonly,data,contents',
+         '--set-section-alignment', '.data=4',
+         '--redefine-sym', '%s_start=%s_s' % (symbol, name),
+         '--strip-symbol', '%s_end' % symbol,
+         '--strip-symbol', '%s_size' % symbol,
+         object_file],
+    ]
+    for cmd in cmds:
+        ret = subprocess.call(cmd, cwd=blob_dir)
+        if ret != 0:
+            msg = "Failed to create %s: - %d" % (object_file, ret)
+            print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+            exit(1)
+
+
+class SnapshotCache(object):
+    """ Persistent, content-addressed store of the snapshot tool results.
+
+        Every entry is keyed by the hash of its inputs together with the
+        snapshot tool binary and the build type, so a stale entry can never
+        be picked up. Entries are written atomically, which allows several
+        js2c instances to share the same cache directory.
+
+        With 'memory' the entries are also kept in memory (only there if
+        cache_dir is None), which is used by the watch mode.
+
+        Reading an entry refreshes its modification time, prune() removes
+        the least recently used entries while the directory is larger than
+        max_size bytes, and the entries of the memory which were not used
+        since the last prune().
+    """
+
+    def __init__(self, cache_dir, snapshot_tool, buildtype, memory=False,
+                 max_size=None):
+        self._cache_dir = cache_dir
+        self._memory = {} if memory else None
+        self._used = set()
+        self._max_size = max_size
+        if cache_dir:
+            fs.maybe_make_directory(cache_dir)
+
+        with open(snapshot_tool, 'rb') as ftool:
+            tool_hash = hashlib.sha1(ftool.read()).hexdigest()
+        self._salt = [tool_hash, buildtype]
+
+    def key(self, kind, *contents):
+        digest = hashlib.sha1()
+        for item in self._salt + [kind] + list(contents):
+            item = encode_str(item)
+            digest.update(encode_str('%d:' % len(item)))
+            digest.update(item)
+
+        return '%s-%s' % (kind, digest.hexdigest())
+
+    def _entry(self, key):
+        return fs.join(self._cache_dir, key)
+
+    def _write(self, key, data):
+        data = encode_str(data)
+        if self._memory is not None:
+            self._memory[key] = data
+            self._used.add(key)
+        if not self._cache_dir:
+            return
+
+        fd, temp_path = tempfile.mkstemp(dir=self._cache_dir)
+        with os.fdopen(fd, 'wb') as ftemp:
+            ftemp.write(data)
+        try:
+            os.rename(temp_path, self._entry(key))
+        except OSError:
+            # Another process has stored the same entry in the meantime.
+            fs.remove(temp_path)
+
+    def _read(self, key):
+        if self._memory is not None and key in self._memory:
+            self._used.add(key)
+            return self._memory[key]
+        if not self._cache_dir or not fs.exists(self._entry(key)):
+            return None
+
+        with open(self._entry(key), 'rb') as fentry:
+            data = fentry.read()
+        try:
+            os.utime(self._entry(key), None)
+        except OSError:
+            # Pruned by another process in the meantime.
+            pass
+        if self._memory is not None:
+            self._memory[key] = data
+            self._used.add(key)
+        return data
+
+    def load(self, key, output_path):
+        """ Copy the cached entry to output_path if it exists. """
+        data = self._read(key)
+        if data is None:
+            return False
+
+        with open(output_path, 'wb') as foutput:
+            foutput.write(data)
+        return True
+
+    def store(self, key, input_path):
+        with open(input_path, 'rb') as finput:
+            self._write(key, finput.read())
+
+    def load_failure(self, key):
+        """ Return the recorded output of a failed run, or None. """
+        data = self._read(key + '.fail')
+        if data is None:
+            return None
+
+        return normalize_str(data)
+
+    def store_failure(self, key, output):
+        self._write(key + '.fail', output)
+
+    def prune(self):
+        """ Remove the least recently used entries until the cache fits
+            into max_size. The temporary files of the running writes are
+            left alone. Only the entries used since the last prune() are
+            kept in the memory: the ones of the old versions of the modules
+            are dropped.
+        """
+        if self._memory is not None:
+            for key in set(self._memory) - self._used:
+                del self._memory[key]
+            self._used = set()
+
+        if not self._cache_dir or self._max_size is None:
+            return
+
+        entries = []
+        for name in os.listdir(self._cache_dir):
+            if name.startswith(tempfile.gettempprefix()):
+                continue
+            entry = self._entry(name)
+            try:
+                stat = os.stat(entry)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum([size for _, size, _ in entries])
+        for _, size, entry in sorted(entries):
+            if total <= self._max_size:
+                break
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+            total -= size
+
+
+def cache_size(options):
+    """ Return the size limit of the snapshot cache in bytes or None. """
+    if options.cache_size <= 0:
+        return None
+    return options.cache_size * 1024 * 1024
+
+
+def read_files(paths):
+    contents = []
+    for item in paths:
+        with open(item, 'rb') as fin:
+            contents.append(fin.read())
+
+    return contents
+
+
+def run_merge(snapshot_paths, output_path, snapshot_tool, cache=None):
+    """ Merge the given snapshots into output_path.
+        Returns the exit code of the snapshot tool.
+    """
     cmd = [snapshot_tool, "merge", "-o", output_path]
-    cmd.extend([item['path'] for item in snapshot_infos])
+    cmd.extend(snapshot_paths)
+
+    if cache:
+        key = cache.key('merge', *read_files(snapshot_paths))
+        if cache.load(key, output_path):
+            return 0
 
     ret = subprocess.call(cmd)
+    if cache and ret == 0:
+        cache.store(key, output_path)
+
+    return ret
+
+
+def merge_snapshots(snapshot_infos, snapshot_tool, work_dir, cache=None):
+    output_path = fs.join(work_dir, 'merged.modules')
+    snapshot_paths = [item['path'] for item in snapshot_infos]
+    ret = run_merge(snapshot_paths, output_path, snapshot_tool, cache)
 
     if ret != 0:
         msg = "Failed to merge %s: - %d" % (snapshot_infos, ret)
@@ -184,58 +644,322 @@ def merge_snapshots(snapshot_infos, snapshot_tool):
     return code
 
 
-def get_snapshot_contents(js_path, snapshot_tool, literals=None):
-    """ Convert the given module with the snapshot generator
-        and return the resulting bytes.
+def run_snapshot_tool(cmd, cwd=None):
+    """ Run the snapshot tool and return its exit code and output. """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, cwd=cwd)
+    output = process.communicate()[0]
+
+    return process.returncode, normalize_str(output)
+
+
+def is_missing_literal_failure(ret, output):
+    """ Whether a static snapshot failed because a literal of the module
+        is not in the literal list. This is the only failure which only
+        depends on the inputs of the tool: a crash, a signal or any other
+        error may not happen again.
+    """
+    return ret > 0 and STATIC_LITERAL_ERROR in output
+
+
+def wrap_module(js_path, minify_level=0, platform=None):
+    """ Return the source of the given module wrapped into the
+        module function expected by the module loader.
     """
-    wrapped_path = js_path + ".wrapped"
-    snapshot_path = js_path + ".snapshot"
     module_name = os.path.splitext(os.path.basename(js_path))[0]
+    code = get_js_contents(js_path, minify_level, platform)
+
+    if module_name != "iotjs":
+        code = ("(function(exports, require, module, native) {\n" +
+                code + "});\n")
+
+    return code
 
-    with open(wrapped_path, 'w') as fwrapped, open(js_path, "r") as fmodule:
-        if module_name != "iotjs":
-            fwrapped.write("(function(exports, require, module, native) {\n")
 
-        fwrapped.write(fmodule.read())
+def get_snapshot_contents(js_path, snapshot_path, snapshot_tool,
+                          literals=None, cache=None, minify_level=0,
+                          platform=None):
+    """ Convert the given module with the snapshot generator into
+        snapshot_path. Returns the path of the snapshot file, the exit code
+        and the output of the snapshot generator.
+    """
+    wrapped_path = os.path.splitext(snapshot_path)[0] + ".wrapped"
+    wrapped_code = wrap_module(js_path, minify_level, platform)
+
+    if cache:
+        key_parts = [wrapped_code]
+        if literals:
+            key_parts.extend(read_files([literals]))
+        key = cache.key('static' if literals else 'snapshot', *key_parts)
+
+        if cache.load(key, snapshot_path):
+            return snapshot_path, 0, ''
+
+        failure = cache.load_failure(key)
+        if failure is not None:
+            return snapshot_path, 1, failure
 
-        if module_name != "iotjs":
-            fwrapped.write("});\n")
-    cmd = [snapshot_tool, "generate", "-o", snapshot_path]
+    with open(wrapped_path, 'w') as fwrapped:
+        fwrapped.write(wrapped_code)
+
+    # The tool runs in the work directory with relative file names, so the
+    # location of the work directory does not end up in the snapshot.
+    cmd = [snapshot_tool, "generate", "-o", fs.basename(snapshot_path)]
     if literals:
         cmd.extend(["--static", "--load-literals-list-format", literals])
-    ret = subprocess.call(cmd + [wrapped_path])
+    ret, output = run_snapshot_tool(cmd + [fs.basename(wrapped_path)],
+                                    fs.dirname(snapshot_path))
 
     fs.remove(wrapped_path)
-    if ret != 0:
-        if literals == None:
+
+    if cache:
+        if ret == 0:
+            cache.store(key, snapshot_path)
+        elif literals and is_missing_literal_failure(ret, output):
+            # A missing literal is an expected outcome, remember it so the
+            # fallback does not cost a tool invocation next time.
+            cache.store_failure(key, output)
+
+    return snapshot_path, ret, output
+
+
+def snapshot_file_names(js_paths):
+    """ Return unique snapshot file names for the given modules, which
+        are their file names unless two modules share one.
+    """
+    names = []
+    for js_path in js_paths:
+        name = os.path.splitext(fs.basename(js_path))[0]
+        while name + '.snapshot' in names:
+            name = '_' + name
+        names.append(name + '.snapshot')
+    return names
+
+
+def generate_snapshots(js_paths, snapshot_tool, jobs, work_dir,
+                       literals=None, cache=None, minify_level=0,
+                       platform=None, snapshot_paths=None):
+    """ Create the snapshots of the given modules in parallel in work_dir.
+        The messages of the snapshot generator are printed in module order,
+        so the output does not depend on the scheduling of the jobs.
+        Returns the snapshot paths and a dict of JS path -> output of the
+        snapshot generator of the modules whose static snapshot failed.
+    """
+    if snapshot_paths is None:
+        snapshot_paths = [fs.join(work_dir, name)
+                          for name in snapshot_file_names(js_paths)]
+
+    def _generate(paths):
+        return get_snapshot_contents(paths[0], paths[1], snapshot_tool,
+                                     literals, cache, minify_level, platform)
+
+    results = run_parallel(_generate, list(zip(js_paths, snapshot_paths)),
+                           jobs)
+
+    failed = {}
+    for js_path, (snapshot_path, ret, output) in zip(js_paths, results):
+        if ret != 0 and literals:
+            # The reasons are listed by the static snapshot summary
+            failed[js_path] = output.strip() or 'exit code %d' % ret
+            continue
+
+        if output:
+            print(output.rstrip())
+
+        if ret != 0:
             msg = "Failed to dump %s: - %d" % (js_path, ret)
             print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
             exit(1)
+
+    return snapshot_paths, failed
+
+
+def generate_static_snapshots(options, modules, snapshot_infos,
+                              magic_string_set, module_literals, work_dir,
+                              cache, minify_level):
+    """ Turn the snapshots into static snapshots. If a module fails for
+        literals which are not magic strings, its literals are added (as
+        far as the magic string budget allows) and all of the static
+        snapshots are created again, since they refer to the magic strings
+        by index. The modules which still fail keep their normal snapshot.
+
+        module_literals: dict of module name -> literals, or None if they
+        were not dumped yet; then only the failed modules are dumped.
+
+        Returns the final magic string set, a dict of module name -> reason
+        of the modules without static snapshot and the module literals.
+    """
+    js_paths = [js_path for (name, js_path) in modules]
+    literals_path = fs.join(work_dir, 'literals.list')
+    if module_literals is None:
+        module_literals = {}
+
+    def fall_back(failed):
+        # Create the normal snapshots of the failed modules again, as an
+        # earlier pass may have left a static snapshot behind.
+        infos = [info for info in snapshot_infos
+                 if js_paths[info['idx']] in failed]
+        generate_snapshots([js_paths[info['idx']] for info in infos],
+                           options.snapshot_tool, options.jobs, work_dir,
+                           cache=cache, minify_level=minify_level,
+                           platform=options.platform,
+                           snapshot_paths=[info['path'] for info in infos])
+        infos = [info for info in infos if info['name'] not in
+                 module_literals]
+        if infos:
+            module_literals.update(get_module_literals(
+                options.snapshot_tool, infos, options.jobs, cache))
+        return [info['name'] for info in snapshot_infos
+                if js_paths[info['idx']] in failed]
+
+    for attempt in range(STATIC_SNAPSHOT_ATTEMPTS):
+        write_literals_to_file(magic_string_set, literals_path)
+        failed = generate_snapshots(js_paths, options.snapshot_tool,
+                                    options.jobs, work_dir, literals_path,
+                                    cache, minify_level, options.platform,
+                                    [info['path'] for info in
+                                     snapshot_infos])[1]
+        if not failed:
+            break
+
+        failed_names = fall_back(failed)
+        if attempt + 1 == STATIC_SNAPSHOT_ATTEMPTS:
+            break
+
+        missing = dict([(name, module_literals[name] - magic_string_set)
+                        for name in failed_names])
+        added = magic_strings.augment(missing, magic_string_set,
+                                      options.magic_string_budget)
+        if not added:
+            break
+
+        print('Added %d literals to the magic strings for the static '
+              'snapshots of %d modules' % (len(added), len(
+              [name for name in failed_names if missing[name] & added])))
+        magic_string_set = magic_string_set | added
+
+    fs.remove(literals_path)
+
+    reasons = {}
+    for name, js_path in modules:
+        if js_path not in failed:
+            continue
+        count = len(module_literals[name] - magic_string_set)
+        if count:
+            reasons[name] = '%d literal(s) are not magic strings' % count
         else:
-            print("Unable to create static snapshot from '%s'. Falling back "
-                  "to normal snapshot." % js_path)
+            reasons[name] = failed[js_path].splitlines()[0]
+
+    return magic_string_set, reasons, module_literals
+
+
+def static_snapshot_summary(options, snapshot_infos, reasons,
+                            module_literals, magic_string_set):
+    """ Print the modules without static snapshot with the estimated heap
+        they cost at runtime: the engine copies the byte code of a normal
+        snapshot into the heap and allocates its non-magic string literals.
+        Fails with --require-static.
+    """
+    if not reasons:
+        if options.verbose:
+            print('Static snapshots: all %d modules' % len(snapshot_infos))
+        return
+
+    lines = []
+    total = 0
+    for info in snapshot_infos:
+        name = info['name']
+        if name not in reasons:
+            continue
+        penalty = fs.getsize(info['path']) + sum(
+            [magic_strings.heap_cost(text) for text in
+             module_literals[name] - magic_string_set])
+        total += penalty
+        lines.append('  %-24s %10d  %s' % (name, penalty, reasons[name]))
+
+    msg = ('Static snapshots: %d of %d modules, the others fall back to a '
+           'normal snapshot' % (len(snapshot_infos) - len(reasons),
+                                len(snapshot_infos)))
+    print("%s%s%s" % ("\033[1;33m", msg, "\033[0m"))
+    print('  %-24s %10s  %s' % ('module', 'heap (B)', 'reason'))
+    print('\n'.join(lines))
+    print('  %-24s %10d' % ('total (estimated)', total))
+
+    if options.require_static:
+        msg = ("--require-static: %d module(s) without static snapshot" %
+               len(reasons))
+        print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+        exit(1)
+
 
-    return snapshot_path
+# (source, transformed source) by (path, minify level, platform), only the
+# latest version of a module is kept
+_js_contents_cache = {}
 
 
-def get_js_contents(js_path, is_debug_mode=False):
-    """ Read the contents of the given js module. """
+def get_js_contents(js_path, minify_level=0, platform=None):
+    """ Read the contents of the given js module. The process.platform
+        checks are folded if the target platform is given.
+    """
     with open(js_path, "r") as f:
          code = f.read()
 
-    # minimize code when in release mode
-    if not is_debug_mode:
-        code = remove_comments(code)
-        code = remove_whitespaces(code)
+    key = (js_path, minify_level, platform)
+    cached = _js_contents_cache.get(key)
+    if cached is None or cached[0] != code:
+        cached = (code, transform_js(js_path, code, minify_level, platform))
+        _js_contents_cache[key] = cached
+    return cached[1]
+
+
+def transform_js(js_path, code, minify_level, platform):
+    if platform:
+        try:
+            code = platform_fold.fold(code, platform)[0]
+        except minifier.MinifyError as e:
+            msg = "Failed to fold the platform checks of %s: %s" % (js_path,
+                                                                     e)
+            print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+            exit(1)
+
+    if minify_level > 0:
+        # Only the 'iotjs' module runs as a global script, the others
+        # are wrapped into a function and can have their locals renamed.
+        module_name = os.path.splitext(os.path.basename(js_path))[0]
+        try:
+            code = minifier.minify(code, minify_level,
+                                   wrapped=(module_name != "iotjs"))
+        except minifier.MinifyError as e:
+            msg = "Failed to minify %s: %s" % (js_path, e)
+            print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+            exit(1)
+
     return code
 
 
-def get_literals_from_snapshots(snapshot_tool, snapshot_list):
-    literals_path = fs.join(path.SRC_ROOT, 'js', 'literals.list')
+def dump_literals(snapshot_tool, snapshot_list, literals_path, cache=None):
+    """ Write the literals of the given snapshots into literals_path.
+        Returns the exit code of the snapshot tool.
+    """
     cmd = [snapshot_tool, "litdump", "-o", literals_path]
     cmd.extend(snapshot_list)
 
+    if cache:
+        key = cache.key('litdump', *read_files(snapshot_list))
+        if cache.load(key, literals_path):
+            return 0
+
     ret = subprocess.call(cmd)
+    if cache and ret == 0:
+        cache.store(key, literals_path)
+
+    return ret
+
+
+def get_literals_from_snapshots(snapshot_tool, snapshot_list, work_dir,
+                                cache=None):
+    literals_path = fs.join(work_dir, 'literals.list')
+    ret = dump_literals(snapshot_tool, snapshot_list, literals_path, cache)
 
     if ret != 0:
         msg = "Failed to dump the literals: - %d" % ret
@@ -245,6 +969,100 @@ def get_literals_from_snapshots(snapshot_tool, snapshot_list):
     return literals_path
 
 
+def get_module_literals(snapshot_tool, snapshot_infos, jobs, cache=None):
+    """ Return a dict of module name -> set of the literals of its
+        snapshot.
+    """
+    def dump(info):
+        literals_path = info['path'] + '.literals'
+        ret = dump_literals(snapshot_tool, [info['path']], literals_path,
+                            cache)
+        if ret != 0:
+            return None
+
+        literals = read_literals(literals_path)
+        fs.remove(literals_path)
+        return literals
+
+    results = run_parallel(dump, snapshot_infos, jobs)
+
+    module_literals = {}
+    for info, literals in zip(snapshot_infos, results):
+        if literals is None:
+            msg = "Failed to dump the literals of '%s'" % info['name']
+            print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+            exit(1)
+        module_literals[info['name']] = literals
+
+    return module_literals
+
+
+def read_corpus(corpus_paths):
+    """ Return the contents of the JS files of the given files and
+        directories.
+    """
+    js_paths = []
+    for corpus_path in corpus_paths:
+        if not fs.isdir(corpus_path):
+            js_paths.append(corpus_path)
+            continue
+        for root, dirs, files in os.walk(corpus_path):
+            dirs.sort()
+            js_paths.extend([fs.join(root, name) for name in sorted(files)
+                             if name.endswith('.js')])
+
+    contents = []
+    for js_path in js_paths:
+        with open(js_path, 'r') as fjs:
+            contents.append((js_path, fjs.read()))
+    return contents
+
+
+def select_magic_strings(options, required, module_literals, snapshot):
+    """ Choose the external magic strings from the required ones and the
+        literals of the modules and the app corpus, limited by
+        --magic-string-budget. Returns the set of the chosen strings.
+    """
+    # Strings which are magic strings of the engine itself are not
+    # candidates, the engine never looks them up in the external list.
+    builtin = set()
+    inc_path = fs.join(path.JERRY_ROOT, 'jerry-core', 'lit',
+                       'lit-magic-strings.inc.h')
+    if fs.exists(inc_path):
+        builtin = magic_strings.read_builtin_magic_strings(inc_path)
+
+    extra_uses = {}
+    for js_path, code in read_corpus(options.magic_string_corpus or []):
+        try:
+            counts = magic_strings.source_literals(code)
+        except minifier.MinifyError as e:
+            msg = "Failed to parse %s: %s" % (js_path, e)
+            print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+            exit(1)
+        for text, count in counts.items():
+            if text not in builtin:
+                extra_uses[text] = extra_uses.get(text, 0) + count
+
+    budget = options.magic_string_budget
+    selection = magic_strings.select(required, module_literals, extra_uses,
+                                     budget, snapshot)
+
+    if budget is not None:
+        print('Magic strings: %d bytes of %d bytes ROM budget, '
+              'expected heap savings: %d bytes' % (selection.rom_size,
+              budget, selection.heap_savings))
+        if selection.rom_size > budget:
+            msg = ("The required IOTJS_MAGIC_STRING_* strings alone "
+                   "exceed the magic string budget")
+            print("%s%s%s" % ("\033[1;33m", msg, "\033[0m"))
+
+    if options.magic_string_report:
+        with open(options.magic_string_report, 'w') as freport:
+            freport.write(selection.report())
+
+    return selection.chosen
+
+
 def read_literals(literals_path):
     literals_set = set()
     with open(literals_path, 'rb') as fin:
@@ -264,131 +1082,622 @@ def read_literals(literals_path):
 
 
 def write_literals_to_file(literals_set, literals_path):
-    sorted_lit = sorted(literals_set, key=lambda x: (len(x), x))
     with open(literals_path, 'wb') as flit:
-        for lit in sorted_lit:
-            entry = "%d %s\n" % (len(lit), lit)
-            flit.write(entry.encode('utf-8'))
+        for lit in sort_magic_strings(literals_set):
+            # The length is in bytes, as read_literals() reads it
+            lit = encode_str(lit)
+            flit.write(str(len(lit)).encode('utf-8') + b' ' + lit + b'\n')
+
+
+def write_if_changed(file_path, content):
+    """ Write the content to the given file unless the file already has
+        exactly this content. Keeping the modification time of unchanged
+        files lets make/ninja skip recompiling them. The file is replaced
+        atomically, so a build running meanwhile never sees a partial file.
+    """
+    binary = isinstance(content, (bytes, bytearray))
+
+    if fs.exists(file_path):
+        with open(file_path, 'rb' if binary else 'r') as fin:
+            if fin.read() == content:
+                return False
+
+    fd, temp_path = tempfile.mkstemp(dir=fs.dirname(fs.abspath(file_path)),
+                                     prefix='.js2c-')
+    with os.fdopen(fd, 'wb' if binary else 'w') as fout:
+        fout.write(content)
+    # mkstemp creates the file readable only by the owner
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(temp_path, 0o666 & ~umask)
+    try:
+        os.rename(temp_path, file_path)
+    except OSError:
+        # Windows does not replace an existing file
+        fs.remove(file_path)
+        os.rename(temp_path, file_path)
+
+    return True
+
+
+def write_units(unit_dir, units):
+    """ Write one translation unit per module into unit_dir and remove
+        the units of the modules which are not built anymore.
+    """
+    fs.maybe_make_directory(unit_dir)
+
+    unit_files = set()
+    for name in sorted(units):
+        unit_file = '%s.c' % name
+        unit_files.add(unit_file)
+        write_if_changed(fs.join(unit_dir, unit_file), ''.join(units[name]))
+
+    for unit_file in fs.listdir(unit_dir):
+        if unit_file.endswith('.c') and unit_file not in unit_files:
+            fs.remove(fs.join(unit_dir, unit_file))
+
+
+def get_snapshot_sizes(snapshot_infos, snapshot_tool, jobs, work_dir,
+                       cache=None):
+    """ Return a dict of module name -> size of its snapshot and the bytes
+        it adds to the merged snapshot. The latter is measured by merging
+        the snapshots without the module, since the merged snapshot shares
+        the literals of the modules.
+    """
+    work_dir = fs.join(work_dir, 'report')
+    fs.maybe_make_directory(work_dir)
+
+    def merged_size(subset):
+        # Every merge writes its own file, they run in parallel.
+        output_name, infos = subset
+        if not infos:
+            return 0
+        output_path = fs.join(work_dir, output_name + '.merged')
+        ret = run_merge([info['path'] for info in infos], output_path,
+                        snapshot_tool, cache)
+        if ret != 0:
+            return None
+        return fs.getsize(output_path)
+
+    # The names of the modules are C identifiers, '$all' can not clash.
+    subsets = [('$all', snapshot_infos)]
+    subsets.extend([(info['name'],
+                     [item for item in snapshot_infos if item is not info])
+                    for info in snapshot_infos])
+    results = run_parallel(merged_size, subsets, jobs)
+
+    if None in results:
+        msg = "Failed to merge the snapshots for the size report"
+        print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+        exit(1)
+
+    module_sizes = {}
+    for info, size in zip(snapshot_infos, results[1:]):
+        module_sizes[info['name']] = {
+            'snapshot': fs.getsize(info['path']),
+            'marginal': results[0] - size,
+        }
+
+    return module_sizes
+
+
+def write_report(options, js_modules, module_sizes, module_literals,
+                 blob_size, snapshot, minify_level):
+    """ Print the per-module size report in the --report format, or write
+        it into --report-file.
+    """
+    for module in js_modules:
+        [name, js_path] = module.split('=', 1)
+        sizes = module_sizes[name]
+        sizes['source'] = fs.getsize(js_path)
+        sizes['minified'] = len(encode_str(get_js_contents(js_path,
+            minify_level, options.platform)))
+
+        literals = module_literals.get(name, set())
+        others = set()
+        for other, other_literals in module_literals.items():
+            if other != name:
+                others |= other_literals
+        sizes['literals'] = len(literals)
+        sizes['own'] = len(literals - others)
+
+    data = report.create(module_sizes, blob_size, snapshot,
+                         options.buildtype, minify_level)
+    output_report(options, data, report.format_table)
+
+
+def output_report(options, data, format_table):
+    if options.report == 'json':
+        text = report.format_json(data)
+    else:
+        text = format_table(data)
+
+    if options.report_file:
+        write_if_changed(options.report_file, text)
+    else:
+        print(text.rstrip())
+
+
+def compare_reports(options):
+    try:
+        old, new = [report.load(item) for item in options.compare]
+    except (IOError, report.ReportError) as e:
+        msg = "Failed to load the report: %s" % e
+        print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+        exit(1)
+
+    output_report(options, report.compare(old, new),
+                  report.format_compare_table)
+
+
+APP_ROOT = '/$app/'
+
+
+def stage_app(app_dir, stage_dir):
+    """ Copy the JS and JSON files of the application into stage_dir, so
+        they can be processed like the builtin modules. The JSON files are
+        turned into modules exporting their contents.
+
+        Returns the list of the staged modules in the format of --modules
+        and a dict of module name -> module id. The module names are C
+        identifiers, the ids are the paths of the files under APP_ROOT.
+        cmake/iotjs.cmake derives the same names: the paths are taken in
+        sorted order and a name which is already taken gets a '_' suffix.
+    """
+    rel_paths = []
+    for root, dirs, files in os.walk(app_dir):
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+        for file_name in files:
+            if os.path.splitext(file_name)[1] in ('.js', '.json'):
+                file_path = fs.join(root, file_name)
+                rel_paths.append(os.path.relpath(file_path,
+                                                 app_dir).replace('\\', '/'))
+
+    app_modules = []
+    module_ids = {}
+    for rel_path in sorted(rel_paths):
+        name = 'app_' + re.sub('[^A-Za-z0-9]', '_', rel_path)
+        while name in module_ids:
+            name += '_'
+
+        with open(fs.join(app_dir, rel_path), 'r') as fsource:
+            code = fsource.read()
+        if rel_path.endswith('.json'):
+            code = 'module.exports = %s;\n' % code.strip()
+
+        staged_path = fs.join(stage_dir, name + '.js')
+        with open(staged_path, 'w') as fstaged:
+            fstaged.write(code)
+
+        app_modules.append('%s=%s' % (name, staged_path))
+        module_ids[name] = APP_ROOT + rel_path
+
+    return app_modules, module_ids
+
+
+def prune_modules(options, js_modules, minify_level):
+    """ Drop the modules which can not be reached from the application
+        entry scripts and print the bytes saved by each dropped module.
+    """
+    modules = dict([module.split('=', 1) for module in js_modules])
+    module_requires = deps.read_module_requires(options.modules_json or [])
+    keep = [name for name in (options.keep_modules or '').split(',') if name]
+    result = deps.trace(options.app_entry, modules, module_requires,
+                        ['iotjs'] + keep)
+
+    for js_path, count in result.dynamic:
+        msg = ("%s: %d require() call(s) with a non-literal argument, use "
+               "--keep-modules for the modules loaded by them" %
+               (js_path, count))
+        print("%s%s%s" % ("\033[1;33m", msg, "\033[0m"))
+    for js_path, name in result.unresolved:
+        print("%s: require('%s') is not a builtin module" % (js_path, name))
+
+    kept = [module for module in js_modules
+            if module.split('=', 1)[0] in result.reached]
+    dropped = sorted([name for name in modules if name not in result.reached])
+
+    print('Dropped %d of %d JS modules not reached from %s:' % (
+          len(dropped), len(modules), ', '.join(options.app_entry)))
+    total = 0
+    for name in dropped:
+        size = len(encode_str(get_js_contents(modules[name], minify_level,
+                                              options.platform)))
+        total += size
+        print('  %-32s %8d bytes' % (name, size))
+    print('  %-32s %8d bytes' % ('total', total))
+
+    if options.trace_depends:
+        write_if_changed(options.trace_depends,
+                         ''.join([item + '\n' for item in result.app_files]))
+
+    return kept
 
 
 def js2c(options, js_modules):
-    is_debug_mode = (options.buildtype == "debug")
+    # The intermediate files go into a private directory, so several builds
+    # can run from one source tree at the same time.
+    work_dir = fs.abspath(tempfile.mkdtemp(prefix='js2c-',
+                                           dir=options.work_dir))
+    try:
+        generate(options, js_modules, work_dir)
+    finally:
+        fs.rmtree(work_dir)
+
+
+def watched_files(options, js_modules):
+    """ Return the input files of js2c. """
+    files = [module.split('=', 1)[1] for module in js_modules]
+    files.append(options.magic_strings)
+    files.extend(options.modules_json or [])
+    files.extend(options.app_entry or [])
+    if options.snapshot_tool:
+        files.append(options.snapshot_tool)
+
+    for app_dir in [options.app_dir] + [fs.dirname(fs.abspath(entry))
+                                         for entry in options.app_entry or []]:
+        if not app_dir:
+            continue
+        for root, dirs, file_names in os.walk(app_dir):
+            dirs[:] = [name for name in dirs if not name.startswith('.')]
+            files.extend([fs.join(root, name) for name in file_names
+                          if name.endswith(('.js', '.json'))])
+
+    return sorted(set(files))
+
+
+def file_states(files):
+    states = {}
+    for file_path in files:
+        try:
+            stat = os.stat(file_path)
+            states[file_path] = (stat.st_mtime, stat.st_size)
+        except OSError:
+            states[file_path] = None
+    return states
+
+
+def watch(options, js_modules):
+    """ Regenerate the outputs whenever an input file changes. The results
+        of the snapshot tool and the transformed sources are kept in memory,
+        so only the changed modules (and the merged outputs) are redone.
+    """
+    work_dir = fs.abspath(tempfile.mkdtemp(prefix='js2c-',
+                                           dir=options.work_dir))
+    cache = None
+    states = {}
+    try:
+        while True:
+            current = file_states(watched_files(options, js_modules))
+            changed = [item for item in sorted(current)
+                       if states.get(item, False) != current[item]]
+            if not changed:
+                time.sleep(options.watch_interval)
+                continue
+
+            if states:
+                print('Changed: %s' % ', '.join(changed))
+            states = current
+
+            if options.snapshot_tool and (cache is None or
+                                          options.snapshot_tool in changed):
+                # A rebuilt snapshot tool invalidates all of the results.
+                cache = SnapshotCache(options.cache_dir,
+                                      options.snapshot_tool,
+                                      options.buildtype, memory=True,
+                                      max_size=cache_size(options))
+
+            start = time.time()
+            try:
+                generate(options, js_modules, work_dir, cache)
+            except SystemExit:
+                msg = "js2c failed, waiting for the next change"
+                print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+                continue
+            print('Generated in %.2f seconds, watching for changes' % (
+                  time.time() - start))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fs.rmtree(work_dir)
+
+
+def generate(options, js_modules, work_dir, cache=None):
+    minify_level = options.minify_level
+    if minify_level is None:
+        minify_level = 0 if options.buildtype == "debug" else 1
+
+    if options.app_entry:
+        js_modules = prune_modules(options, js_modules, minify_level)
+        if options.trace_output:
+            write_if_changed(options.trace_output,
+                             ''.join([item + '\n' for item in js_modules]))
+            return
+
+    # Bundle the application next to the builtin modules
+    module_ids = {}
+    app_main = None
+    if options.app_dir:
+        stage_dir = fs.join(work_dir, 'app')
+        fs.maybe_make_directory(stage_dir)
+        app_modules, module_ids = stage_app(options.app_dir, stage_dir)
+        js_modules = js_modules + app_modules
+
+        # The build system names the outputs of the modules in advance
+        if options.app_module_names is not None:
+            expected = [name for name in options.app_module_names.split(',')
+                        if name]
+            if sorted(expected) != sorted(module_ids):
+                msg = ("The application modules differ from the ones the "
+                       "build expects (reconfigure the build):\n"
+                       "  expected: %s\n  found:    %s" % (
+                       ', '.join(sorted(expected)),
+                       ', '.join(sorted(module_ids))))
+                print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+                exit(1)
+
+        app_main = APP_ROOT + options.app_main.replace('\\', '/')
+        if app_main not in module_ids.values():
+            msg = "The main file of the application is not found: %s" % (
+                  fs.join(options.app_dir, options.app_main))
+            print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+            exit(1)
+
     snapshot_tool = options.snapshot_tool
     no_snapshot = (snapshot_tool == None)
     verbose = options.verbose
+    jobs = options.jobs
+    split_dir = options.split_output
+    compress = (options.compress != 'none')
     magic_string_set = set()
 
+    if compress and not no_snapshot:
+        msg = "Compression of the modules requires the no-snapshot mode."
+        print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+        exit(1)
+
+    if options.embed == 'external' and no_snapshot:
+        msg = "The external blob requires the snapshot mode."
+        print("%s%s%s" % ("\033[1;31m", msg, "\033[0m"))
+        exit(1)
+
+    if cache is None and not no_snapshot and options.cache_dir:
+        cache = SnapshotCache(options.cache_dir, snapshot_tool,
+                              options.buildtype,
+                              max_size=cache_size(options))
+
     str_const_regex = re.compile('^#define IOTJS_MAGIC_STRING_\w+\s+"(\w+)"$')
-    with open(fs.join(path.SRC_ROOT, 'iotjs_magic_strings.in'), 'r') as fin_h:
+    with open(options.magic_strings, 'r') as fin_h:
         for line in fin_h:
             result = str_const_regex.search(line)
             if result:
                 magic_string_set.add(result.group(1))
 
     # generate the code for the modules
-    with open(fs.join(path.SRC_ROOT, 'iotjs_js.h'), 'w') as fout_h, \
-         open(fs.join(path.SRC_ROOT, 'iotjs_js.c'), 'w') as fout_c:
-
-        fout_h.write(LICENSE)
-        fout_h.write(HEADER1)
-        fout_c.write(LICENSE)
-        fout_c.write(HEADER2)
-
-        snapshot_infos = []
-        js_module_names = []
-        if no_snapshot:
-            for idx, module in enumerate(sorted(js_modules)):
-                [name, js_path] = module.split('=', 1)
-                js_module_names.append(name)
-                if verbose:
-                    print('Processing module: %s' % name)
-
-                code = get_js_contents(js_path, is_debug_mode)
-                code_string = format_code(code, 1)
-
-                fout_h.write(MODULE_VARIABLES_H.format(NAME=name))
-                fout_c.write(MODULE_VARIABLES_C.format(NAME=name,
-                                                       NAME_UPPER=name.upper(),
-                                                       SIZE=len(code),
-                                                       CODE=code_string))
-            modules_struct = [
-               '  {{ {0}_n, {0}_s, SIZE_{1} }},'.format(name, name.upper())
-               for name in sorted(js_module_names)
-            ]
-            modules_struct.append('  { NULL, NULL, 0 }')
-            native_struct_h = NATIVE_STRUCT_H
+    fout_h = [LICENSE, HEADER1]
+    fout_c = [LICENSE, HEADER2]
+    units = {}
+    source_sizes = {}
+    embedded_sizes = {}
+    dictionary = b''
+
+    def add_module_code(name, code):
+        code = encode_str(code)
+        # The 'iotjs' module is evaluated directly at startup, only the
+        # modules loaded by process.compileModule are compressed.
+        if compress and name != 'iotjs':
+            compressed_code = lz4.compress(code, dictionary)
+            if len(compressed_code) < len(code):
+                source_sizes[name] = (len(code), len(compressed_code))
+                fout_c.append(MODULE_SOURCE_SIZE_C.format(
+                    NAME_UPPER=name.upper(), SIZE=len(code)))
+                code = compressed_code
+
+        embedded_sizes[name] = len(code)
+        module_c = embed_module(name, code, options.embed,
+                                split_dir or options.output_dir,
+                                (options.linker, options.objcopy),
+                                module_ids.get(name))
+        if options.embed == 'external':
+            fout_h.append(MODULE_EXTERNAL_VARIABLES_H.format(NAME=name))
         else:
-            # Generate snapshot files from JS files
-            for idx, module in enumerate(sorted(js_modules)):
-                [name, js_path] = module.split('=', 1)
-                js_module_names.append(name)
-                if verbose:
-                    print('Processing (1st phase) module: %s' % name)
-                code_path = get_snapshot_contents(js_path, snapshot_tool)
-                info = {'name': name, 'path': code_path, 'idx': idx}
-                snapshot_infos.append(info)
-
-            # Get the literal list from the snapshots
+            fout_h.append(MODULE_VARIABLES_H.format(NAME=name))
+        if split_dir:
+            units[name] = [LICENSE, HEADER2, module_c, EMPTY_LINE]
+            fout_c.append(MODULE_SIZE_C.format(NAME_UPPER=name.upper(),
+                                               SIZE=len(code)))
+        else:
+            fout_c.append(module_c)
+
+    select_strings = (options.magic_string_budget is not None or
+                      options.magic_string_report or
+                      options.magic_string_corpus)
+
+    snapshot_infos = []
+    js_module_names = []
+    if no_snapshot:
+        module_literals = {}
+        module_codes = []
+        for idx, module in enumerate(sorted(js_modules)):
+            [name, js_path] = module.split('=', 1)
+            js_module_names.append(name)
             if verbose:
-                print('Creating literal list file for static snapshot '
-                      'creation')
+                print('Processing module: %s' % name)
+
+            code = get_js_contents(js_path, minify_level, options.platform)
+            # The literals of the sources are only candidates under a
+            # budget, without a limit all of them would be chosen.
+            if options.magic_string_budget is not None or options.report:
+                module_literals[name] = set(
+                    magic_strings.source_literals(code))
+            module_codes.append((name, code))
+
+        # One dictionary for all of the compressed modules: they share
+        # much of their code (license header, stream and event helpers).
+        if options.compress == 'lz4-dict':
+            dictionary = lz4.train_dictionary(
+                [encode_str(code) for (name, code) in module_codes
+                 if name != 'iotjs'], options.compress_dict_size)
+        if dictionary:
+            fout_h.append(MODULES_DICT_H.format(SIZE=len(dictionary)))
+            fout_c.append(MODULES_DICT_C.format(
+                CODE=format_code(dictionary, 1)))
+
+        for name, code in module_codes:
+            add_module_code(name, code)
+
+        if select_strings:
+            magic_string_set = select_magic_strings(options,
+                magic_string_set, module_literals, False)
+
+        if options.report:
+            module_sizes = {}
+            for module in js_modules:
+                [name, js_path] = module.split('=', 1)
+                module_sizes[name] = {'marginal': embedded_sizes[name]}
+            write_report(options, js_modules, module_sizes, module_literals,
+                         sum(embedded_sizes.values()) + len(dictionary),
+                         False, minify_level)
+
+        modules_struct = []
+        for name in sorted(js_module_names):
+            if name in source_sizes:
+                sizes = 'SOURCE_SIZE_{0}, SIZE_{0}'.format(name.upper())
+            else:
+                sizes = 'SIZE_{0}, 0'.format(name.upper())
+            modules_struct.append('  {{ {0}_n, {0}_s, {1} }},'.format(
+                name, sizes))
+        modules_struct.append('  { NULL, NULL, 0, 0 }')
+        struct_names = [module_ids.get(name, name)
+                        for name in sorted(js_module_names)]
+
+        if compress and verbose:
+            source_size = sum([item[0] for item in source_sizes.values()])
+            compressed_size = sum([item[1] for item in source_sizes.values()])
+            print('Compressed %d modules: %d -> %d bytes' % (
+                  len(source_sizes), source_size, compressed_size))
+            if dictionary:
+                print('Shared dictionary: %d bytes' % len(dictionary))
+        native_struct_h = NATIVE_STRUCT_H
+    else:
+        modules = [module.split('=', 1) for module in sorted(js_modules)]
+        js_paths = [js_path for (name, js_path) in modules]
+
+        # Generate snapshot files from JS files
+        if verbose:
+            for name, js_path in modules:
+                print('Processing (1st phase) module: %s' % name)
+        snapshot_paths = generate_snapshots(js_paths, snapshot_tool, jobs,
+                                            work_dir, cache=cache,
+                                            minify_level=minify_level,
+                                            platform=options.platform)[0]
+        for idx, (name, js_path) in enumerate(modules):
+            js_module_names.append(name)
+            info = {'name': name, 'path': snapshot_paths[idx], 'idx': idx}
+            snapshot_infos.append(info)
+
+        # Get the literal list from the snapshots
+        if verbose:
+            print('Creating literal list file for static snapshot '
+                  'creation')
+        module_literals = None
+        if select_strings or options.report:
+            module_literals = get_module_literals(snapshot_tool,
+                                                  snapshot_infos, jobs, cache)
+        if select_strings:
+            magic_string_set = select_magic_strings(options,
+                magic_string_set, module_literals, True)
+        else:
             literals_path = get_literals_from_snapshots(snapshot_tool,
-                [info['path'] for info in snapshot_infos])
+                [info['path'] for info in snapshot_infos], work_dir, cache)
             magic_string_set |= read_literals(literals_path)
-            # Update the literals list file
-            write_literals_to_file(magic_string_set, literals_path)
-
-            # Generate static-snapshots if possible
-            for idx, module in enumerate(sorted(js_modules)):
-                [name, js_path] = module.split('=', 1)
-                if verbose:
-                    print('Processing (2nd phase) module: %s' % name)
-
-                get_snapshot_contents(js_path, snapshot_tool, literals_path)
-
-                fout_h.write(MODULE_SNAPSHOT_VARIABLES_H.format(NAME=name))
-                fout_c.write(MODULE_SNAPSHOT_VARIABLES_C.format(NAME=name,
-                                                                IDX=idx))
             fs.remove(literals_path)
 
-            # Merge the snapshot files
-            code = merge_snapshots(snapshot_infos, snapshot_tool)
-            code_string = format_code(code, 1)
-
-            name = 'iotjs_js_modules'
-            fout_h.write(MODULE_VARIABLES_H.format(NAME=name))
-            fout_c.write(MODULE_VARIABLES_C.format(NAME=name,
-                                                   NAME_UPPER=name.upper(),
-                                                   SIZE=len(code),
-                                                   CODE=code_string))
-            modules_struct = [
-                '  {{ module_{0}, MODULE_{0}_IDX }},'.format(info['name'])
-                for info in snapshot_infos
-            ]
-            modules_struct.append('  { NULL, 0 }')
-            native_struct_h = NATIVE_SNAPSHOT_STRUCT_H
-
-        fout_h.write(native_struct_h)
-        fout_h.write(FOOTER1)
-
-        fout_c.write(NATIVE_STRUCT_C.format(MODULES="\n".join(modules_struct)))
-        fout_c.write(EMPTY_LINE)
+        # Generate static-snapshots if possible
+        if verbose:
+            for name, js_path in modules:
+                print('Processing (2nd phase) module: %s' % name)
+        magic_string_set, static_failed, module_literals = \
+            generate_static_snapshots(options, modules, snapshot_infos,
+                                      magic_string_set, module_literals,
+                                      work_dir, cache, minify_level)
+        static_snapshot_summary(options, snapshot_infos, static_failed,
+                                module_literals, magic_string_set)
+
+        for info in snapshot_infos:
+            fout_h.append(MODULE_SNAPSHOT_VARIABLES_H.format(
+                NAME=info['name']))
+            fout_c.append(MODULE_SNAPSHOT_VARIABLES_C.format(
+                NAME=info['name'], IDX=info['idx'],
+                ID=module_ids.get(info['name'], info['name'])))
+
+        if options.report:
+            module_sizes = get_snapshot_sizes(snapshot_infos, snapshot_tool,
+                                              jobs, work_dir, cache)
+            for name, js_path in modules:
+                module_sizes[name]['static'] = name not in static_failed
+
+        # Merge the snapshot files
+        code = merge_snapshots(snapshot_infos, snapshot_tool, work_dir,
+                               cache)
+        blob_size = len(code)
+        if options.embed == 'external':
+            code, fingerprint = external_blob(code, js_module_names,
+                                              magic_string_set)
+            fout_h.append(EXTERNAL_BLOB_H.format(
+                BLOB='iotjs_js_modules.bin', FINGERPRINT=fingerprint))
+        add_module_code('iotjs_js_modules', code)
+
+        if options.report:
+            write_report(options, js_modules, module_sizes, module_literals,
+                         blob_size, True, minify_level)
+
+        modules_struct = [
+            '  {{ module_{0}, MODULE_{0}_IDX }},'.format(info['name'])
+            for info in snapshot_infos
+        ]
+        modules_struct.append('  { NULL, 0 }')
+        struct_names = [module_ids.get(info['name'], info['name'])
+                        for info in snapshot_infos]
+        native_struct_h = NATIVE_SNAPSHOT_STRUCT_H
+
+    fout_h.append(native_struct_h)
+    fout_h.append(MODULE_LOOKUP_H)
+    if app_main:
+        fout_h.append(APP_MAIN_H.format(ID=app_main))
+    fout_h.append(FOOTER1)
+
+    fout_c.append(NATIVE_STRUCT_C.format(MODULES="\n".join(modules_struct)))
+    fout_c.append(module_lookup(struct_names))
+    fout_c.append(EMPTY_LINE)
+
+    fs.maybe_make_directory(options.output_dir)
+    write_if_changed(fs.join(options.output_dir, 'iotjs_js.h'),
+                     ''.join(fout_h))
+    write_if_changed(fs.join(options.output_dir, 'iotjs_js.c'),
+                     ''.join(fout_c))
+
+    if split_dir:
+        write_units(split_dir, units)
 
     # Write out the external magic strings
-    magic_str_path = fs.join(path.SRC_ROOT, 'iotjs_string_ext.inl.h')
-    with open(magic_str_path, 'w') as fout_magic_str:
-        fout_magic_str.write(LICENSE)
-        fout_magic_str.write(MAGIC_STRINGS_HEADER)
+    fout_magic_str = [LICENSE, MAGIC_STRINGS_HEADER]
+
+    sorted_strings = sort_magic_strings(magic_string_set)
+    for idx, magic_string in enumerate(sorted_strings):
+        magic_text = repr(magic_string)[1:-1]
+        magic_text = magic_text.replace('"', '\\"')
+
+        fout_magic_str.append('  MAGICSTR_EX_DEF(MAGIC_STR_%d, "%s") \\\n'
+                              % (idx, magic_text))
+    # an empty line is required to avoid compile warning
+    fout_magic_str.append(EMPTY_LINE)
 
-        sorted_strings = sorted(magic_string_set, key=lambda x: (len(x), x))
-        for idx, magic_string in enumerate(sorted_strings):
-            magic_text = repr(magic_string)[1:-1]
-            magic_text = magic_text.replace('"', '\\"')
+    magic_str_path = fs.join(options.output_dir, 'iotjs_string_ext.inl.h')
+    write_if_changed(magic_str_path, ''.join(fout_magic_str))
 
-            fout_magic_str.write('  MAGICSTR_EX_DEF(MAGIC_STR_%d, "%s") \\\n'
-                                 % (idx, magic_text))
-        # an empty line is required to avoid compile warning
-        fout_magic_str.write(EMPTY_LINE)
+    if cache is not None:
+        cache.prune()
 
 
 if __name__ == "__main__":
@@ -398,22 +1707,157 @@ if __name__ == "__main__":
     parser.add_argument('--buildtype',
         choices=['debug', 'release'], default='debug',
         help='Specify the build type: %(choices)s (default: %(default)s)')
-    parser.add_argument('--modules', required=True,
+    parser.add_argument('--modules',
         help='List of JS files to process. Format: '
              '<module_name1>=<js_file1>,<module_name2>=<js_file2>,...')
+    parser.add_argument('--minify-level',
+        type=int, choices=[0, 1, 2], default=None,
+        help='Minification of the JS sources: 0 - none, 1 - remove comments '
+             'and whitespaces, 2 - also rename the local variables. '
+             '(default: 0 in debug and 1 in release mode)')
+    parser.add_argument('--platform', default=None,
+        help='Value of process.platform on the target (ex.: linux, nuttx). '
+             'If specified, the comparisons of process.platform with string '
+             'literals are folded and the dead branches are removed.')
     parser.add_argument('--snapshot-tool', default=None,
         help='Executable to use for generating snapshots and merging them '
              '(ex.: the JerryScript snapshot tool). '
              'If not specified the JS files will be directly processed.')
+    parser.add_argument('--output-dir', metavar='DIR',
+        default=path.SRC_ROOT,
+        help='Directory of iotjs_js.c, iotjs_js.h and iotjs_string_ext.inl.h '
+             '(default: %(default)s)')
+    parser.add_argument('--magic-strings', metavar='FILE',
+        default=fs.join(path.SRC_ROOT, 'iotjs_magic_strings.in'),
+        help='iotjs_magic_strings.h run through the C preprocessor '
+             '(default: %(default)s)')
+    parser.add_argument('--work-dir', metavar='DIR', default=None,
+        help='Directory in which the private directory of the intermediate '
+             'files is created, it is removed at the end '
+             '(default: the system temp directory)')
+    parser.add_argument('--cache-dir', default=None,
+        help='Directory of the persistent snapshot cache. Snapshots of '
+             'unchanged modules are reused from here instead of running '
+             'the snapshot tool again. (default: no cache)')
+    parser.add_argument('--cache-size', metavar='MB', type=int, default=64,
+        help='Size limit of the snapshot cache, the least recently used '
+             'entries are removed beyond it, 0 for no limit '
+             '(default: %(default)s)')
+    parser.add_argument('--split-output', metavar='DIR', default=None,
+        help='Emit the code of every module (or the merged snapshot) into '
+             'its own translation unit in DIR. iotjs_js.c only keeps the '
+             'module index then. Unchanged files are not rewritten.')
+    parser.add_argument('--embed',
+        choices=EMBED_BACKENDS, default='array',
+        help='Specify how the module bytes are embedded into the C code: '
+             'hex array initializer, C string literal, assembler .incbin, '
+             'an object file created by the linker and objcopy, or an '
+             'external iotjs_js_modules.bin file which is mapped at runtime '
+             '(snapshot mode only). incbin and objcopy are supported on ELF '
+             'targets only. (default: %(default)s)')
+    parser.add_argument('--linker', default='ld',
+        help='Linker used by the objcopy backend (default: %(default)s)')
+    parser.add_argument('--objcopy', default='objcopy',
+        help='Objcopy used by the objcopy backend (default: %(default)s)')
+    parser.add_argument('--compress',
+        choices=COMPRESS_CODECS, default='none',
+        help='Compress the modules loaded by process.compileModule, only '
+             'in no-snapshot mode: %(choices)s. lz4-dict compresses them '
+             'against a dictionary they share (default: %(default)s)')
+    parser.add_argument('--compress-dict-size', metavar='BYTES',
+        type=int, default=4096,
+        help='Size of the dictionary shared by the modules compressed '
+             'with lz4-dict (default: %(default)s)')
+    parser.add_argument('--magic-string-budget', metavar='BYTES',
+        type=int, default=None,
+        help='ROM byte budget of the external magic strings, the literals '
+             'are chosen by their estimated heap savings (default: no '
+             'limit)')
+    parser.add_argument('--magic-string-corpus', metavar='PATH',
+        action='append', default=None,
+        help='JS file or directory of the application, its literals are '
+             'counted as magic string candidates (can be repeated)')
+    parser.add_argument('--magic-string-report', metavar='FILE',
+        default=None,
+        help='Write the chosen and dropped magic strings with their '
+             'costs and savings into FILE')
+    parser.add_argument('--require-static', action='store_true',
+        default=False,
+        help='Fail if a module can not be turned into a static snapshot '
+             '(by default it falls back to a normal snapshot)')
+    parser.add_argument('--app-entry', metavar='PATH',
+        action='append', default=None,
+        help='Entry script of the application, the JS modules which are '
+             'not reached by its require() calls are dropped (can be '
+             'repeated)')
+    parser.add_argument('--modules-json', metavar='PATH',
+        action='append', default=None,
+        help='modules.json file whose require arrays are followed when '
+             'tracing the application (can be repeated)')
+    parser.add_argument('--keep-modules', metavar='LIST', default=None,
+        help='Comma separated list of the modules which are kept when '
+             'tracing the application (e.g. the ones loaded by dynamic '
+             'require() calls)')
+    parser.add_argument('--app-dir', metavar='DIR', default=None,
+        help='Bundle the JS and JSON files of the application in DIR with '
+             'the builtin modules')
+    parser.add_argument('--app-main', metavar='FILE', default='index.js',
+        help='Main file of the bundled application relative to --app-dir, '
+             'it runs when iotjs is started without a script '
+             '(default: %(default)s)')
+    parser.add_argument('--app-module-names', metavar='NAMES', default=None,
+        help='Comma separated list of the module names the build system '
+             'expects for the files of --app-dir, js2c fails if the names '
+             'it derives differ')
+    parser.add_argument('--trace-output', metavar='FILE', default=None,
+        help='Only trace the application and write the reached modules '
+             'into FILE in the format of --modules, one per line')
+    parser.add_argument('--trace-depends', metavar='FILE', default=None,
+        help='Write the traced application files into FILE')
+    parser.add_argument('--report',
+        choices=['json', 'table'], default=None,
+        help='Print the per-module sizes: source, minified and snapshot '
+             'bytes, static snapshot, literals and the bytes added to the '
+             'embedded data (default: no report)')
+    parser.add_argument('--report-file', metavar='FILE', default=None,
+        help='Write the report into FILE instead of printing it')
+    parser.add_argument('--compare', metavar=('OLD', 'NEW'), nargs=2,
+        default=None,
+        help='Compare two JSON reports and print the size changes of the '
+             'modules in the --report format (default: table)')
+    parser.add_argument('--watch', action='store_true', default=False,
+        help='Keep running and regenerate the outputs whenever a module, '
+             'the magic strings or the application changes. The snapshot '
+             'tool results are kept in memory, so only the changed modules '
+             'are processed again')
+    parser.add_argument('--watch-interval', metavar='SECONDS',
+        type=float, default=0.2,
+        help='Polling interval of --watch (default: %(default)s)')
+    parser.add_argument('-j', '--jobs',
+        type=int, default=multiprocessing.cpu_count(),
+        help='Number of snapshot generator processes to run in parallel '
+             '(default: %(default)s)')
     parser.add_argument('-v', '--verbose', default=False,
         help='Enable verbose output.')
 
     options = parser.parse_args()
 
+    if options.compare:
+        compare_reports(options)
+        exit(0)
+
+    if not options.modules:
+        parser.error('the following arguments are required: --modules')
+
     if not options.snapshot_tool:
         print('Converting JS modules to C arrays (no snapshot)')
     else:
+        # The snapshot tool runs in the work directory
+        options.snapshot_tool = fs.abspath(options.snapshot_tool)
         print('Using "%s" as snapshot tool' % options.snapshot_tool)
 
     modules = options.modules.split(',')
-    js2c(options, modules)
+    if options.watch:
+        watch(options, modules)
+    else:
+        js2c(options, modules)
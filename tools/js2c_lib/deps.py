@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Static require() tracing used by js2c to drop unreachable modules.
+
+    Starting from the 'iotjs' module and the application entry scripts,
+    every require('name') call with a string literal argument is followed,
+    together with the 'require' arrays of the modules.json files. Relative
+    requires of the application are resolved to files and traced as well.
+    A require with any other argument can not be followed, those calls are
+    reported so the affected modules can be kept explicitly.
+"""
+
+import json
+import os
+
+from js2c_lib import minifier
+
+
+class TraceResult(object):
+    def __init__(self):
+        # Names of the reached modules (JS and native)
+        self.reached = set()
+        # Application files which were traced
+        self.app_files = []
+        # List of (file, number of dynamic require calls)
+        self.dynamic = []
+        # List of (file, name) of the requires which were not found
+        self.unresolved = []
+
+
+def find_requires(source):
+    """ Return the list of the string arguments of the require() calls
+        of the given source and the number of the other require() calls.
+    """
+    tokens = minifier.tokenize(source)
+    names = []
+    dynamic = 0
+
+    for idx, token in enumerate(tokens):
+        if token.kind != 'name' or token.value != 'require':
+            continue
+        if idx > 0 and tokens[idx - 1].value == 'function':
+            continue
+        if idx + 1 >= len(tokens) or not tokens[idx + 1].is_punct('('):
+            continue
+
+        if (idx + 3 < len(tokens) and tokens[idx + 2].kind == 'string' and
+                tokens[idx + 3].is_punct(')')):
+            names.append(tokens[idx + 2].value[1:-1])
+        else:
+            dynamic += 1
+
+    return names, dynamic
+
+
+def read_module_requires(json_paths):
+    """ Return a dict of module name -> 'require' array of the given
+        modules.json files.
+    """
+    requires = {}
+    for json_path in json_paths:
+        with open(json_path, 'r') as fjson:
+            modules = json.load(fjson).get('modules', {})
+        for name, module in modules.items():
+            requires.setdefault(name, []).extend(module.get('require', []))
+    return requires
+
+
+def _resolve_file(base_dir, name):
+    base = os.path.normpath(os.path.join(base_dir, name))
+    for candidate in [base, base + '.js', os.path.join(base, 'index.js')]:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def trace(entry_paths, js_modules, module_requires, roots=('iotjs',)):
+    """ Trace the require() calls.
+
+        entry_paths: application entry scripts
+        js_modules: dict of builtin JS module name -> source path
+        module_requires: dict of module name -> modules.json 'require' array
+        roots: builtin modules which are always loaded
+    """
+    result = TraceResult()
+    pending_modules = list(roots)
+    pending_files = [os.path.normpath(entry) for entry in entry_paths]
+    seen_files = set()
+
+    def visit_source(source_path, allow_relative):
+        with open(source_path, 'r') as fsource:
+            names, dynamic = find_requires(fsource.read())
+
+        # The builtin modules only use dynamic requires to load the
+        # modules of the application, which are traced from its side.
+        if dynamic and allow_relative:
+            result.dynamic.append((source_path, dynamic))
+
+        for name in names:
+            if allow_relative and name.startswith(('./', '../', '/')):
+                resolved = _resolve_file(os.path.dirname(source_path), name)
+                if resolved:
+                    pending_files.append(resolved)
+                else:
+                    result.unresolved.append((source_path, name))
+            elif name in js_modules or name in module_requires:
+                pending_modules.append(name)
+            elif allow_relative:
+                result.unresolved.append((source_path, name))
+
+    while pending_modules or pending_files:
+        if pending_files:
+            source_path = pending_files.pop()
+            if source_path in seen_files:
+                continue
+            seen_files.add(source_path)
+            result.app_files.append(source_path)
+            visit_source(source_path, True)
+            continue
+
+        name = pending_modules.pop()
+        if name in result.reached:
+            continue
+        result.reached.add(name)
+
+        pending_modules.extend(module_requires.get(name, []))
+        if name in js_modules:
+            visit_source(js_modules[name], False)
+
+    return result
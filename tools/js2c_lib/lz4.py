@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" LZ4 block format compressor used by js2c.
+
+    The output is a raw LZ4 block (no frame header, no checksum), which is
+    unpacked at runtime by iotjs_lz4_decompress() in src/iotjs_util.c. The
+    decoder needs no memory besides the output buffer, so the format suits
+    the small targets where the embedded JS modules take most of the flash.
+
+    The compressor searches hash chains instead of the single hash slot of
+    the reference implementation: it is slower, but the modules are only
+    compressed once at build time and every byte saved is flash.
+
+    A block can also be compressed against a dictionary: the dictionary
+    is the history before the first byte of the block, so the matches can
+    copy from it. train_dictionary() builds a dictionary shared by all of
+    the modules from the byte sequences that repeat across the modules.
+"""
+
+import heapq
+
+MIN_MATCH = 4
+# The last 5 bytes are always literals and the last match must start at
+# least 12 bytes before the end of the block.
+LAST_LITERALS = 5
+MATCH_LIMIT = 12
+MAX_OFFSET = 0xffff
+MAX_CHAIN = 64
+
+# Length of the byte sequences counted by train_dictionary() and of the
+# segments it copies into the dictionary.
+DMER_LENGTH = 8
+SEGMENT_LENGTH = 48
+
+
+def _write_length(out, length):
+    length -= 15
+    while length >= 255:
+        out.append(255)
+        length -= 255
+    out.append(length)
+
+
+def _write_sequence(out, data, literal_start, literal_end, offset,
+                    match_length):
+    literal_length = literal_end - literal_start
+    token = min(literal_length, 15) << 4
+    if offset:
+        token |= min(match_length - MIN_MATCH, 15)
+    out.append(token)
+
+    if literal_length >= 15:
+        _write_length(out, literal_length)
+    out.extend(data[literal_start:literal_end])
+
+    if offset:
+        out.append(offset & 0xff)
+        out.append(offset >> 8)
+        if match_length - MIN_MATCH >= 15:
+            _write_length(out, match_length - MIN_MATCH)
+
+
+def compress(data, dictionary=b''):
+    """ Return the LZ4 block of the given bytes. The matches of the block
+        may refer to the last MAX_OFFSET bytes of the dictionary, the same
+        dictionary is needed to decompress it.
+    """
+    dictionary = bytes(dictionary)[-MAX_OFFSET:]
+    data = bytearray(dictionary) + bytearray(data)
+    size = len(data)
+    out = bytearray()
+
+    match_end_limit = size - LAST_LITERALS
+    search_limit = size - MATCH_LIMIT
+    head = {}
+    chain = [-1] * size
+
+    def insert(pos):
+        key = bytes(data[pos:pos + MIN_MATCH])
+        chain[pos] = head.get(key, -1)
+        head[key] = pos
+
+    def find_match(pos):
+        best_length = 0
+        best_offset = 0
+        candidate = head.get(bytes(data[pos:pos + MIN_MATCH]), -1)
+        depth = MAX_CHAIN
+        while candidate >= 0 and depth > 0 and pos - candidate <= MAX_OFFSET:
+            length = 0
+            while (pos + length < match_end_limit and
+                   data[candidate + length] == data[pos + length]):
+                length += 1
+            if length > best_length:
+                best_length = length
+                best_offset = pos - candidate
+            candidate = chain[candidate]
+            depth -= 1
+        return best_length, best_offset
+
+    for pos in range(min(len(dictionary), search_limit)):
+        insert(pos)
+
+    literal_start = len(dictionary)
+    pos = literal_start
+    while pos < search_limit:
+        length, offset = find_match(pos)
+        if length < MIN_MATCH:
+            insert(pos)
+            pos += 1
+            continue
+
+        # Lazy matching: prefer a longer match starting at the next byte.
+        insert(pos)
+        if pos + 1 < search_limit:
+            next_length, next_offset = find_match(pos + 1)
+            if next_length > length:
+                pos += 1
+                continue
+
+        _write_sequence(out, data, literal_start, pos, offset, length)
+        for idx in range(pos + 1, min(pos + length, search_limit)):
+            insert(idx)
+        pos += length
+        literal_start = pos
+
+    _write_sequence(out, data, literal_start, size, 0, 0)
+    return bytes(out)
+
+
+def train_dictionary(samples, size):
+    """ Return a dictionary of at most size bytes for the given samples.
+
+        Every sequence of DMER_LENGTH bytes is scored by the number of
+        samples it occurs in, the sequences of a single sample are left
+        to the compression of the sample itself. The segments of the
+        samples with the highest total score are copied into the
+        dictionary, and the sequences of a chosen segment no longer count
+        for the next ones. The best segment ends up at the end of the
+        dictionary, where it is the nearest to the compressed data.
+    """
+    samples = [bytes(sample) for sample in samples]
+    frequency = {}
+    for sample in samples:
+        for dmer in set([sample[pos:pos + DMER_LENGTH] for pos in
+                         range(len(sample) - DMER_LENGTH + 1)]):
+            frequency[dmer] = frequency.get(dmer, 0) + 1
+
+    def score(sample, pos):
+        return sum([frequency.get(sample[idx:idx + DMER_LENGTH], 1) - 1
+                    for idx in range(pos, pos + SEGMENT_LENGTH -
+                                     DMER_LENGTH + 1)])
+
+    # The scores only decrease, so a segment is chosen when its updated
+    # score is still the best one (lazy greedy).
+    candidates = []
+    for sample_idx, sample in enumerate(samples):
+        for pos in range(0, len(sample) - SEGMENT_LENGTH + 1,
+                         SEGMENT_LENGTH // 4):
+            value = score(sample, pos)
+            if value:
+                candidates.append((-value, sample_idx, pos))
+    heapq.heapify(candidates)
+
+    segments = []
+    total = 0
+    while candidates and total + SEGMENT_LENGTH <= size:
+        value, sample_idx, pos = heapq.heappop(candidates)
+        sample = samples[sample_idx]
+        current = score(sample, pos)
+        if not current:
+            continue
+        if candidates and -current > candidates[0][0]:
+            heapq.heappush(candidates, (-current, sample_idx, pos))
+            continue
+
+        segment = sample[pos:pos + SEGMENT_LENGTH]
+        segments.append(segment)
+        total += len(segment)
+        for idx in range(len(segment) - DMER_LENGTH + 1):
+            frequency[segment[idx:idx + DMER_LENGTH]] = 1
+
+    return b''.join(reversed(segments))
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Selection of the external magic strings under a ROM byte budget.
+
+    Every external magic string costs ROM: its characters, the terminating
+    zero and one entry in both the pointer and the length tables of
+    iotjs_string_ext.c. In exchange the engine does not allocate the string
+    on the heap when a script refers to it, and a module snapshot can only
+    be static if all of its literals are magic strings.
+
+    The candidates are ranked by uses * heap cost / ROM cost, where uses is
+    the number of modules (and app sources) referring to the literal: a
+    literal shared by many modules is the most likely one to be loaded.
+    The strings are taken in this order while they fit into the budget.
+    The heap savings are estimated with one heap copy per literal, since
+    the engine shares equal literals between the scripts.
+"""
+
+import re
+
+from js2c_lib import minifier
+
+# Terminating zero, 32 bit string pointer and 32 bit length
+ROM_ENTRY_SIZE = 1 + 4 + 4
+# Header of a heap allocated string and the heap allocation granularity
+HEAP_STRING_HEADER = 8
+HEAP_ALIGNMENT = 8
+
+
+def rom_cost(text):
+    return len(text.encode('utf-8')) + ROM_ENTRY_SIZE
+
+
+def heap_cost(text):
+    size = HEAP_STRING_HEADER + len(text.encode('utf-8'))
+    return (size + HEAP_ALIGNMENT - 1) // HEAP_ALIGNMENT * HEAP_ALIGNMENT
+
+
+def read_builtin_magic_strings(inc_path):
+    """ Return the magic strings of the engine listed in the given
+        lit-magic-strings.inc.h file.
+    """
+    regex = re.compile(r'LIT_MAGIC_STRING_DEF\s*\(\s*\w+\s*,\s*"([^"\\]*)"')
+    with open(inc_path, 'r') as finc:
+        return set(regex.findall(finc.read()))
+
+
+def source_literals(source):
+    """ Return the identifiers and simple string literals of the given
+        JavaScript source with the number of their occurrences.
+    """
+    counts = {}
+    for token in minifier.tokenize(source):
+        if token.kind == 'name' and token.value not in minifier.KEYWORDS:
+            text = token.value
+        elif token.kind == 'string' and '\\' not in token.value:
+            text = token.value[1:-1]
+        else:
+            continue
+
+        if text:
+            counts[text] = counts.get(text, 0) + 1
+
+    return counts
+
+
+class Selection(object):
+    """ Result of select(): the chosen strings and the report data. """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.chosen = set()
+        self.entries = []
+        self.rom_size = 0
+        self.heap_savings = 0
+        self.non_static_modules = None
+
+    def report(self):
+        lines = []
+        if self.budget is None:
+            lines.append('Magic string budget: unlimited')
+        else:
+            lines.append('Magic string budget: %d bytes' % self.budget)
+        lines.append('ROM used: %d bytes (%d strings)' % (self.rom_size,
+                                                           len(self.chosen)))
+        lines.append('Expected heap savings: %d bytes' % self.heap_savings)
+        if self.non_static_modules is not None:
+            lines.append('Modules without static snapshot: %s' %
+                         (', '.join(self.non_static_modules) or '-'))
+        lines.append('')
+        lines.append('%-8s %6s %6s %6s  %s' % ('status', 'uses', 'rom',
+                                              'heap', 'string'))
+        for entry in self.entries:
+            lines.append('%-8s %6s %6d %6d  %s' % (
+                entry['status'], entry['uses'], entry['rom'], entry['heap'],
+                repr(entry['text'])))
+
+        return '\n'.join(lines) + '\n'
+
+
+def select(required, module_literals, extra_uses=None, budget=None,
+           snapshot=True):
+    """ Choose the magic strings.
+
+        required: strings which are always kept (IOTJS_MAGIC_STRING_*)
+        module_literals: dict of module name -> set of its literals
+        extra_uses: dict of literal -> number of uses in the app sources
+        budget: ROM byte budget or None for no limit
+        snapshot: whether the modules are snapshots, which can only be
+                  static if all of their literals are chosen
+    """
+    uses = {}
+    for literals in module_literals.values():
+        for text in literals:
+            uses[text] = uses.get(text, 0) + 1
+    for text, count in (extra_uses or {}).items():
+        uses[text] = uses.get(text, 0) + count
+
+    selection = Selection(budget)
+
+    for text in sorted(required, key=lambda x: (len(x), x)):
+        selection.chosen.add(text)
+        selection.rom_size += rom_cost(text)
+        selection.entries.append({'status': 'required', 'text': text,
+                                  'uses': uses.get(text, '-'),
+                                  'rom': rom_cost(text),
+                                  'heap': heap_cost(text)})
+
+    def priority(text):
+        return (-float(uses[text] * heap_cost(text)) / rom_cost(text), text)
+
+    for text in sorted(set(uses) - selection.chosen, key=priority):
+        cost = rom_cost(text)
+        status = 'dropped'
+        if budget is None or selection.rom_size + cost <= budget:
+            status = 'chosen'
+            selection.chosen.add(text)
+            selection.rom_size += cost
+            selection.heap_savings += heap_cost(text)
+
+        selection.entries.append({'status': status, 'text': text,
+                                  'uses': uses[text], 'rom': cost,
+                                  'heap': heap_cost(text)})
+
+    if snapshot:
+        selection.non_static_modules = sorted([
+            name for name, literals in module_literals.items()
+            if not literals <= selection.chosen
+        ])
+
+    return selection
+
+
+def augment(missing, chosen, budget=None):
+    """ Return the strings to add to the chosen ones, so that modules whose
+        static snapshot failed for want of magic strings can be static.
+
+        missing: dict module name -> its literals which are not chosen
+
+        A module only becomes static with all of its literals, so the
+        literals are added per module, the cheapest modules first, while
+        they fit into the budget.
+    """
+    rom_size = sum([rom_cost(text) for text in chosen])
+
+    def module_cost(name):
+        return sum([rom_cost(text) for text in missing[name]])
+
+    added = set()
+    for name in sorted(missing, key=lambda x: (module_cost(x), x)):
+        extra = missing[name] - added
+        cost = sum([rom_cost(text) for text in extra])
+        if extra and (budget is None or rom_size + cost <= budget):
+            added |= extra
+            rom_size += cost
+
+    return added
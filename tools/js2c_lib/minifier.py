@@ -0,0 +1,685 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Token based JavaScript minifier used by js2c.
+
+    Level 1 drops the comments and every whitespace which is not needed to
+    separate two tokens. A line break is only kept where removing it could
+    change the meaning of the code through automatic semicolon insertion.
+
+    Level 2 additionally renames the function parameters and the 'var'
+    declared locals of the functions. The renaming is skipped for the whole
+    source if it uses eval, with, classes or template substitutions, since
+    their scoping can not be followed on the token level.
+"""
+
+import re
+
+
+class MinifyError(Exception):
+    pass
+
+
+KEYWORDS = set([
+    'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger',
+    'default', 'delete', 'do', 'else', 'enum', 'export', 'extends', 'false',
+    'finally', 'for', 'function', 'if', 'import', 'in', 'instanceof', 'new',
+    'null', 'return', 'super', 'switch', 'this', 'throw', 'true', 'try',
+    'typeof', 'var', 'void', 'while', 'with', 'implements', 'interface',
+    'let', 'package', 'private', 'protected', 'public', 'static', 'yield',
+    'await',
+])
+
+# Keywords after which a '/' starts a regular expression.
+REGEX_KEYWORDS = set([
+    'case', 'delete', 'do', 'else', 'in', 'instanceof', 'new', 'return',
+    'throw', 'typeof', 'void', 'yield', 'await',
+])
+
+# Keywords which can end an expression.
+VALUE_KEYWORDS = set(['false', 'null', 'super', 'this', 'true'])
+
+# A line break after these keywords terminates the statement.
+RESTRICTED_KEYWORDS = set(['break', 'continue', 'return', 'throw', 'yield'])
+
+# Tokens after which a '{' starts an object literal instead of a block.
+OBJECT_PREFIX_KEYWORDS = set([
+    'case', 'delete', 'in', 'instanceof', 'new', 'return', 'throw', 'typeof',
+    'void', 'yield', 'await',
+])
+
+PUNCTUATORS = sorted([
+    '>>>=', '...', '===', '!==', '**=', '<<=', '>>=', '>>>', '=>', '==',
+    '!=', '<=', '>=', '&&', '||', '??', '?.', '++', '--', '+=', '-=', '*=',
+    '/=', '%=', '&=', '|=', '^=', '<<', '>>', '**', '{', '}', '(', ')', '[',
+    ']', ';', ',', '<', '>', '+', '-', '*', '/', '%', '&', '|', '^', '!',
+    '~', '?', ':', '=', '.', '@', '#',
+], key=len, reverse=True)
+
+LINE_TERMINATORS = u'\n\r\u2028\u2029'
+
+WHITESPACE_RE = re.compile(u'[ \t\v\f\u00a0\ufeff\n\r\u2028\u2029]+')
+IDENT_CHAR = r'(?:[\w$]|[^\x00-\x7f]|\\u[0-9a-fA-F]{4})'
+NAME_RE = re.compile(r'(?:[A-Za-z_$]|[^\x00-\x7f]|\\u[0-9a-fA-F]{4})' +
+                     IDENT_CHAR + '*')
+NUMBER_RE = re.compile(r'0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+|'
+                       r'(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?')
+WORD_CHAR_RE = re.compile(r'[\w$\\]|[^\x00-\x7f]')
+
+NAME_FIRST_CHARS = ('abcdefghijklmnopqrstuvwxyz'
+                    'ABCDEFGHIJKLMNOPQRSTUVWXYZ_$')
+NAME_CHARS = NAME_FIRST_CHARS + '0123456789'
+
+
+class Token(object):
+    __slots__ = ('kind', 'value', 'newline_before', 'start')
+
+    def __init__(self, kind, value, newline_before, start=None):
+        self.kind = kind
+        self.value = value
+        self.newline_before = newline_before
+        # Offset of the token in the source
+        self.start = start
+
+    def is_punct(self, *values):
+        return self.kind == 'punct' and self.value in values
+
+    def is_identifier(self):
+        return self.kind == 'name' and self.value not in KEYWORDS
+
+    def ends_expression(self):
+        if self.kind in ('number', 'string', 'template', 'regex'):
+            return True
+        if self.kind == 'name':
+            return (self.value not in KEYWORDS or
+                    self.value in VALUE_KEYWORDS)
+        return self.value in (')', ']', '}', '++', '--')
+
+
+def _regex_allowed(prev):
+    if prev is None:
+        return True
+    if prev.kind == 'punct':
+        return prev.value not in (')', ']')
+    if prev.kind == 'name':
+        return prev.value in REGEX_KEYWORDS
+    return False
+
+
+def _skip_string(source, pos):
+    quote = source[pos]
+    pos += 1
+    while pos < len(source):
+        ch = source[pos]
+        if ch == '\\':
+            pos += 2
+            continue
+        if ch == quote:
+            return pos + 1
+        if ch in LINE_TERMINATORS:
+            break
+        pos += 1
+
+    raise MinifyError('unterminated string literal')
+
+
+def _skip_template(source, pos):
+    """ Skip a template literal, return its end and whether it has
+        substitutions.
+    """
+    pos += 1
+    has_substitution = False
+    while pos < len(source):
+        ch = source[pos]
+        if ch == '\\':
+            pos += 2
+        elif ch == '`':
+            return pos + 1, has_substitution
+        elif source.startswith('${', pos):
+            has_substitution = True
+            pos = _skip_substitution(source, pos + 2)
+        else:
+            pos += 1
+
+    raise MinifyError('unterminated template literal')
+
+
+def _skip_substitution(source, pos):
+    depth = 0
+    while pos < len(source):
+        ch = source[pos]
+        if ch in '\'"':
+            pos = _skip_string(source, pos)
+        elif ch == '`':
+            pos = _skip_template(source, pos)[0]
+        elif ch == '{':
+            depth += 1
+            pos += 1
+        elif ch == '}':
+            if depth == 0:
+                return pos + 1
+            depth -= 1
+            pos += 1
+        else:
+            pos += 1
+
+    raise MinifyError('unterminated template substitution')
+
+
+def _skip_regex(source, pos):
+    pos += 1
+    in_class = False
+    while pos < len(source):
+        ch = source[pos]
+        if ch == '\\':
+            pos += 2
+            continue
+        if ch in LINE_TERMINATORS:
+            break
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            pos += 1
+            while pos < len(source) and WORD_CHAR_RE.match(source[pos]):
+                pos += 1
+            return pos
+        pos += 1
+
+    raise MinifyError('unterminated regular expression')
+
+
+class _TokenList(list):
+    has_substitution = False
+
+
+def tokenize(source):
+    """ Split the source into a list of tokens. Comments are dropped,
+        the line breaks are recorded in the 'newline_before' flags.
+    """
+    tokens = _TokenList()
+    pos = 0
+    newline = False
+    prev = None
+    length = len(source)
+
+    while pos < length:
+        ch = source[pos]
+
+        match = WHITESPACE_RE.match(source, pos)
+        if match:
+            if any(c in LINE_TERMINATORS for c in match.group(0)):
+                newline = True
+            pos = match.end()
+            continue
+
+        if source.startswith('//', pos):
+            while pos < length and source[pos] not in LINE_TERMINATORS:
+                pos += 1
+            continue
+
+        if source.startswith('/*', pos):
+            end = source.find('*/', pos + 2)
+            if end < 0:
+                raise MinifyError('unterminated comment')
+            if any(c in LINE_TERMINATORS for c in source[pos:end]):
+                newline = True
+            pos = end + 2
+            continue
+
+        start = pos
+        if ch in '\'"':
+            kind = 'string'
+            pos = _skip_string(source, pos)
+        elif ch == '`':
+            kind = 'template'
+            pos, has_substitution = _skip_template(source, pos)
+            if has_substitution:
+                tokens.has_substitution = True
+        elif ch == '/' and _regex_allowed(prev):
+            kind = 'regex'
+            pos = _skip_regex(source, pos)
+        else:
+            match = NUMBER_RE.match(source, pos)
+            if match and (ch.isdigit() or match.end() > pos + 1):
+                kind = 'number'
+                pos = match.end()
+            else:
+                match = NAME_RE.match(source, pos)
+                if match:
+                    kind = 'name'
+                    pos = match.end()
+                else:
+                    kind = 'punct'
+                    for punct in PUNCTUATORS:
+                        if source.startswith(punct, pos):
+                            break
+                    else:
+                        raise MinifyError('unexpected character %r' % ch)
+
+                    # '?.' followed by a digit is a conditional operator.
+                    if (punct == '?.' and pos + 2 < length and
+                            source[pos + 2].isdigit()):
+                        punct = '?'
+                    pos += len(punct)
+
+        prev = Token(kind, source[start:pos], newline, start)
+        tokens.append(prev)
+        newline = False
+
+    return tokens
+
+
+def _match_brackets(tokens):
+    pairs = {'(': ')', '[': ']', '{': '}'}
+    match = {}
+    stack = []
+    for idx, token in enumerate(tokens):
+        if token.kind != 'punct':
+            continue
+        if token.value in pairs:
+            stack.append(idx)
+        elif token.value in (')', ']', '}'):
+            if not stack or pairs[tokens[stack[-1]].value] != token.value:
+                raise MinifyError('unbalanced %r' % token.value)
+            open_idx = stack.pop()
+            match[open_idx] = idx
+            match[idx] = open_idx
+
+    if stack:
+        raise MinifyError('unbalanced %r' % tokens[stack[-1]].value)
+
+    return match
+
+
+class _Scope(object):
+    def __init__(self, start, end, parent=None):
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.bindings = {}
+        self.pinned = set()
+        self.renames = {}
+
+    def declare(self, name, pinned=False):
+        self.bindings.setdefault(name, 0)
+        if pinned:
+            self.pinned.add(name)
+
+    def lookup(self, name):
+        scope = self
+        while scope:
+            if name in scope.bindings:
+                return scope
+            scope = scope.parent
+        return None
+
+
+class _Mangler(object):
+    """ Renames the local bindings of the functions. """
+
+    def __init__(self, tokens, wrapped):
+        self.tokens = tokens
+        self.match = _match_brackets(tokens)
+        self.wrapped = wrapped
+        # Indices of identifier tokens which must not be renamed.
+        self.fixed = set()
+        # Names which are never renamed anywhere (e.g. shorthand props).
+        self.pinned_names = set()
+        # (name index or None, parameter list index, is declaration)
+        self.functions = []
+        # Indices of the ':' tokens of conditional expressions.
+        self.ternary_colons = set()
+
+    def can_mangle(self):
+        if self.tokens.has_substitution:
+            return False
+        for token in self.tokens:
+            if token.kind == 'name' and token.value in ('eval', 'with',
+                                                        'class'):
+                return False
+        return True
+
+    def _object_brace(self, idx, enclosing):
+        """ Decide whether the '{' at idx opens an object literal. """
+        prev = self.tokens[idx - 1] if idx > 0 else None
+        if prev is None:
+            return False
+        if prev.kind == 'name':
+            return prev.value in OBJECT_PREFIX_KEYWORDS
+        if prev.kind != 'punct':
+            return False
+        if prev.value in (')', ']', '}', ';', '{', '=>'):
+            return False
+        if prev.value == ':':
+            # The ':' of a conditional expression is followed by an
+            # expression, a label or a case clause by a statement.
+            if idx - 1 in self.ternary_colons:
+                return True
+            return enclosing in ('object', '(', '[')
+        return True
+
+    def scan_structure(self):
+        tokens = self.tokens
+        stack = []
+        # Number of the '?' waiting for their ':' on every bracket level
+        pending = [0]
+
+        for idx, token in enumerate(tokens):
+            enclosing = stack[-1] if stack else None
+
+            if token.kind == 'punct':
+                if token.value in ('(', '['):
+                    stack.append(token.value)
+                    pending.append(0)
+                elif token.value == '{':
+                    if self._object_brace(idx, enclosing):
+                        stack.append('object')
+                        self._scan_key(idx + 1)
+                    else:
+                        stack.append('block')
+                    pending.append(0)
+                elif token.value in (')', ']', '}'):
+                    stack.pop()
+                    pending.pop()
+                elif token.value == '?':
+                    pending[-1] += 1
+                elif token.value == ':' and pending[-1] > 0:
+                    pending[-1] -= 1
+                    self.ternary_colons.add(idx)
+                elif token.value == ',' and enclosing == 'object':
+                    self._scan_key(idx + 1)
+                elif token.value in ('.', '?.'):
+                    if idx + 1 < len(tokens) and tokens[idx + 1].kind == 'name':
+                        self.fixed.add(idx + 1)
+                continue
+
+            if token.kind == 'name' and token.value == 'function':
+                self._scan_function(idx)
+
+    def _scan_key(self, idx):
+        tokens = self.tokens
+        if idx >= len(tokens):
+            return
+
+        key = tokens[idx]
+        after = tokens[idx + 1] if idx + 1 < len(tokens) else None
+        if after is None or key.kind not in ('name', 'string', 'number'):
+            return
+
+        if (key.kind == 'name' and key.value in ('get', 'set') and
+                after.kind in ('name', 'string', 'number') and
+                idx + 2 < len(tokens) and tokens[idx + 2].is_punct('(')):
+            # Accessor property: get name() { ... }
+            self.fixed.add(idx)
+            self.fixed.add(idx + 1)
+            self.functions.append((None, idx + 2, False))
+        elif after.is_punct(':'):
+            self.fixed.add(idx)
+        elif after.is_punct('('):
+            # Method shorthand: name() { ... }
+            self.fixed.add(idx)
+            self.functions.append((None, idx + 1, False))
+        elif after.is_punct(',', '}') and key.kind == 'name':
+            # Shorthand property: the name is both a key and a reference.
+            self.fixed.add(idx)
+            self.pinned_names.add(key.value)
+
+    def _scan_function(self, idx):
+        tokens = self.tokens
+        prev = tokens[idx - 1] if idx > 0 else None
+        is_declaration = not (prev is not None and (
+            (prev.kind == 'punct' and
+             prev.value not in (')', ']', '}', ';', '{')) or
+            (prev.kind == 'name' and prev.value in OBJECT_PREFIX_KEYWORDS)))
+
+        pos = idx + 1
+        if pos < len(tokens) and tokens[pos].is_punct('*'):
+            pos += 1
+
+        name_idx = None
+        if pos < len(tokens) and tokens[pos].is_identifier():
+            name_idx = pos
+            pos += 1
+
+        if pos < len(tokens) and tokens[pos].is_punct('('):
+            self.functions.append((name_idx, pos, is_declaration))
+
+    def build_scopes(self):
+        tokens = self.tokens
+        top = _Scope(0, len(tokens))
+        scopes = []
+
+        for name_idx, params_idx, is_declaration in self.functions:
+            params_end = self.match.get(params_idx)
+            body_idx = params_end + 1 if params_end is not None else None
+            if body_idx is None or body_idx >= len(tokens) or \
+                    not tokens[body_idx].is_punct('{'):
+                # Not a function with a body, leave the renaming alone.
+                raise MinifyError('unexpected function syntax')
+
+            scope = _Scope(params_idx, self.match[body_idx])
+            scope.name_idx = name_idx
+            scope.is_declaration = is_declaration
+            scopes.append(scope)
+
+        scopes.sort(key=lambda scope: scope.start)
+
+        # Find the innermost scope of every token.
+        self.scope_of = [top] * len(tokens)
+        for scope in scopes:
+            scope.parent = self.scope_of[scope.start]
+            for idx in range(scope.start, scope.end + 1):
+                self.scope_of[idx] = scope
+
+        # The names of the functions are never renamed.
+        for scope in scopes:
+            if scope.name_idx is None:
+                continue
+            name = tokens[scope.name_idx].value
+            self.fixed.add(scope.name_idx)
+            if scope.is_declaration:
+                scope.parent.declare(name, pinned=True)
+            else:
+                scope.declare(name, pinned=True)
+
+        for scope in scopes:
+            self._declare_params(scope)
+
+        for idx, token in enumerate(tokens):
+            if token.kind == 'name' and token.value == 'var':
+                self._declare_vars(idx, self.scope_of[idx])
+
+        self.top = top
+        self.scopes = scopes
+
+    def _declare_params(self, scope):
+        tokens = self.tokens
+        end = self.match[scope.start]
+        depth = 0
+        for idx in range(scope.start + 1, end):
+            token = tokens[idx]
+            if token.is_punct('(', '[', '{'):
+                depth += 1
+            elif token.is_punct(')', ']', '}'):
+                depth -= 1
+            elif depth == 0 and token.is_identifier():
+                prev = tokens[idx - 1]
+                if prev.is_punct('(', ',', '...'):
+                    scope.declare(token.value)
+
+    def _declare_vars(self, idx, scope):
+        tokens = self.tokens
+        expect_name = True
+        depth = 0
+        prev = tokens[idx]
+        for pos in range(idx + 1, len(tokens)):
+            token = tokens[pos]
+            if expect_name:
+                if token.is_identifier():
+                    scope.declare(token.value)
+                expect_name = False
+            elif token.is_punct('(', '[', '{'):
+                depth += 1
+            elif token.is_punct(')', ']', '}'):
+                depth -= 1
+                if depth < 0:
+                    return
+            elif depth == 0:
+                if token.is_punct(';'):
+                    return
+                if token.is_punct(','):
+                    expect_name = True
+                elif (token.newline_before and prev.ends_expression() and
+                      (token.kind != 'punct' or token.is_punct('{'))):
+                    # Automatic semicolon insertion ends the declaration.
+                    return
+            prev = token
+
+    def assign_names(self):
+        tokens = self.tokens
+        reserved = set(KEYWORDS)
+        for token in tokens:
+            if token.kind == 'name':
+                reserved.add(token.value)
+
+        # Count the references of every binding.
+        self.refs = []
+        for idx, token in enumerate(tokens):
+            if not token.is_identifier() or idx in self.fixed:
+                continue
+            scope = self.scope_of[idx].lookup(token.value)
+            if scope is None or (scope is self.top and not self.wrapped):
+                continue
+            scope.bindings[token.value] += 1
+            self.refs.append((idx, scope))
+
+        for scope in [self.top] + self.scopes:
+            used = set(reserved)
+            outer = scope.parent
+            while outer:
+                used.update(outer.renames.values())
+                outer = outer.parent
+
+            if scope is self.top and not self.wrapped:
+                continue
+
+            candidates = [name for name in scope.bindings
+                          if name not in scope.pinned and
+                          name not in self.pinned_names]
+            candidates.sort(key=lambda name: (-scope.bindings[name], name))
+
+            generator = _name_generator()
+            for name in candidates:
+                new_name = next(generator)
+                while new_name in used:
+                    new_name = next(generator)
+                if len(new_name) < len(name):
+                    scope.renames[name] = new_name
+                    used.add(new_name)
+
+    def texts(self):
+        texts = [token.value for token in self.tokens]
+        for idx, scope in self.refs:
+            name = self.tokens[idx].value
+            if name in scope.renames:
+                texts[idx] = scope.renames[name]
+
+        return texts
+
+
+def _name_generator():
+    length = 1
+    while True:
+        for name in _names_of_length(length):
+            yield name
+        length += 1
+
+
+def _names_of_length(length):
+    if length == 1:
+        for ch in NAME_FIRST_CHARS:
+            yield ch
+        return
+
+    for prefix in _names_of_length(length - 1):
+        for ch in NAME_CHARS:
+            yield prefix + ch
+
+
+def _needs_newline(prev, token):
+    if prev.kind == 'name' and prev.value in RESTRICTED_KEYWORDS:
+        return True
+    if token.is_punct('++', '--'):
+        return True
+    return (prev.ends_expression() and
+            (token.kind != 'punct' or token.is_punct('{', '!', '~')))
+
+
+def _needs_space(prev, prev_text, text):
+    last = prev_text[-1]
+    first = text[0]
+    if WORD_CHAR_RE.match(last) and WORD_CHAR_RE.match(first):
+        return True
+    if (last == '+' and first == '+') or (last == '-' and first == '-'):
+        return True
+    if last == '/' and first in '/*':
+        return True
+    if prev.kind == 'number' and first == '.':
+        return True
+    if last == '<' and text.startswith('!--'):
+        return True
+    if prev_text.endswith('--') and first == '>':
+        return True
+    return False
+
+
+def minify(source, level=1, wrapped=True):
+    """ Return the minified source.
+
+        wrapped: the source is the body of a function (e.g. a module wrapper),
+                 so its top level variables are locals which can be renamed.
+    """
+    if level <= 0:
+        return source
+
+    tokens = tokenize(source)
+    texts = [token.value for token in tokens]
+
+    if level >= 2:
+        mangler = _Mangler(tokens, wrapped)
+        if mangler.can_mangle():
+            mangler.scan_structure()
+            mangler.build_scopes()
+            mangler.assign_names()
+            texts = mangler.texts()
+
+    output = []
+    prev = None
+    prev_text = None
+    for token, text in zip(tokens, texts):
+        if prev is not None:
+            if token.newline_before and _needs_newline(prev, token):
+                output.append('\n')
+            elif _needs_space(prev, prev_text, text):
+                output.append(' ')
+        output.append(text)
+        prev = token
+        prev_text = text
+
+    output.append('\n')
+    return ''.join(output)
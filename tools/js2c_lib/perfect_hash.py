@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Minimal perfect hash generator used by js2c.
+
+    The keys are distributed into buckets by fnv1a(key, 0). Then for every
+    bucket, starting with the largest one, a seed is searched for which
+    fnv1a(key, seed) puts all keys of the bucket into free slots of the
+    table. A lookup costs two hashes of the key and one string compare:
+
+      bucket = fnv1a(key, 0) % len(seeds)
+      slot = fnv1a(key, seeds[bucket]) % len(keys)
+      found = keys[index[slot]] == key
+
+    The C version of fnv1a is emitted next to the tables (see HASH_C).
+"""
+
+FNV_OFFSET_BASIS = 2166136261
+FNV_PRIME = 16777619
+MAX_SEED = 0xffff
+
+HASH_C = '''
+static uint32_t {PREFIX}_hash(const char* key, uint32_t seed) {{
+  uint32_t hash = {BASIS}u ^ seed;
+  while (*key) {{
+    hash = (hash ^ (uint8_t)*key++) * {PRIME}u;
+  }}
+  return hash;
+}}
+'''
+
+
+class PerfectHashError(Exception):
+    pass
+
+
+def fnv1a(key, seed):
+    """ Return the seeded 32 bit FNV-1a hash of the given string. """
+    hash_value = FNV_OFFSET_BASIS ^ seed
+    for byte in bytearray(key.encode('utf-8')):
+        hash_value = ((hash_value ^ byte) * FNV_PRIME) & 0xffffffff
+    return hash_value
+
+
+def _try_build(keys, bucket_count):
+    buckets = [[] for _ in range(bucket_count)]
+    for key_idx, key in enumerate(keys):
+        buckets[fnv1a(key, 0) % bucket_count].append(key_idx)
+
+    seeds = [0] * bucket_count
+    index = [None] * len(keys)
+
+    order = sorted(range(bucket_count), key=lambda idx: -len(buckets[idx]))
+    for bucket_idx in order:
+        bucket = buckets[bucket_idx]
+        if not bucket:
+            break
+
+        for seed in range(MAX_SEED + 1):
+            slots = [fnv1a(keys[key_idx], seed) % len(keys)
+                     for key_idx in bucket]
+            if (len(set(slots)) == len(slots) and
+                    all([index[slot] is None for slot in slots])):
+                break
+        else:
+            return None
+
+        seeds[bucket_idx] = seed
+        for key_idx, slot in zip(bucket, slots):
+            index[slot] = key_idx
+
+    return seeds, index
+
+
+def build(keys):
+    """ Return the (seeds, index) tables of the given unique keys, where
+        index[slot] is the position of the key in 'keys'.
+    """
+    if not keys:
+        raise PerfectHashError('no keys to hash')
+    if len(set(keys)) != len(keys):
+        raise PerfectHashError('duplicate keys')
+
+    bucket_count = (len(keys) + 1) // 2
+    while bucket_count <= len(keys):
+        result = _try_build(keys, bucket_count)
+        if result:
+            return result
+        bucket_count += 1
+
+    raise PerfectHashError('unable to find a perfect hash')
+
+
+def c_hash_function(prefix):
+    """ Return the C source of the hash function matching fnv1a. """
+    return HASH_C.format(PREFIX=prefix, BASIS=FNV_OFFSET_BASIS,
+                         PRIME=FNV_PRIME)
@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Build-time folding of the process.platform checks used by js2c.
+
+    process.platform is fixed by the TARGET_OS of the build, so comparing
+    it with a string literal can be replaced by true or false:
+
+      process.platform === 'nuttx'   ->  false  (for linux)
+
+    An alias (var platform = process.platform;) is folded as well if it is
+    declared once by a statement of the module itself (not in a block or a
+    function), no function declares the same name and the alias is only
+    compared with string literals after its declaration.
+
+    Then the if statements whose condition became a combination of true
+    and false literals (with !, && and ||) are replaced by the branch taken
+    on the target. The folding is conservative: the 'var' declarations of
+    the dropped branch are kept (without initializers) and a statement is
+    left untouched if the dropped branch declares a function or if either
+    branch is not a block (or an else-if chain of blocks).
+"""
+
+from js2c_lib import minifier
+
+EQUALITY_OPS = ('==', '===', '!=', '!==')
+
+# Tokens after which a comparison is a complete operand of the
+# surrounding expression.
+OPERAND_PREFIXES = ('(', '[', '{', '}', ';', ',', '=', '&&', '||', '?', ':')
+# Tokens which can follow a complete comparison.
+OPERAND_SUFFIXES = (')', ']', '}', ';', ',', '&&', '||', '?', ':') + \
+    EQUALITY_OPS
+
+NON_ASSIGNMENT_OPS = ('==', '===', '!=', '!==', '<=', '>=')
+
+
+def _end(token):
+    return token.start + len(token.value)
+
+
+def _apply_edits(source, edits):
+    for start, end, text in sorted(edits, reverse=True):
+        source = source[:start] + text + source[end:]
+    return source
+
+
+def _is_property(tokens, idx):
+    return idx > 0 and tokens[idx - 1].is_punct('.', '?.')
+
+
+def _subject_length(tokens, idx, aliases):
+    """ Return the number of tokens of process.platform (or of its alias)
+        starting at idx, or 0.
+    """
+    token = tokens[idx]
+    if token.kind != 'name' or _is_property(tokens, idx):
+        return 0
+    if (token.value == 'process' and idx + 2 < len(tokens) and
+            tokens[idx + 1].is_punct('.') and
+            tokens[idx + 2].kind == 'name' and
+            tokens[idx + 2].value == 'platform'):
+        return 3
+    if token.value in aliases:
+        return 1
+    return 0
+
+
+def _is_operand(tokens, first, last):
+    """ Whether tokens[first:last + 1] is a complete operand of the
+        surrounding expression.
+    """
+    if first > 0:
+        prev = tokens[first - 1]
+        if not (prev.is_punct(*OPERAND_PREFIXES) or
+                (prev.kind == 'name' and prev.value == 'return')):
+            return False
+    if last + 1 < len(tokens):
+        if not tokens[last + 1].is_punct(*OPERAND_SUFFIXES):
+            return False
+    return True
+
+
+def _string_value(token):
+    if token.kind != 'string' or '\\' in token.value:
+        return None
+    return token.value[1:-1]
+
+
+def _find_comparisons(tokens, aliases):
+    """ Return the list of (first, last, subject) token indices of the
+        comparisons of process.platform (or an alias) with a string literal.
+    """
+    found = []
+    for idx in range(len(tokens)):
+        length = _subject_length(tokens, idx, aliases)
+        if not length:
+            continue
+
+        # process.platform === 'name'
+        last = idx + length + 1
+        if (last < len(tokens) and
+                tokens[idx + length].is_punct(*EQUALITY_OPS) and
+                _string_value(tokens[last]) is not None and
+                _is_operand(tokens, idx, last)):
+            found.append((idx, last, idx))
+            continue
+
+        # 'name' === process.platform
+        first = idx - 2
+        last = idx + length - 1
+        if (first >= 0 and tokens[idx - 1].is_punct(*EQUALITY_OPS) and
+                _string_value(tokens[first]) is not None and
+                _is_operand(tokens, first, last)):
+            found.append((first, last, idx))
+
+    return found
+
+
+def _scopes(tokens):
+    """ Return the scopes of the functions of the module as built by the
+        minifier, or None if they cannot be determined.
+    """
+    mangler = minifier._Mangler(tokens, False)
+    if not mangler.can_mangle():
+        return None
+    try:
+        mangler.scan_structure()
+        mangler.build_scopes()
+    except minifier.MinifyError:
+        return None
+    return mangler
+
+
+def _find_aliases(tokens):
+    """ Return the names declared as 'var name = process.platform;' at
+        module scope which are not declared by any function and are only
+        used in comparisons with string literals.
+    """
+    declarations = {}
+    for idx in range(1, len(tokens) - 5):
+        if (tokens[idx - 1].kind == 'name' and
+                tokens[idx - 1].value == 'var' and
+                tokens[idx].is_identifier() and
+                tokens[idx + 1].is_punct('=') and
+                _subject_length(tokens, idx + 2, ()) == 3 and
+                tokens[idx + 5].is_punct(';')):
+            declarations.setdefault(tokens[idx].value, []).append(idx)
+    if not declarations:
+        return set()
+
+    scopes = _scopes(tokens)
+    if scopes is None:
+        return set()
+
+    # The parameters and the var and function declarations of the
+    # functions shadow the alias. The bindings not tracked by the scopes
+    # (let, const, catch, arrow parameters) are uses of the name other
+    # than a comparison, which reject the alias below.
+    shadowed = set()
+    for scope in scopes.scopes:
+        shadowed.update(scope.bindings)
+
+    # The declaration has to be a statement of the module itself, one in a
+    # block may not be executed.
+    top_level = set()
+    depth = 0
+    for idx, token in enumerate(tokens):
+        if token.is_punct('(', '[', '{'):
+            depth += 1
+        elif token.is_punct(')', ']', '}'):
+            depth -= 1
+        elif depth == 0:
+            top_level.add(idx)
+
+    aliases = set([name for name, places in declarations.items()
+                   if len(places) == 1 and name not in shadowed and
+                   places[0] in top_level])
+    # Any other use of an alias rejects it, a comparison before the
+    # declaration as well since the alias is undefined there.
+    while aliases:
+        compared = set([subject for _, _, subject in
+                        _find_comparisons(tokens, aliases)])
+        rejected = set()
+        for idx, token in enumerate(tokens):
+            if (token.kind == 'name' and token.value in aliases and
+                    not _is_property(tokens, idx) and
+                    idx != declarations[token.value][0] and
+                    (idx not in compared or
+                     idx < declarations[token.value][0])):
+                rejected.add(token.value)
+        if not rejected:
+            break
+        aliases -= rejected
+
+    return aliases
+
+
+def _fold_comparisons(source, platform):
+    tokens = minifier.tokenize(source)
+    aliases = _find_aliases(tokens)
+
+    edits = []
+    for first, last, subject in _find_comparisons(tokens, aliases):
+        if first == subject:
+            op, literal = tokens[last - 1], tokens[last]
+        else:
+            op, literal = tokens[first + 1], tokens[first]
+        equal = _string_value(literal) == platform
+        if op.value in ('!=', '!=='):
+            equal = not equal
+        edits.append((tokens[first].start, _end(tokens[last]),
+                      'true' if equal else 'false'))
+
+    return _apply_edits(source, edits), len(edits)
+
+
+def _split(tokens, lo, hi, match, operator):
+    """ Split tokens[lo:hi] at the top level 'operator' tokens. Returns None
+        if an operator with a lower precedence than '||' is found.
+    """
+    parts = []
+    start = idx = lo
+    while idx < hi:
+        token = tokens[idx]
+        if token.is_punct('(', '[', '{'):
+            idx = match[idx] + 1
+            continue
+        if (token.is_punct(',', '?', ':', '=>', '??') or
+                (token.kind == 'punct' and token.value.endswith('=') and
+                 token.value not in NON_ASSIGNMENT_OPS) or
+                (token.kind == 'name' and token.value == 'yield')):
+            return None
+        if token.is_punct(operator):
+            parts.append((start, idx))
+            start = idx + 1
+        idx += 1
+    parts.append((start, hi))
+    return parts
+
+
+def _evaluate(tokens, lo, hi, match):
+    """ Return the value of the expression tokens[lo:hi] if it only depends
+        on true and false literals, otherwise None.
+    """
+    if lo >= hi:
+        return None
+
+    for operator, short_circuit in (('||', True), ('&&', False)):
+        parts = _split(tokens, lo, hi, match, operator)
+        if parts is None:
+            return None
+        if len(parts) > 1:
+            # The operands are evaluated from left to right, the unknown
+            # ones can only be dropped after a short circuit.
+            for part_lo, part_hi in parts:
+                value = _evaluate(tokens, part_lo, part_hi, match)
+                if value is None:
+                    return None
+                if value == short_circuit:
+                    return short_circuit
+            return not short_circuit
+
+    token = tokens[lo]
+    if token.is_punct('!'):
+        value = _evaluate(tokens, lo + 1, hi, match)
+        return None if value is None else not value
+    if token.is_punct('(') and match[lo] == hi - 1:
+        return _evaluate(tokens, lo + 1, hi - 1, match)
+    if hi - lo == 1 and token.kind == 'name' and token.value in ('true',
+                                                                  'false'):
+        return token.value == 'true'
+    return None
+
+
+def _if_end(tokens, idx, match):
+    """ Return the index of the last token of the if statement at idx, if
+        all of its branches are blocks, otherwise None.
+    """
+    if not tokens[idx + 1].is_punct('('):
+        return None
+    then_start = match[idx + 1] + 1
+    if then_start >= len(tokens) or not tokens[then_start].is_punct('{'):
+        return None
+    end = match[then_start]
+
+    if (end + 2 < len(tokens) and tokens[end + 1].kind == 'name' and
+            tokens[end + 1].value == 'else'):
+        return _else_end(tokens, end + 2, match)
+    return end
+
+
+def _else_end(tokens, idx, match):
+    if tokens[idx].is_punct('{'):
+        return match[idx]
+    if tokens[idx].kind == 'name' and tokens[idx].value == 'if':
+        return _if_end(tokens, idx, match)
+    return None
+
+
+def _skip_function(tokens, idx, match):
+    """ Return the index after the function starting at idx. """
+    while idx < len(tokens) and not tokens[idx].is_punct('('):
+        idx += 1
+    body = match[idx] + 1
+    return match[body] + 1
+
+
+def _dropped_declarations(tokens, lo, hi, match):
+    """ Return the names declared by 'var' in tokens[lo:hi + 1], or None if
+        the range contains a function declaration.
+    """
+    names = []
+    idx = lo
+    while idx <= hi:
+        token = tokens[idx]
+        if token.kind == 'name' and token.value == 'function':
+            prev = tokens[idx - 1]
+            if (prev.is_punct('{', '}', ';', ')') or
+                    (prev.kind == 'name' and prev.value == 'else')):
+                return None
+            idx = _skip_function(tokens, idx, match)
+            continue
+        if token.is_punct('=>') and tokens[idx + 1].is_punct('{'):
+            idx = match[idx + 1] + 1
+            continue
+        if (token.kind != 'name' or token.value != 'var' or
+                _is_property(tokens, idx)):
+            idx += 1
+            continue
+
+        idx += 1
+        while True:
+            if not tokens[idx].is_identifier():
+                return None
+            if tokens[idx].value not in names:
+                names.append(tokens[idx].value)
+            idx += 1
+            if tokens[idx].is_punct('='):
+                while (idx <= hi and
+                       not tokens[idx].is_punct(',', ';', '}')):
+                    if tokens[idx].is_punct('(', '[', '{'):
+                        idx = match[idx]
+                    idx += 1
+            if idx <= hi and tokens[idx].is_punct(','):
+                idx += 1
+                continue
+            break
+
+    return names
+
+
+def _fold_statement(source):
+    """ Fold the first if statement with a constant condition. Returns the
+        new source or None if there is nothing to fold.
+    """
+    tokens = minifier.tokenize(source)
+    match = minifier._match_brackets(tokens)
+
+    for idx, token in enumerate(tokens):
+        if (token.kind != 'name' or token.value != 'if' or
+                _is_property(tokens, idx) or idx + 1 >= len(tokens) or
+                not tokens[idx + 1].is_punct('(')):
+            continue
+        value = _evaluate(tokens, idx + 2, match[idx + 1], match)
+        if value is None:
+            continue
+        end = _if_end(tokens, idx, match)
+        if end is None:
+            continue
+
+        then_start = match[idx + 1] + 1
+        then_end = match[then_start]
+        branches = [(then_start, then_end), (then_end + 2, end)]
+        if then_end == end:
+            branches[1] = None
+        if not value:
+            branches.reverse()
+        kept, dropped = branches
+
+        names = []
+        if dropped:
+            names = _dropped_declarations(tokens, dropped[0], dropped[1],
+                                          match)
+            if names is None:
+                continue
+
+        statements = []
+        if names:
+            statements.append('var %s;' % ', '.join(names))
+        if kept:
+            statements.append(source[tokens[kept[0]].start:
+                                     _end(tokens[kept[1]])])
+        text = ' '.join(statements)
+
+        # A single statement is expected after these tokens.
+        prev = tokens[idx - 1] if idx > 0 else None
+        if prev and (prev.is_punct(')') or
+                     (prev.kind == 'name' and prev.value in ('else', 'do'))):
+            if not text:
+                text = ';'
+            elif len(statements) > 1:
+                text = '{ %s }' % text
+
+        return source[:token.start] + text + source[_end(tokens[end]):]
+
+    return None
+
+
+def fold(source, platform):
+    """ Return the source with the process.platform checks folded for the
+        given platform and the number of folded comparisons.
+    """
+    source, count = _fold_comparisons(source, platform)
+    if not count:
+        return source, 0
+
+    while True:
+        folded = _fold_statement(source)
+        if folded is None:
+            return source, count
+        source = folded
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Per-module size report of js2c and the comparison of two reports.
+
+    For every module the report lists:
+
+      source    bytes of the JS file
+      minified  bytes of the minified source
+      snapshot  bytes of the standalone snapshot (snapshot mode only)
+      static    whether the snapshot is static (snapshot mode only)
+      literals  number of literals of the module
+      own       number of literals no other module refers to
+      marginal  bytes the module adds to the embedded data
+
+    In snapshot mode the marginal bytes are the size of the merged
+    iotjs_js_modules blob minus the size of the blob merged without the
+    module, which accounts for the literals shared with other modules.
+    Without snapshot they are the embedded (possibly compressed) bytes.
+"""
+
+import json
+
+REPORT_VERSION = 1
+
+FIELDS = ['source', 'minified', 'snapshot', 'static', 'literals', 'own',
+          'marginal']
+SIZE_FIELDS = ['source', 'minified', 'snapshot', 'marginal']
+
+
+class ReportError(Exception):
+    pass
+
+
+def create(modules, blob_size, snapshot, buildtype, minify_level):
+    """ Return the report of the given modules.
+
+        modules: dict of module name -> dict of the FIELDS
+        blob_size: total bytes of the embedded modules
+    """
+    entries = []
+    for name in sorted(modules):
+        entry = {'name': name}
+        for field in FIELDS:
+            entry[field] = modules[name].get(field)
+        entries.append(entry)
+
+    totals = {}
+    for field in SIZE_FIELDS:
+        values = [entry[field] for entry in entries
+                  if entry[field] is not None]
+        totals[field] = sum(values) if values else None
+    totals['blob'] = blob_size
+
+    return {
+        'version': REPORT_VERSION,
+        'snapshot': snapshot,
+        'buildtype': buildtype,
+        'minify_level': minify_level,
+        'modules': entries,
+        'total': totals,
+    }
+
+
+def load(report_path):
+    with open(report_path, 'r') as freport:
+        try:
+            report = json.load(freport)
+        except ValueError as e:
+            raise ReportError('%s: %s' % (report_path, e))
+
+    if report.get('version') != REPORT_VERSION:
+        raise ReportError('%s: unsupported report version %s' % (
+                          report_path, report.get('version')))
+    return report
+
+
+def format_json(report):
+    return json.dumps(report, indent=2, sort_keys=True) + '\n'
+
+
+def _cell(value):
+    if value is None:
+        return '-'
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    return str(value)
+
+
+def format_table(report):
+    header = ['module'] + FIELDS
+    rows = [[entry['name']] + [_cell(entry[field]) for field in FIELDS]
+            for entry in sorted(report['modules'],
+                                key=lambda x: (-(x['marginal'] or 0),
+                                               x['name']))]
+    totals = report['total']
+    rows.append(['total'] + [_cell(totals.get(field))
+                             if field in SIZE_FIELDS else ''
+                             for field in FIELDS])
+
+    lines = [_format_row(header, rows)]
+    lines.extend([_format_row(row, rows) for row in rows])
+    lines.append('')
+    lines.append('Embedded modules: %s bytes (%s)' % (
+                 _cell(totals['blob']),
+                 'snapshot' if report['snapshot'] else 'no snapshot'))
+    return '\n'.join(lines) + '\n'
+
+
+def _format_row(row, rows):
+    width = max([len(item[0]) for item in rows] + [len('module')])
+    return '%-*s' % (width, row[0]) + ''.join(
+        ['%10s' % item for item in row[1:]])
+
+
+def compare(old, new):
+    """ Return the differences of the sizes of two reports. The modules
+        are ordered by the change of their marginal bytes, largest first.
+    """
+    old_modules = dict([(entry['name'], entry) for entry in old['modules']])
+    new_modules = dict([(entry['name'], entry) for entry in new['modules']])
+
+    entries = []
+    for name in set(old_modules) | set(new_modules):
+        old_entry = old_modules.get(name, {})
+        new_entry = new_modules.get(name, {})
+        if not old_entry:
+            status = 'added'
+        elif not new_entry:
+            status = 'removed'
+        else:
+            status = 'changed'
+
+        entry = {'name': name, 'status': status}
+        for field in SIZE_FIELDS:
+            old_value = old_entry.get(field) or 0
+            new_value = new_entry.get(field) or 0
+            entry[field] = {'old': old_entry.get(field),
+                            'new': new_entry.get(field),
+                            'delta': new_value - old_value}
+        if status == 'changed' and old_entry.get('static') is not None:
+            if old_entry.get('static') != new_entry.get('static'):
+                status = entry['status'] = ('lost static'
+                                            if old_entry.get('static')
+                                            else 'became static')
+
+        if status != 'changed' or any([entry[field]['delta']
+                                       for field in SIZE_FIELDS]):
+            entries.append(entry)
+
+    entries.sort(key=lambda x: (-abs(x['marginal']['delta']), x['name']))
+
+    old_blob = old['total'].get('blob') or 0
+    new_blob = new['total'].get('blob') or 0
+    return {
+        'version': REPORT_VERSION,
+        'modules': entries,
+        'blob': {'old': old['total'].get('blob'),
+                 'new': new['total'].get('blob'),
+                 'delta': new_blob - old_blob},
+    }
+
+
+def format_compare_table(diff):
+    lines = []
+    if not diff['modules']:
+        lines.append('No module size changes')
+    else:
+        width = max([len(entry['name']) for entry in diff['modules']] +
+                    [len('module')])
+        lines.append('%-*s %-14s' % (width, 'module', 'status') +
+                     ''.join(['%10s' % field for field in SIZE_FIELDS]))
+        for entry in diff['modules']:
+            lines.append('%-*s %-14s' % (width, entry['name'],
+                                         entry['status']) +
+                         ''.join(['%+10d' % entry[field]['delta']
+                                  for field in SIZE_FIELDS]))
+
+    blob = diff['blob']
+    lines.append('')
+    lines.append('Embedded modules: %s -> %s bytes (%+d)' % (
+                 _cell(blob['old']), _cell(blob['new']), blob['delta']))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+# Copyright 2015-present Samsung Electronics Co., Ltd. and other contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#  This file compares the js2c embedding backends: it measures how long it
+# takes to generate the C code of the merged iotjs_js_modules snapshot and
+# how long it takes to compile the result.
+
+from __future__ import print_function
+
+import argparse
+import shutil
+import subprocess
+import tempfile
+import time
+
+import js2c
+
+from common_py import path
+from common_py.system.filesystem import FileSystem as fs
+
+
+SOURCE_HEADER = '''#include <stddef.h>
+#include <stdint.h>
+'''
+
+
+def get_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--snapshot-tool', default=None,
+        help='Snapshot tool used to create the merged snapshot of the '
+             'modules in src/js')
+    parser.add_argument('--input', default=None,
+        help='Use the given file (e.g. a saved merged snapshot) as input')
+    parser.add_argument('--cc', default='cc',
+        help='C compiler (default: %(default)s)')
+    parser.add_argument('--cflags', default='-Os',
+        help='C compiler flags (default: %(default)s)')
+    parser.add_argument('--linker', default='ld',
+        help='Linker used by the objcopy backend (default: %(default)s)')
+    parser.add_argument('--objcopy', default='objcopy',
+        help='Objcopy used by the objcopy backend (default: %(default)s)')
+    parser.add_argument('--backends', default=','.join(js2c.EMBED_BACKENDS),
+        help='Comma separated list of backends (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+        help='Number of measurements per backend, the best one is '
+             'reported (default: %(default)s)')
+
+    script_args = parser.parse_args()
+    if not script_args.snapshot_tool and not script_args.input:
+        parser.error('either --snapshot-tool or --input is required')
+
+    return script_args
+
+
+def create_merged_snapshot(snapshot_tool):
+    js_paths = sorted(fs.glob(fs.join(path.SRC_ROOT, 'js', '*.js')))
+    work_dir = tempfile.mkdtemp(prefix='js2c-')
+    try:
+        snapshot_paths = js2c.generate_snapshots(js_paths, snapshot_tool,
+                                                 len(js_paths), work_dir)[0]
+        return js2c.merge_snapshots([{'path': item}
+                                     for item in snapshot_paths],
+                                    snapshot_tool, work_dir)
+    finally:
+        fs.rmtree(work_dir)
+
+
+def measure_backend(backend, code, work_dir, script_args):
+    name = 'iotjs_js_modules'
+    source_path = fs.join(work_dir, '%s_%s.c' % (name, backend))
+    object_path = fs.join(work_dir, '%s_%s.o' % (name, backend))
+    tools = (script_args.linker, script_args.objcopy)
+
+    # Remove the outputs of the previous round, so each round does the
+    # full amount of work.
+    for item in fs.glob(fs.join(work_dir, '*')):
+        fs.remove(item)
+
+    start = time.time()
+    source = SOURCE_HEADER + js2c.embed_module(name, code, backend,
+                                               work_dir, tools)
+    with open(source_path, 'w') as fsource:
+        fsource.write(source)
+    generate_time = time.time() - start
+
+    cmd = [script_args.cc, '-c', '-o', object_path, source_path]
+    cmd.extend(script_args.cflags.split())
+    start = time.time()
+    ret = subprocess.call(cmd)
+    compile_time = time.time() - start
+
+    if ret != 0:
+        return None
+
+    return generate_time, compile_time, len(source)
+
+
+if __name__ == "__main__":
+    script_args = get_arguments()
+
+    if script_args.input:
+        with open(script_args.input, 'rb') as finput:
+            code = finput.read()
+    else:
+        code = create_merged_snapshot(fs.abspath(script_args.snapshot_tool))
+
+    print("**js2c embedding backends (%d bytes)**\n" % len(code))
+    print("| {0:^10} | {1:^12} | {2:^12} | {3:^12} |".format(
+          "Backend", "generate (s)", "compile (s)", "C source (B)"))
+    print("| {0} | {1} | {2} | {3} |".format("-"*10, "-"*12, "-"*12, "-"*12))
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        for backend in script_args.backends.split(','):
+            results = []
+            for _ in range(script_args.repeat):
+                result = measure_backend(backend, code, work_dir, script_args)
+                if result is None:
+                    break
+                results.append(result)
+
+            if not results:
+                print("| {0:10} | {1:^12} | {2:^12} | {3:^12} |".format(
+                      backend, "failed", "failed", "-"))
+                continue
+
+            print("| {0:10} | {1:12.3f} | {2:12.3f} | {3:12} |".format(
+                  backend, min([item[0] for item in results]),
+                  min([item[1] for item in results]), results[0][2]))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)